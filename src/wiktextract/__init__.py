@@ -1,17 +1,25 @@
 # This file defines the public exports from the wiktextract module.
 #
+# The exports are imported on first access, so that importing a submodule,
+# e.g. for `wiktwords --page` or in a worker process, does not import all of
+# them.
+#
 # Copyright (c) 2018-2021 Tatu Ylonen.  See LICENSE and https://ylonen.org
 
-from .categories import extract_categories
-from .config import WiktionaryConfig
-from .page import parse_page
-from .thesaurus import extract_thesaurus_data
-from .wiktionary import (
-    extract_namespace,
-    parse_wiktionary,
-    reprocess_wiktionary,
-)
-from .wxr_context import WiktextractContext
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .categories import extract_categories
+    from .config import WiktionaryConfig
+    from .page import parse_page
+    from .thesaurus import extract_thesaurus_data
+    from .wiktionary import (
+        extract_namespace,
+        parse_wiktionary,
+        reprocess_wiktionary,
+    )
+    from .wxr_context import WiktextractContext
 
 __all__ = (
     "WiktionaryConfig",
@@ -23,3 +31,28 @@ __all__ = (
     "extract_namespace",
     "extract_categories",
 )
+
+# Export name -> submodule that defines it
+EXPORT_MODULES = {
+    "WiktionaryConfig": "config",
+    "WiktextractContext": "wxr_context",
+    "parse_wiktionary": "wiktionary",
+    "reprocess_wiktionary": "wiktionary",
+    "parse_page": "page",
+    "extract_thesaurus_data": "thesaurus",
+    "extract_namespace": "wiktionary",
+    "extract_categories": "categories",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = EXPORT_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
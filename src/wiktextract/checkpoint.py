@@ -0,0 +1,109 @@
+# Checkpoint journal for resuming an interrupted extraction.
+#
+# The journal is a text file that contains the titles of the pages whose
+# data has been written to the output file, one per line.  Each group of
+# titles is followed by a line that starts with a tab character and contains
+# the size of the output file after the data of those pages was written.
+# When resuming, the output file is truncated to the last recorded size, so
+# data of pages that are not in the journal is written only once.
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import TextIO
+
+from .thesaurus import ThesaurusIndex, thesaurus_entry_key
+from .wxr_logging import logger
+
+# Minimum number of seconds between saved checkpoints
+CHECKPOINT_INTERVAL = 60
+
+
+class Checkpoint:
+    def __init__(self, path: str | Path, interval: float = CHECKPOINT_INTERVAL):
+        self.path = Path(path)
+        self.interval = interval
+        self.pending_titles: list[str] = []
+        self.last_save_time = time.time()
+
+    def load(self) -> tuple[set[str], int]:
+        """Returns the titles of the completed pages and the output file size
+        recorded in the last complete checkpoint."""
+        done_titles: set[str] = set()
+        titles: list[str] = []
+        offset = 0
+        if not self.path.exists():
+            return done_titles, offset
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # partially written last line
+                if line.startswith("\t"):
+                    offset = int(line)
+                    done_titles.update(titles)
+                    titles = []
+                else:
+                    titles.append(line[:-1])
+        return done_titles, offset
+
+    def resume(self, out_f: TextIO) -> set[str]:
+        """Truncates the output file to the last checkpoint and rewrites the
+        journal without any incomplete trailing group.  Returns the titles
+        of the pages that don't need to be processed again.  If the output
+        file is shorter than the last checkpoint, e.g. because it was
+        missing and has been created again, the journal is discarded."""
+        done_titles, offset = self.load()
+        if out_f.seek(0, os.SEEK_END) < offset:
+            logger.warning(
+                f"The output file is shorter than recorded in {self.path}, "
+                "starting from the beginning"
+            )
+            done_titles, offset = set(), 0
+        out_f.seek(offset)
+        out_f.truncate()
+        with self.path.open("w", encoding="utf-8") as f:
+            for title in done_titles:
+                f.write(title + "\n")
+            f.write(f"\t{offset}\n")
+        return done_titles
+
+    def add(self, title: str) -> None:
+        self.pending_titles.append(title)
+
+    def save(self, out_f: TextIO, force: bool = False) -> None:
+        """Records the pending titles as completed after flushing the output
+        file.  Does nothing if the last checkpoint was saved less than
+        ``interval`` seconds ago, unless ``force`` is True."""
+        if not force and time.time() - self.last_save_time < self.interval:
+            return
+        out_f.flush()
+        os.fsync(out_f.fileno())
+        offset = out_f.tell()
+        with self.path.open("a", encoding="utf-8") as f:
+            for title in self.pending_titles:
+                f.write(title + "\n")
+            f.write(f"\t{offset}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.pending_titles = []
+        self.last_save_time = time.time()
+
+    def remove(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+def read_emitted_words(
+    out_f: TextIO, thesaurus_index: ThesaurusIndex | None = None
+) -> set[tuple[str, str, str]]:
+    """Returns the (word, lang_code, pos) tuples of the data already written
+    to a JSON Lines output file, see ``thesaurus_entry_key()``.  Leaves the
+    file position at the end of the file."""
+    emitted = set()
+    out_f.seek(0)
+    for line in out_f:
+        key = thesaurus_entry_key(json.loads(line), thesaurus_index)
+        if key is not None:
+            emitted.add(key)
+    out_f.seek(0, os.SEEK_END)
+    return emitted
@@ -3,7 +3,7 @@
 # Copyright (c) 2018-2022 Tatu Ylonen.  See file LICENSE and https://ylonen.org
 import re
 from collections import defaultdict
-from typing import Any, Iterable, Optional
+from typing import Any, Iterable, Optional, TypeVar
 
 # Keys in ``data`` that can only have string values (a list of them)
 STR_KEYS = frozenset({"tags", "glosses"})
@@ -21,6 +21,8 @@ DICT_KEYS = frozenset(
     }
 )
 
+T = TypeVar("T")
+
 
 def data_append(data: Any, key: str, value: Any) -> None:
     """Appends ``value`` under ``key`` in the dictionary ``data``.  The key
@@ -57,6 +59,18 @@ def data_extend(data: Any, key: str, values: Iterable) -> None:
         data_append(data, key, x)
 
 
+def data_copy(data: T) -> T:
+    """Copies the dicts and lists in extracted data.  This is like
+    ``copy.deepcopy()``, but several times faster, because the other values
+    in the data (str, int, bool and tuples of them) are immutable and are
+    not copied."""
+    if data.__class__ is dict:
+        return {k: data_copy(v) for k, v in data.items()}  # type: ignore[attr-defined,return-value]
+    if data.__class__ is list:
+        return [data_copy(v) for v in data]  # type: ignore[attr-defined,return-value]
+    return data
+
+
 def split_at_comma_semi(
     text: str,
     separators: Iterable[str] = (",", ";", "，", "،"),
@@ -122,7 +136,7 @@ def split_slashes(wxr, text):
     split is to be interpreted, trying to prefer longer forms that can be
     found in the dictionary."""
     text = text.strip()
-    if wxr.wtp.page_exists(text):
+    if wxr.page_exists(text):
         return [text]
 
     text = text.replace("／", "/")
@@ -178,7 +192,7 @@ def split_slashes(wxr, text):
             words = []
             for ws in divs:
                 assert isinstance(ws, tuple)
-                # exists = wxr.wtp.page_exists(" ".join(ws))
+                # exists = wxr.page_exists(" ".join(ws))
                 words.extend(ws)
                 score += 100
                 score += 1 / len(ws)
@@ -216,13 +230,4 @@ def ns_title_prefix_tuple(
     wxr, namespace: str, lower: bool = False
 ) -> tuple[str, ...]:
     """Based on given namespace name, create a tuple of aliases"""
-    if namespace in wxr.wtp.NAMESPACE_DATA:
-        return tuple(
-            map(
-                lambda x: x.lower() + ":" if lower else x + ":",
-                [wxr.wtp.NAMESPACE_DATA[namespace]["name"]]
-                + wxr.wtp.NAMESPACE_DATA[namespace]["aliases"],
-            )
-        )
-    else:
-        return ()
+    return wxr.ns_patterns.title_prefixes(namespace, lower)
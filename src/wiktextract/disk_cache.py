@@ -0,0 +1,81 @@
+# Cache of data that is expensive to build from the source code, e.g. the
+# tag decoding tree of the English extractor.  The data is pickled into
+# the user cache directory ($WIKTEXTRACT_CACHE_DIR, or "wiktextract" in
+# $XDG_CACHE_HOME or ~/.cache) under a name that includes a hash of the
+# source files it was built from, so changing those files rebuilds it.
+
+import gc
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import TypeVar
+
+from .wxr_logging import logger
+
+T = TypeVar("T")
+
+
+def cache_dir() -> Path:
+    path = os.environ.get("WIKTEXTRACT_CACHE_DIR")
+    if path:
+        return Path(path)
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+    if xdg_cache_home:
+        return Path(xdg_cache_home) / "wiktextract"
+    return Path.home() / ".cache" / "wiktextract"
+
+
+def source_hash(paths: Iterable[str | Path]) -> str:
+    """Returns a hash of the contents of the files and the Python version,
+    which the pickle format and regular expressions can depend on."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(sys.version.encode("utf-8"))
+    for path in paths:
+        h.update(Path(path).read_bytes())
+    return h.hexdigest()
+
+
+def load_or_build(name: str, key: str, build: Callable[[], T]) -> T:
+    """Returns the data saved as ``name`` for the hash ``key``, or calls
+    ``build()`` and saves its result.  Errors in reading or writing the cache
+    are not fatal; the data is built in memory instead."""
+    path = cache_dir() / f"{name}-{key}.pickle"
+    # Unpickling creates many objects that are never freed, which would only
+    # trigger garbage collections
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with path.open("rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable cache file {path}: {e}")
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    data = build()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so that processes running at the
+        # same time never read a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        # Remove the files of other versions of the source code
+        for old_path in path.parent.glob(f"{name}-*.pickle"):
+            if old_path != path:
+                old_path.unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning(f"Can't save cache file {path}: {e}")
+    return data
@@ -0,0 +1,79 @@
+# Base class of the pydantic models of the extractors that use them (all
+# but the English extractor, which builds dicts).
+#
+# The values assigned to the fields of a model while a page is parsed are
+# not validated: with `validate_assignment`, the validation cost more than
+# the parsing code around many assignments.  Instead, the extracted data of
+# the pages selected with `wiktwords --validate` is validated against the
+# WordEntry model once, see check_model_data() in wiktionary.py.  Set the
+# environment variable WIKTEXTRACT_VALIDATE_ASSIGNMENT=1 to validate every
+# assignment, e.g. to find the code that assigns an invalid value.
+#
+# Validating an assignment copies lists and dicts, and the parsing code
+# relies on that, so __setattr__() still copies them.  Deep copies of the
+# models (model_copy(deep=True)) only copy the lists, dicts and models in
+# them, which is much faster than copy.deepcopy().
+
+import os
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+
+_object_setattr = object.__setattr__
+
+VALIDATE_ASSIGNMENT = os.environ.get(
+    "WIKTEXTRACT_VALIDATE_ASSIGNMENT", ""
+) not in ("", "0")
+
+
+def copy_value(value: Any) -> Any:
+    """Copies the lists and dicts in a field value like the validation of
+    an assignment does; models in them are not copied."""
+    if value.__class__ is list:
+        return [copy_value(v) for v in value]
+    if value.__class__ is dict:
+        return {k: copy_value(v) for k, v in value.items()}
+    return value
+
+
+def deep_copy_value(value: Any) -> Any:
+    """Copies the lists, dicts and models in a field value.  The other values
+    of the fields (str, int, bool, tuples of str) are immutable."""
+    if value.__class__ is list:
+        return [deep_copy_value(v) for v in value] if value else []
+    if isinstance(value, ExtractorBaseModel):
+        return value.__deepcopy__()
+    if value.__class__ is dict:
+        return {k: deep_copy_value(v) for k, v in value.items()}
+    return value
+
+
+class ExtractorBaseModel(BaseModel):
+    model_config = ConfigDict(
+        extra="forbid",
+        strict=True,
+        validate_assignment=VALIDATE_ASSIGNMENT,
+        validate_default=VALIDATE_ASSIGNMENT,
+    )
+
+    if not VALIDATE_ASSIGNMENT:
+
+        def __setattr__(self, name: str, value: Any) -> None:
+            super().__setattr__(name, copy_value(value))
+
+    def __deepcopy__(
+        self, memo: dict[int, Any] | None = None
+    ) -> "ExtractorBaseModel":
+        cls = type(self)
+        m = cls.__new__(cls)
+        _object_setattr(
+            m,
+            "__dict__",
+            {k: deep_copy_value(v) for k, v in self.__dict__.items()},
+        )
+        _object_setattr(m, "__pydantic_extra__", None)
+        _object_setattr(
+            m, "__pydantic_fields_set__", set(self.__pydantic_fields_set__)
+        )
+        _object_setattr(m, "__pydantic_private__", None)
+        return m
@@ -5,6 +5,7 @@ from wikitextprocessor.parser import HTMLNode, TemplateNode
 
 from ...page import clean_node
 from ...wxr_context import WiktextractContext
+from ..inflection_page_cache import extract_inflection_page
 from .models import Form, WordEntry
 from .tags import translate_raw_tags
 
@@ -13,9 +14,19 @@ def parse_flexion_page(
     wxr: WiktextractContext, word_entry: WordEntry, page_title: str
 ) -> None:
     # https://de.wiktionary.org/wiki/Hilfe:Flexionsseiten
-    flexion_page = wxr.wtp.get_page_body(
-        page_title, wxr.wtp.NAMESPACE_DATA["Flexion"]["id"]
+    ns_id = wxr.wtp.NAMESPACE_DATA["Flexion"]["id"]
+    extract_inflection_page(
+        wxr,
+        word_entry,
+        (ns_id, page_title),
+        lambda e: extract_flexion_page(wxr, e, ns_id, page_title),
     )
+
+
+def extract_flexion_page(
+    wxr: WiktextractContext, word_entry: WordEntry, ns_id: int, page_title: str
+) -> None:
+    flexion_page = wxr.wtp.get_page_body(page_title, ns_id)
     if flexion_page is None:
         return
     flexion_root = wxr.wtp.parse(flexion_page)
@@ -1,13 +1,10 @@
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import ConfigDict, Field
 
+from ..base_model import ExtractorBaseModel
 
-class BaseModelWrap(BaseModel):
-    model_config = ConfigDict(
-        extra="forbid",
-        strict=True,
-        validate_assignment=True,
-        validate_default=True,
-    )
+
+class BaseModelWrap(ExtractorBaseModel):
+    pass
 
 
 class Linkage(BaseModelWrap):
@@ -4,18 +4,31 @@
 # and exclude some words.  These will likely need to be tweaked semi-frequently
 # to add support for unrecognized sense descriptions.
 #
+# The words of the Brown corpus are packaged in data/en/brown_words.txt, one
+# word per line, so that nltk and its corpus data are not needed at run time.
+# Run tools/generate_brown_words.py to create the file again.
+#
 # Copyright (c) 2020-2022 Tatu Ylonen.  See file LICENSE and https://ylonen.org
 
-import nltk  # type: ignore[import-untyped]
-from nltk.corpus import brown  # type: ignore[import-untyped]
+from importlib.resources import files
 
 from .form_descriptions_known_firsts import known_firsts  # w/ our additions
 
-# Download Brown corpus if not already downloaded
-try:
-    nltk.data.find("corpora/brown.zip")
-except LookupError:
-    nltk.download("brown", quiet=True)
+BROWN_WORDS_PATH = files("wiktextract") / "data" / "en" / "brown_words.txt"
+
+
+def load_brown_words() -> set[str]:
+    """Returns the words of the Brown corpus from the packaged word list.
+    Raises FileNotFoundError if the file is missing: without it,
+    classify_desc() would not recognize most English words."""
+    try:
+        return set(BROWN_WORDS_PATH.read_text(encoding="utf-8").splitlines())
+    except FileNotFoundError as e:
+        raise FileNotFoundError(
+            f"{BROWN_WORDS_PATH} not found; create it with "
+            "tools/generate_brown_words.py"
+        ) from e
+
 
 # English words added to the default set from Brown corpus.  Multi-word
 # expressions separated by spaces can also be added but must match the whole
@@ -1944,7 +1957,7 @@ not_english_words = not_english_words_1 | potentially_english_words
 # Construct a set of (most) English words.  Multi-word expressions where we
 # do not want to include the components can also be put here space-separated.
 english_words = (
-    set(brown.words())
+    load_brown_words()
     | known_firsts
     |
     # XXX the second words of species names add too much garbage
@@ -1,7 +1,6 @@
-from copy import deepcopy
-
 from wikitextprocessor import HTMLNode, NodeKind, TemplateNode, WikiNode
 
+from ...datautils import data_copy
 from ...page import clean_node
 from ...tags import valid_tags
 from ...wxr_context import WiktextractContext
@@ -135,7 +134,7 @@ def extract_template_zh_x(
     results = []
     for dl_tag in expanded_node.find_html_recursively("dl"):
         has_dl_tag = True
-        example_data = deepcopy(parent_example)
+        example_data = data_copy(parent_example)
         example_data["english"] = clean_node(
             wxr, None, template_node.template_parameters.get(2, "")
         )
@@ -161,7 +160,7 @@ def extract_template_zh_x(
 
     # no source, single line example
     if not has_dl_tag:
-        example_data = deepcopy(parent_example)
+        example_data = data_copy(parent_example)
         for span_tag in expanded_node.find_html(
             "span", attr_name="lang", attr_value="Latn"
         ):
@@ -182,7 +181,7 @@ def extract_template_zh_x(
             if span_lang in ["zh-Hant", "zh-Hans"]:
                 example_text = clean_node(wxr, None, span_tag)
                 if len(example_text) > 0:
-                    new_example = deepcopy(example_data)
+                    new_example = data_copy(example_data)
                     new_example["text"] = example_text
                     new_example["tags"].append(
                         "Traditional Chinese"
@@ -203,7 +202,7 @@ def extract_zh_x_dl_span_tag(
     for span_tag in dl_tag.find_html("span"):
         span_lang = span_tag.attrs.get("lang", "")
         if span_lang in ["zh-Hant", "zh-Hans"]:
-            new_example = deepcopy(example)
+            new_example = data_copy(example)
             new_example["text"] = clean_node(wxr, None, span_tag)
             results.append(new_example)
         elif "vsHide" in span_tag.attrs.get("class", ""):
@@ -7,8 +7,8 @@
 import functools
 import re
 import unicodedata
+from pathlib import Path
 from typing import (
-    Any,
     Literal,
     Optional,
     Sequence,
@@ -16,9 +16,9 @@ from typing import (
 )
 
 import Levenshtein
-from nltk import TweetTokenizer  # type:ignore[import-untyped]
 
 from ...datautils import data_append, data_extend, split_at_comma_semi
+from ...result_cache import persistent_cache
 from ...tags import (
     alt_of_tags,
     form_of_tags,
@@ -29,21 +29,13 @@ from ...tags import (
     head_final_other_map,
     head_final_semitic_langs,
     head_final_semitic_map,
-    uppercase_tags,
     valid_tags,
     xlat_descs_map,
     xlat_head_map,
     xlat_tags_map,
 )
-from ...topics import topic_generalize_map, valid_topics
 from ...wxr_context import WiktextractContext
-from .english_words import (
-    english_words,
-    not_english_words,
-    potentially_english_words,
-)
-from .form_descriptions_known_firsts import known_firsts
-from .taxondata import known_species
+from .tokenizer import tokenize
 from .type_utils import (
     AltOf,
     FormData,
@@ -53,9 +45,24 @@ from .type_utils import (
     TranslationData,
     WordData,
 )
-
-# Tokenizer for classify_desc()
-tokenizer = TweetTokenizer()
+from .valid_sequences import ValidNode, get_slashes_re, get_valid_sequences
+
+# The modules and data that determine the results of decode_tags() and
+# classify_desc(); changing them invalidates the results saved with
+# `wiktwords --result-cache`
+DECODE_TAGS_SOURCES: tuple[Union[str, Path], ...] = (
+    "wiktextract.tags",
+    "wiktextract.topics",
+    "wiktextract.extractor.en.valid_sequences",
+    __name__,
+)
+CLASSIFY_DESC_SOURCES = DECODE_TAGS_SOURCES + (
+    "wiktextract.extractor.en.english_words",
+    "wiktextract.extractor.en.form_descriptions_known_firsts",
+    "wiktextract.extractor.en.taxondata",
+    "wiktextract.extractor.en.tokenizer",
+    Path(__file__).parents[2] / "data" / "en" / "brown_words.txt",
+)
 
 # These are ignored as the value of a related form in form head.
 IGNORED_RELATED: set[str] = set(
@@ -660,195 +667,6 @@ alt_of_form_of_clean_re = re.compile(
 )
 
 
-class ValidNode:
-    """Node in the valid_sequences tree. Each node is part of a chain
-    or chains that form sequences built out of keys in key->tags
-    maps like xlat_tags, etc. The ValidNode's 'word' is the key
-    by which it is refered to in the root dict or a `children` dict,
-    `end` marks that the node is the end-terminus of a sequence (but
-    it can still continue if the sequence is shared by the start of
-    other sequences: "nominative$" and "nominative plural$" for example),
-    `tags` and `topics` are the dicts containing tag and topic strings
-    for terminal nodes (end==True)."""
-
-    __slots__ = (
-        "end",
-        "tags",
-        "topics",
-        "children",
-    )
-
-    def __init__(
-        self,
-        end=False,
-        tags: Optional[list[str]] = None,
-        topics: Optional[list[str]] = None,
-        children: Optional[dict[str, "ValidNode"]] = None,
-    ) -> None:
-        self.end = end
-        self.tags: list[str] = tags or []
-        self.topics: list[str] = topics or []
-        self.children: dict[str, "ValidNode"] = children or {}
-
-
-def add_to_valid_tree(tree: ValidNode, desc: str, v: Optional[str]) -> None:
-    """Helper function for building trees of valid tags/sequences during
-    initialization."""
-    assert isinstance(tree, ValidNode)
-    assert isinstance(desc, str)
-    assert v is None or isinstance(v, str)
-    node = tree
-
-    # Build the tree structure: each node has children nodes
-    # whose names are denoted by their dict key.
-    for w in desc.split(" "):
-        if w in node.children:
-            node = node.children[w]
-        else:
-            new_node = ValidNode()
-            node.children[w] = new_node
-            node = new_node
-    if not node.end:
-        node.end = True
-    if not v:
-        return None  # Terminate early because there are no tags
-
-    tagslist = []
-    topicslist = []
-    for vv in v.split():
-        if vv in valid_tags:
-            tagslist.append(vv)
-        elif vv in valid_topics:
-            topicslist.append(vv)
-        else:
-            print(
-                "WARNING: tag/topic {!r} maps to unknown {!r}".format(desc, vv)
-            )
-    topics = " ".join(topicslist)
-    tags = " ".join(tagslist)
-    # Changed to "_tags" and "_topics" to avoid possible key-collisions.
-    if topics:
-        node.topics.extend([topics])
-    if tags:
-        node.tags.extend([tags])
-
-
-def add_to_valid_tree1(
-    tree: ValidNode,
-    k: str,
-    v: Union[list[str], tuple[str, ...], str],
-    valid_values: Union[set[str], dict[str, Any]],
-) -> list[str]:
-    assert isinstance(tree, ValidNode)
-    assert isinstance(k, str)
-    assert v is None or isinstance(v, (list, tuple, str))
-    assert isinstance(valid_values, (set, dict))
-    if not v:
-        add_to_valid_tree(valid_sequences, k, None)
-        return []
-    elif isinstance(v, str):
-        v = [v]
-    q = []
-    for vv in v:
-        assert isinstance(vv, str)
-        add_to_valid_tree(valid_sequences, k, vv)
-        vvs = vv.split()
-        for x in vvs:
-            q.append(x)
-    # return each individual tag
-    return q
-
-
-def add_to_valid_tree_mapping(
-    tree: ValidNode,
-    mapping: Union[dict[str, Union[list[str], str]], dict[str, str]],
-    valid_values: Union[set[str], dict[str, Any]],
-    recurse: bool,
-) -> None:
-    assert isinstance(tree, ValidNode)
-    assert isinstance(mapping, dict)
-    assert isinstance(valid_values, (set, dict))
-    assert recurse in (True, False)
-    for k, v in mapping.items():
-        assert isinstance(k, str)
-        assert isinstance(v, (list, str))
-        if isinstance(v, str):
-            q = add_to_valid_tree1(tree, k, [v], valid_values)
-        else:
-            q = add_to_valid_tree1(tree, k, v, valid_values)
-        if recurse:
-            visited = set()
-            while q:
-                v = q.pop()
-                if v in visited:
-                    continue
-                visited.add(v)
-                if v not in mapping:
-                    continue
-                vv = mapping[v]
-                qq = add_to_valid_tree1(tree, k, vv, valid_values)
-                q.extend(qq)
-
-
-# Tree of sequences considered to be tags (includes sequences that are
-# mapped to something that becomes one or more valid tags)
-valid_sequences = ValidNode()
-sequences_with_slashes: set[str] = set()
-for tag in valid_tags:
-    # The basic tags used in our tag system; some are a bit weird, but easier
-    # to implement this with 'false' positives than filter out stuff no one else
-    # uses.
-    if "/" in tag:
-        sequences_with_slashes.add(tag)
-    add_to_valid_tree(valid_sequences, tag, tag)
-for tag in uppercase_tags:
-    hyphenated = re.sub(r"\s+", "-", tag)
-    if hyphenated in valid_tags:
-        print(
-            "DUPLICATE TAG: {} (from uppercase tag {!r})".format(
-                hyphenated, tag
-            )
-        )
-    assert hyphenated not in valid_tags
-    # Might as well, while we're here: Add hyphenated location tag.
-    valid_tags[hyphenated] = "dialect"
-    add_to_valid_tree(valid_sequences, hyphenated, hyphenated)
-for tag in uppercase_tags:
-    hyphenated = re.sub(r"\s+", "-", tag)
-    # XXX Move to above loop? Or is this here for readability?
-    if "/" in tag:
-        sequences_with_slashes.add(tag)
-    add_to_valid_tree(valid_sequences, tag, hyphenated)
-# xlat_tags_map!
-add_to_valid_tree_mapping(valid_sequences, xlat_tags_map, valid_tags, False)
-for k in xlat_tags_map:
-    if "/" in k:
-        sequences_with_slashes.add(k)
-# Add topics to the same table, with all generalized topics also added
-for topic in valid_topics:
-    assert " " not in topic
-    if "/" in topic:
-        sequences_with_slashes.add(topic)
-    add_to_valid_tree(valid_sequences, topic, topic)
-# Let each original topic value stand alone.  These are not generally on
-# valid_topics.  We add the original topics with spaces replaced by hyphens.
-for topic in topic_generalize_map.keys():
-    hyphenated = topic.replace(" ", "-")
-    valid_topics.add(hyphenated)
-    if "/" in topic:
-        sequences_with_slashes.add(tag)
-    add_to_valid_tree(valid_sequences, topic, hyphenated)
-# Add canonicalized/generalized topic values
-add_to_valid_tree_mapping(
-    valid_sequences, topic_generalize_map, valid_topics, True
-)
-
-# Regex used to divide a decode candidate into parts that shouldn't
-# have their slashes turned into spaces
-slashes_re = re.compile(
-    r"(" + "|".join((re.escape(s) for s in sequences_with_slashes)) + r")"
-)
-
 # Regexp used to find "words" from word heads and linguistic descriptions
 word_pattern = (
     r"[^ ,;()\u200e]+|"
@@ -989,7 +807,7 @@ def add_new1(
     return max_last_i
 
 
-@functools.lru_cache(maxsize=65536)
+@persistent_cache("decode_tags", DECODE_TAGS_SOURCES)
 def decode_tags(
     src: str,
     allow_any=False,
@@ -1012,7 +830,7 @@ def decode_tags(
             # to skip them by splitting the string and skipping handling every
             # second entry, which contains the splitting group like "masculine/
             # feminine" style keys.
-            split_parts = re.split(slashes_re, src)
+            split_parts = get_slashes_re().split(src)
             new_parts: list[str] = []
             if len(split_parts) > 1:
                 for i, s in enumerate(split_parts):
@@ -1065,6 +883,7 @@ def decode_tags1(
 
     # print("decode_tags: src={!r}".format(src))
 
+    valid_sequences = get_valid_sequences()
     pos_paths: list[list[list[PosPathStep]]] = [[[]]]
     wordlst: list[str] = []
     max_last_i = 0  # pre-initialized here so that it can be used as a ref
@@ -3102,7 +2921,7 @@ def parse_alt_or_inflection_of1(
     lst = base.split()
     # print("parse_alt_or_inflection_of: lst={}".format(lst))
     if len(lst) >= 3 and lst[-1] in ("case", "case."):
-        node = valid_sequences.children.get(lst[-2])
+        node = get_valid_sequences().children.get(lst[-2])
         if node and node.end:
             for s in node.tags:
                 tags.extend(s.split(" "))
@@ -3141,7 +2960,7 @@ def parse_alt_or_inflection_of1(
         base = base[:-1].strip()
     while (
         base.endswith(".")
-        and not wxr.wtp.page_exists(base)
+        and not wxr.page_exists(base)
         and base not in gloss_template_args
     ):
         base = base[:-1].strip()
@@ -3150,7 +2969,7 @@ def parse_alt_or_inflection_of1(
         tags.append("conjecture")
     while (
         base.endswith(".")
-        and not wxr.wtp.page_exists(base)
+        and not wxr.page_exists(base)
         and base not in gloss_template_args
     ):
         base = base[:-1].strip()
@@ -3199,7 +3018,7 @@ def parse_alt_or_inflection_of1(
     for p in parts:
         # Check for some suspicious base forms
         m = re.search(r"[.,] |[{}()]", p)
-        if m and not wxr.wtp.page_exists(p):
+        if m and not wxr.page_exists(p):
             wxr.wtp.debug(
                 "suspicious alt_of/form_of with {!r}: {}".format(m.group(0), p),
                 sortid="form_descriptions/2278",
@@ -3215,7 +3034,7 @@ def parse_alt_or_inflection_of1(
     return tags, dt_lst
 
 
-@functools.lru_cache(maxsize=65536)
+@persistent_cache("classify_desc", CLASSIFY_DESC_SOURCES)
 def classify_desc(
     desc: str,
     allow_unknown_tags=False,
@@ -3244,6 +3063,16 @@ def classify_desc(
         ):
             return "tags"
 
+    # The word lists are large and nltk is slow to import, so they are only
+    # imported when the first description is not tags
+    from .english_words import (
+        english_words,
+        not_english_words,
+        potentially_english_words,
+    )
+    from .form_descriptions_known_firsts import known_firsts
+    from .taxondata import known_species
+
     # Check if it looks like the taxonomic name of a species
     if desc in known_species:
         return "taxonomic"
@@ -3275,7 +3104,7 @@ def classify_desc(
         desc1 = re.sub(
             tokenizer_fixup_re, lambda m: tokenizer_fixup_map[m.group(0)], desc
         )
-        tokens = tokenizer.tokenize(desc1)
+        tokens = tokenize(desc1)
         if not tokens:
             return "other"
         lst_bool = list(
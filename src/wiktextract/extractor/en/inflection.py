@@ -15,6 +15,7 @@ from wikitextprocessor import MAGIC_FIRST, NodeKind, WikiNode
 
 from ...clean import clean_value
 from ...datautils import data_append, freeze, split_at_comma_semi
+from ...page import CountedLRUCache, counted_caches
 from ...tags import valid_tags
 from ...wxr_context import WiktextractContext
 from .form_descriptions import (
@@ -33,6 +34,11 @@ from .type_utils import FormData
 # print out debug messages when encountering this text.
 debug_cell_text: Optional[str] = None
 
+# Maximum number of expand_header() results cached in each process
+EXPAND_HEADER_CACHE_SIZE = 65536
+expand_header_cache = CountedLRUCache(EXPAND_HEADER_CACHE_SIZE)
+counted_caches["expand_header"] = expand_header_cache
+
 
 def set_debug_cell_text(text: str) -> None:
     global debug_cell_text
@@ -785,7 +791,12 @@ def expand_header(
     If ``silent`` is True, then no warnings will be printed.  If ``ignore_tags``
     is True, then tags listed in "if" will be ignored in the test (this is
     used when trying to heuristically detect whether a non-<th> cell is anyway
-    a header)."""
+    a header).
+
+    Tables made with the same template have the same headers on thousands
+    of pages, so the tagsets are cached by the language, part-of-speech,
+    template, text and the tags that the conditions can test.  Expansions
+    that print warnings are not cached, so the warnings are printed again."""
     assert isinstance(wxr, WiktextractContext)
     assert isinstance(word, str)
     assert isinstance(lang, str)
@@ -795,6 +806,20 @@ def expand_header(
     assert silent in (True, False)
     assert isinstance(depth, int)
     # print("EXPAND_HDR: text={!r} base_tags={!r}".format(text, base_tags))
+    cache_key = (
+        lang,
+        pos,
+        tablecontext.template_name if tablecontext else None,
+        depth,
+        text,
+        frozenset(base_tags) if not ignore_tags else None,
+        silent,
+        ignore_tags,
+    )
+    cached = expand_header_cache.get(cache_key)
+    if cached is not None:
+        return list(cached)
+    cacheable = True
     # First map the text using the inflection map
     text = clean_value(wxr, text)
     combined_return: list[tuple[str, ...]] = []
@@ -828,6 +853,7 @@ def expand_header(
                 v = infl_map[text_without_parens]
             elif m is None:
                 if not silent:
+                    cacheable = False
                     wxr.wtp.debug(
                         "inflection table: unrecognized header: {}".format(
                             repr(text)
@@ -864,6 +890,7 @@ def expand_header(
             # Otherwise the value should be a dictionary describing a
             # conditional expression.
             if not isinstance(v, dict):
+                cacheable = False
                 wxr.wtp.debug(
                     "inflection table: internal: "
                     "UNIMPLEMENTED INFL_MAP VALUE: {}".format(infl_map[text]),
@@ -948,6 +975,7 @@ def expand_header(
             # Warning message about missing conditions for debugging.
 
             if cond == "default-true" and not default_then and not silent:
+                cacheable = False
                 wxr.wtp.debug(
                     "inflection table: IF MISSING COND: word={} "
                     "lang={} text={} base_tags={} c={} cond={}".format(
@@ -966,6 +994,7 @@ def expand_header(
                         v = default_then
                     else:
                         if not silent:
+                            cacheable = False
                             wxr.wtp.debug(
                                 "inflection table: IF WITHOUT ELSE EVALS "
                                 "False: "
@@ -985,6 +1014,8 @@ def expand_header(
     # Return the combined tagsets, or empty tagset if we got no tagsets
     if not combined_return:
         combined_return = [()]
+    if cacheable:
+        expand_header_cache.put(cache_key, tuple(combined_return))
     return combined_return
 
 
@@ -1,6 +1,7 @@
 # Language-specific configuration for various aspects of inflection table
 # parsing.
 
+import functools
 import re
 from typing import Optional, TypedDict, Union
 
@@ -844,9 +845,11 @@ lang_specific: dict[str, LangConfDict] = {
 #                                      .format(k, kk, vv))
 
 
+@functools.cache
 def get_lang_conf(lang, field):
     """Returns the given field from language-specific data or "default"
-    if the language is not listed or does not have the field."""
+    if the language is not listed or does not have the field.  The values
+    are cached, so lang_specific must not be modified."""
     assert isinstance(lang, str)
     assert isinstance(field, str)
     while True:
@@ -861,6 +864,39 @@ def get_lang_conf(lang, field):
             lang = lconfigs.get("next", "default")
 
 
+@functools.cache
+def compiled_form_transformations(
+    lang: str, pos: str
+) -> tuple[Optional[re.Pattern], dict[int, tuple[str, tuple[str, ...]]]]:
+    r"""Returns the form_transformations rules of the language for the part
+    of speech compiled into one regular expression, and a dict from the
+    index of the group of each rule to its replacement and tags.  Each rule
+    is an alternative ``(?=[\s\S]*?(?P<rN>pattern))`` matched at the start
+    of the form: the lookahead finds the same match as re.search(pattern,
+    form), and the first rule that matches anywhere in the form wins, as if
+    the rules were tried in order."""
+    alts = []
+    rules = []
+    for patpos, pattern, dst, tags in get_lang_conf(
+        lang, "form_transformations"
+    ):
+        #   PoS, regex, replacement, tags; pattern -> dst :: "^ich " > ""
+        assert patpos in PARTS_OF_SPEECH
+        if pos != patpos:
+            continue
+        tags = tuple(tags.split())
+        for t in tags:
+            assert t in valid_tags
+        alts.append(r"(?=[\s\S]*?(?P<r{}>{}))".format(len(rules), pattern))
+        rules.append((dst, tags))
+    if not rules:
+        return None, {}
+    regex = re.compile("|".join(alts))
+    return regex, {
+        regex.groupindex["r{}".format(i)]: rule for i, rule in enumerate(rules)
+    }
+
+
 def lang_specific_tags(lang, pos, form):
     """Extracts tags from the word form itself in a language-specific way.
     This may also adjust the word form.
@@ -870,18 +906,12 @@ def lang_specific_tags(lang, pos, form):
     assert isinstance(lang, str)
     assert isinstance(pos, str)
     assert isinstance(form, str)
-    rules = get_lang_conf(lang, "form_transformations")
-    for patpos, pattern, dst, tags in rules:
-        #   PoS, regex, replacement, tags; pattern -> dst :: "^ich " > ""
-        assert patpos in PARTS_OF_SPEECH
-        if pos != patpos:
-            continue
-        m = re.search(pattern, form)
-        if not m:
-            continue
-        form = form[: m.start()] + dst + form[m.end() :]
-        tags = tags.split()
-        for t in tags:
-            assert t in valid_tags
-        return form, tags
-    return form, []
+    regex, rules = compiled_form_transformations(lang, pos)
+    if regex is None:
+        return form, []
+    m = regex.match(form)
+    if m is None:
+        return form, []
+    dst, tags = rules[m.lastindex]
+    start, end = m.span(m.lastindex)
+    return form[:start] + dst + form[end:], list(tags)
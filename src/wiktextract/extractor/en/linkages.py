@@ -369,8 +369,8 @@ def parse_linkage_item_text(
         # print("linkage prefix: desc={!r} cls={} rest={!r} cls2={}"
         #      .format(desc, cls, rest, cls2))
 
-        e1 = wxr.wtp.page_exists(desc)
-        e2 = wxr.wtp.page_exists(rest)
+        e1 = wxr.page_exists(desc)
+        e2 = wxr.page_exists(rest)
         if cls != "tags":
             if (
                 cls2 == "tags"
@@ -887,7 +887,7 @@ def parse_linkage_item_text(
             if (
                 (not w or "," not in w)
                 and (not r or "," not in r)
-                and not wxr.wtp.page_exists(w)
+                and not wxr.page_exists(w)
             ):
                 lst = w.split("／") if len(w) > 1 else [w]
                 if len(lst) == 1:
@@ -905,9 +905,9 @@ def parse_linkage_item_text(
             # abbreviations that end with a period that should be kept)
             if (
                 w.endswith(".")
-                and not wxr.wtp.page_exists(w)
+                and not wxr.page_exists(w)
                 and (
-                    wxr.wtp.page_exists(w[:-1])
+                    wxr.page_exists(w[:-1])
                     or (len(w) >= 5)
                     and "." not in w[:-1]
                 )
@@ -32,6 +32,7 @@ from wikitextprocessor.parser import (
 from ...clean import clean_template_args, clean_value
 from ...datautils import (
     data_append,
+    data_copy,
     data_extend,
     ns_title_prefix_tuple,
 )
@@ -46,6 +47,7 @@ from ...wxr_context import WiktextractContext
 from ...wxr_logging import logger
 from ..ruby import extract_ruby, parse_ruby
 from ..share import strip_nodes
+from ..subpage_memo import subpage_memo
 from .example import extract_example_list_item, extract_template_zh_x
 from .form_descriptions import (
     classify_desc,
@@ -55,7 +57,6 @@ from .form_descriptions import (
     parse_sense_qualifier,
     parse_word_head,
 )
-from .inflection import TableContext, parse_inflection_section
 from .info_templates import (
     INFO_TEMPLATE_FUNCS,
     parse_info_template_arguments,
@@ -909,11 +910,22 @@ def parse_language(
     # a step.
     stack: list[str] = []  # names of items on the "stack"
 
-    def merge_base(data: WordData, base: WordData) -> None:
+    def merge_base(data: WordData, base: WordData, share: bool = False) -> None:
+        """Merges the fields of ``base`` into ``data``.  With ``share``, the
+        caller discards ``base`` after merging it into its entries, so only
+        the lists and dicts of the fields are copied and their items, e.g.
+        the sounds and etymology templates, are shared by the entries.  The
+        shared items must not be modified after merging (see
+        ``without_pos()`` below)."""
         for k, v in base.items():
             # Copy the value to ensure that we don't share lists or
-            # dicts between structures (even nested ones).
-            v = copy.deepcopy(v)
+            # dicts between structures (even nested ones, unless sharing).
+            if not share:
+                v = data_copy(v)
+            elif isinstance(v, list):
+                v = list(v)  # type: ignore[assignment]
+            elif isinstance(v, dict):
+                v = dict(v)  # type: ignore[assignment]
             if k not in data:
                 # The list was copied above, so this will not create shared ref
                 data[k] = v  # type: ignore[literal-required]
@@ -935,11 +947,12 @@ def parse_language(
                     sortid="page/904",
                 )
 
-        def complementary_pop(pron: SoundData, key: str) -> SoundData:
-            """Remove unnecessary keys from dict values
-            in a list comprehension..."""
-            if key in pron:
-                pron.pop(key)  # type: ignore
+        def without_pos(pron: SoundData) -> SoundData:
+            """Returns the sound without its "pos" key.  The sound may be
+            shared with the entries of other parts of speech, which still
+            need the key, so it is not removed from the shared dict."""
+            if "pos" in pron:
+                return {k: v for k, v in pron.items() if k != "pos"}  # type: ignore[return-value]
             return pron
 
         # If the result has sounds, eliminate sounds that have a prefix that
@@ -956,7 +969,7 @@ def parse_language(
         # does not match "pos"
         if "sounds" in data and "pos" in data:
             data["sounds"] = list(
-                complementary_pop(s, "pos")
+                without_pos(s)
                 for s in data["sounds"]
                 # "pos" is not a field of SoundData, correctly, so we're
                 # removing it here. It's a kludge on a kludge on a kludge.
@@ -1014,19 +1027,21 @@ def parse_language(
         push_sense()
         if wxr.wtp.subsection:
             data: WordData = {"senses": pos_datas}
-            merge_base(data, pos_data)
+            merge_base(data, pos_data, share=True)
             level_four_datas.append(data)
         pos_data = {}
         pos_datas = []
         wxr.wtp.start_subsection(None)
 
-    def push_level_four_section() -> None:
+    def push_level_four_section(etym_ends: bool = False) -> None:
         """Starts collecting data for a new level four sections, which
         is usually virtual and empty, unless the article has Chinese
         'Pronunciation' sections that are etymology-section-like but
         under etymology, and at the same level in the source. We modify
         the source to demote Pronunciation sections like that to level
-        4, and other sections one step lower."""
+        4, and other sections one step lower.  ``etym_ends`` is True if
+        the etymology section ends too, i.e., its data is not modified
+        after this."""
         nonlocal level_four_data
         nonlocal level_four_datas
         nonlocal etym_datas
@@ -1036,10 +1051,10 @@ def parse_language(
         # print(f"======\n{level_four_data=}")
         # print(f"======\n{level_four_datas=}")
         for data in level_four_datas:
-            merge_base(data, level_four_data)
+            merge_base(data, level_four_data, share=True)
             etym_datas.append(data)
         for data in etym_datas:
-            merge_base(data, etym_data)
+            merge_base(data, etym_data, share=etym_ends)
             page_datas.append(data)
         level_four_data = {}
         level_four_datas = []
@@ -1052,7 +1067,7 @@ def parse_language(
         nonlocal have_etym
         nonlocal inside_level_four
         have_etym = True
-        push_level_four_section()
+        push_level_four_section(True)
         inside_level_four = False
         etym_data = {}
 
@@ -1973,7 +1988,7 @@ def parse_language(
                     continue
                 # copy sense_base to prevent cross-contamination between
                 # subglosses and other subglosses and superglosses
-                sense_base2 = copy.deepcopy(sense_base)
+                sense_base2 = data_copy(sense_base)
                 if parse_sense_node(item, sense_base2, pos):
                     added = True
 
@@ -2330,6 +2345,10 @@ def parse_language(
             # Parse inflection tables from the section.  The data is stored
             # under "forms".
             if wxr.config.capture_inflections:
+                # Imported here with the large inflection table data
+                # because many pages have no inflection tables
+                from .inflection import TableContext, parse_inflection_section
+
                 tablecontext = None
                 m = re.search(r"{{([^}{|]+)\|?", text)
                 if m:
@@ -2360,8 +2379,24 @@ def parse_language(
         for x in seq:
             assert isinstance(x, str)
         subpage_title = word + "/" + subtitle
-        subpage_content = wxr.wtp.get_page_body(subpage_title, 0)
-        if subpage_content is None:
+
+        def parse_subpage() -> Optional[WikiNode]:
+            subpage_content = wxr.wtp.get_page_body(subpage_title, 0)
+            if subpage_content is None:
+                return None
+            tree = wxr.wtp.parse(
+                subpage_content,
+                pre_expand=True,
+                additional_expand=ADDITIONAL_EXPAND_TEMPLATES,
+                do_not_pre_expand=DO_NOT_PRE_EXPAND_TEMPLATES,
+            )
+            assert tree.kind == NodeKind.ROOT
+            return tree
+
+        # The subpage is parsed once per page and the sections found in it
+        # are remembered, see subpage_memo.py
+        tree = subpage_memo.get(wxr, ("tree", subpage_title), parse_subpage)
+        if tree is None:
             wxr.wtp.error(
                 "/translations not found despite "
                 "{{see translation subpage|...}}",
@@ -2391,14 +2426,11 @@ def parse_language(
                     return ret
             return None
 
-        tree = wxr.wtp.parse(
-            subpage_content,
-            pre_expand=True,
-            additional_expand=ADDITIONAL_EXPAND_TEMPLATES,
-            do_not_pre_expand=DO_NOT_PRE_EXPAND_TEMPLATES,
+        ret = subpage_memo.get(
+            wxr,
+            ("section", subpage_title, tuple(x.lower() for x in seq)),
+            lambda: recurse(tree, seq),
         )
-        assert tree.kind == NodeKind.ROOT
-        ret = recurse(tree, seq)
         if ret is None:
             wxr.wtp.debug(
                 "Failed to find subpage section {}/{} seq {}".format(
@@ -3647,7 +3679,7 @@ def parse_language(
                 if "pos" not in pos_data:
                     pos_data["pos"] = "soft-redirect"
             else:
-                new_page_data = copy.deepcopy(base_data)
+                new_page_data = data_copy(base_data)
                 new_page_data["redirects"] = redirect_list
                 if "pos" not in new_page_data:
                     new_page_data["pos"] = "soft-redirect"
@@ -4058,7 +4090,7 @@ def parse_language(
     push_etym()
     ret = []
     for data in page_datas:
-        merge_base(data, base_data)
+        merge_base(data, base_data, share=True)
         ret.append(data)
 
     # Copy all tags to word senses
@@ -1,13 +1,17 @@
 import hashlib
 import re
 import urllib
-from copy import deepcopy
 from typing import Iterator, Optional, Union
 
 from wikitextprocessor import NodeKind, TemplateNode, WikiNode
 
 from ...clean import clean_value
-from ...datautils import data_append, data_extend, split_at_comma_semi
+from ...datautils import (
+    data_append,
+    data_copy,
+    data_extend,
+    split_at_comma_semi,
+)
 from ...page import LEVEL_KINDS, clean_node, is_panel_template
 from ...tags import valid_tags
 from ...wxr_context import WiktextractContext
@@ -163,7 +167,7 @@ def extract_pron_template(
     # print(f">>>>> {new_parts=}")
 
     for part in new_parts:
-        sd = deepcopy(base_data)
+        sd = data_copy(base_data)
         if part[0]:
             parse_pronunciation_tags(wxr, part[0], sd)
         if part[2]:
@@ -818,7 +822,7 @@ def parse_pronunciation(
                         audios[idx]["form"] = prefix
                 else:
                     if earlier_base_data:
-                        pron = deepcopy(earlier_base_data)
+                        pron = data_copy(earlier_base_data)
                         pron[field] = v
                     else:
                         pron = {field: v}  # type: ignore[misc]
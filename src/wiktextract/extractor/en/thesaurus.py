@@ -8,7 +8,6 @@ from typing import Union
 
 from mediawiki_langcodes import code_to_name, name_to_code
 from wikitextprocessor import NodeKind, Page, WikiNode
-from wikitextprocessor.core import NamespaceDataEntry
 
 from ...datautils import ns_title_prefix_tuple
 from ...page import LEVEL_KINDS, clean_node
@@ -72,10 +71,8 @@ def extract_thesaurus_page(
 ) -> list[ThesaurusTerm]:
     """Extracts linkages from the thesaurus pages in Wiktionary."""
 
-    thesaurus_ns_data: NamespaceDataEntry
-    thesaurus_ns_data = wxr.wtp.NAMESPACE_DATA["Thesaurus"]
-
-    thesaurus_ns_local_name = thesaurus_ns_data["name"]
+    thesaurus_ns_local_name = wxr.ns_patterns.thesaurus_name
+    assert thesaurus_ns_local_name is not None
 
     title = page.title
     text = page.body
@@ -0,0 +1,53 @@
+# Tokenizer for classify_desc().  The tokens are those of nltk's
+# TweetTokenizer, but text made of letters, digits, spaces and common
+# punctuation is split with a much simpler regex.  TweetTokenizer also
+# recognizes URLs, e-mail addresses, emoticons, phone numbers etc., which
+# need characters (e.g. ":", "@" or a dot followed by a letter) or character
+# sequences that are not in such text; all other text is passed to
+# TweetTokenizer.  Run tools/benchmark_tokenizer.py to compare the speed of
+# the two.
+
+import functools
+import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from nltk import TweetTokenizer  # type:ignore[import-untyped]
+
+# Text that can't be tokenized with FAST_TOKEN_RE: characters that can
+# start or be part of the special tokens of TweetTokenizer, dots followed by
+# a letter (domain names), "8" next to a "mouth" (emoticons like "8)" or
+# "8O)"; the emoticon regex of nltk ignores case, so "O" is a nose too),
+# seven or more digits (phone numbers) and runs of four or more of the same
+# non-word character, which TweetTokenizer shortens to three.
+FAST_TOKENIZE_UNSAFE_RE = re.compile(
+    r"[^A-Za-z0-9 ,.'\"!?()\-―—“”…‘’ʹ€]"
+    r"|\.[A-Za-z]"
+    r"|8[-oO']?[()dDpP]|[()dDpP][-oO']?8"
+    r"|\d(?:\D*\d){6}"
+    r"|(\W)\1{3}"
+)
+# The "remaining word types" of TweetTokenizer
+FAST_TOKEN_RE = re.compile(
+    r"[^\W\d_](?:[^\W\d_]|['\-_])+[^\W\d_]"  # words with apostrophes or dashes
+    r"|[+\-]?\d+[,/.:-]\d+[+\-]?"  # numbers, including fractions, decimals
+    r"|\w+"  # words without apostrophes or dashes
+    r"|\.(?:\s*\.)+"  # ellipsis dots
+    r"|\S"  # everything else that isn't whitespace
+)
+
+
+@functools.cache
+def get_tweet_tokenizer() -> "TweetTokenizer":
+    """nltk is imported on first use because importing it is slow."""
+    from nltk import TweetTokenizer  # type:ignore[import-untyped]
+
+    return TweetTokenizer()
+
+
+def tokenize(text: str) -> list[str]:
+    """Splits ``text`` into the same tokens as ``TweetTokenizer.tokenize()``
+    with the default options."""
+    if FAST_TOKENIZE_UNSAFE_RE.search(text) is None:
+        return FAST_TOKEN_RE.findall(text)
+    return get_tweet_tokenizer().tokenize(text)
@@ -2,14 +2,18 @@
 #
 # Copyright (c) 2019-2022 Tatu Ylonen.  See file LICENSE and https://ylonen.org
 
-import copy
 import re
 from typing import Optional
 
 from mediawiki_langcodes import code_to_name, name_to_code
 from wikitextprocessor import MAGIC_FIRST, MAGIC_LAST
 
-from ...datautils import data_append, data_extend, split_at_comma_semi
+from ...datautils import (
+    data_append,
+    data_copy,
+    data_extend,
+    split_at_comma_semi,
+)
 from ...wxr_context import WiktextractContext
 from .form_descriptions import (
     classify_desc,
@@ -732,7 +736,7 @@ def parse_translation_item_text(
                 # Create translations for each alternative.
                 for alt in alts:
                     alt = alt.strip()
-                    tr1 = copy.deepcopy(tr)
+                    tr1 = data_copy(tr)
                     if alt.startswith("*") or alt.startswith(":"):
                         alt = alt[1:].strip()
                     if not alt:
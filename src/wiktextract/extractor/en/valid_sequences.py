@@ -0,0 +1,246 @@
+# Tree of the word sequences that decode_tags() recognizes as tags and
+# topics.  Building the tree takes a noticeable part of the start-up time,
+# so it is built on first use and cached on disk, keyed by a hash of the
+# files it is built from (see disk_cache.py).
+#
+# Copyright (c) 2020-2022 Tatu Ylonen.  See file LICENSE and https://ylonen.org
+
+import functools
+import re
+from typing import Optional, Union
+
+from ... import tags as tags_module
+from ... import topics as topics_module
+from ...disk_cache import load_or_build, source_hash
+from ...tags import uppercase_tags, valid_tags, xlat_tags_map
+from ...topics import topic_generalize_map, valid_topics
+
+
+class ValidNode:
+    """Node in the valid_sequences tree. Each node is part of a chain
+    or chains that form sequences built out of keys in key->tags
+    maps like xlat_tags, etc. The ValidNode's 'word' is the key
+    by which it is refered to in the root dict or a `children` dict,
+    `end` marks that the node is the end-terminus of a sequence (but
+    it can still continue if the sequence is shared by the start of
+    other sequences: "nominative$" and "nominative plural$" for example),
+    `tags` and `topics` are the dicts containing tag and topic strings
+    for terminal nodes (end==True)."""
+
+    __slots__ = (
+        "end",
+        "tags",
+        "topics",
+        "children",
+    )
+
+    def __init__(
+        self,
+        end=False,
+        tags: Optional[list[str]] = None,
+        topics: Optional[list[str]] = None,
+        children: Optional[dict[str, "ValidNode"]] = None,
+    ) -> None:
+        self.end = end
+        self.tags: list[str] = tags or []
+        self.topics: list[str] = topics or []
+        self.children: dict[str, "ValidNode"] = children or {}
+
+
+# valid_tags and valid_topics before the hyphenated tags and topics are
+# added below.  The tree is built from these, adding the same values in the
+# same order as the additions.
+base_valid_tags = tuple(valid_tags)
+base_valid_topics = tuple(valid_topics)
+
+for tag in uppercase_tags:
+    hyphenated = re.sub(r"\s+", "-", tag)
+    if hyphenated in valid_tags:
+        print(
+            "DUPLICATE TAG: {} (from uppercase tag {!r})".format(
+                hyphenated, tag
+            )
+        )
+    assert hyphenated not in valid_tags
+    # Might as well, while we're here: Add hyphenated location tag.
+    valid_tags[hyphenated] = "dialect"
+# Let each original topic value stand alone.  These are not generally on
+# valid_topics.  We add the original topics with spaces replaced by hyphens.
+for topic in topic_generalize_map.keys():
+    valid_topics.add(topic.replace(" ", "-"))
+
+
+def add_to_valid_tree(
+    tree: ValidNode,
+    desc: str,
+    v: Optional[str],
+    tag_set: set[str],
+    topic_set: set[str],
+) -> None:
+    """Helper function for building trees of valid tags/sequences during
+    initialization."""
+    assert isinstance(tree, ValidNode)
+    assert isinstance(desc, str)
+    assert v is None or isinstance(v, str)
+    node = tree
+
+    # Build the tree structure: each node has children nodes
+    # whose names are denoted by their dict key.
+    for w in desc.split(" "):
+        if w in node.children:
+            node = node.children[w]
+        else:
+            new_node = ValidNode()
+            node.children[w] = new_node
+            node = new_node
+    if not node.end:
+        node.end = True
+    if not v:
+        return None  # Terminate early because there are no tags
+
+    tagslist = []
+    topicslist = []
+    for vv in v.split():
+        if vv in tag_set:
+            tagslist.append(vv)
+        elif vv in topic_set:
+            topicslist.append(vv)
+        else:
+            print(
+                "WARNING: tag/topic {!r} maps to unknown {!r}".format(desc, vv)
+            )
+    topics = " ".join(topicslist)
+    tags = " ".join(tagslist)
+    # Changed to "_tags" and "_topics" to avoid possible key-collisions.
+    if topics:
+        node.topics.extend([topics])
+    if tags:
+        node.tags.extend([tags])
+
+
+def add_to_valid_tree1(
+    tree: ValidNode,
+    k: str,
+    v: Union[list[str], tuple[str, ...], str],
+    tag_set: set[str],
+    topic_set: set[str],
+) -> list[str]:
+    assert isinstance(tree, ValidNode)
+    assert isinstance(k, str)
+    assert v is None or isinstance(v, (list, tuple, str))
+    if not v:
+        add_to_valid_tree(tree, k, None, tag_set, topic_set)
+        return []
+    elif isinstance(v, str):
+        v = [v]
+    q = []
+    for vv in v:
+        assert isinstance(vv, str)
+        add_to_valid_tree(tree, k, vv, tag_set, topic_set)
+        vvs = vv.split()
+        for x in vvs:
+            q.append(x)
+    # return each individual tag
+    return q
+
+
+def add_to_valid_tree_mapping(
+    tree: ValidNode,
+    mapping: Union[dict[str, Union[list[str], str]], dict[str, str]],
+    recurse: bool,
+    tag_set: set[str],
+    topic_set: set[str],
+) -> None:
+    assert isinstance(tree, ValidNode)
+    assert isinstance(mapping, dict)
+    assert recurse in (True, False)
+    for k, v in mapping.items():
+        assert isinstance(k, str)
+        assert isinstance(v, (list, str))
+        if isinstance(v, str):
+            q = add_to_valid_tree1(tree, k, [v], tag_set, topic_set)
+        else:
+            q = add_to_valid_tree1(tree, k, v, tag_set, topic_set)
+        if recurse:
+            visited = set()
+            while q:
+                v = q.pop()
+                if v in visited:
+                    continue
+                visited.add(v)
+                if v not in mapping:
+                    continue
+                vv = mapping[v]
+                qq = add_to_valid_tree1(tree, k, vv, tag_set, topic_set)
+                q.extend(qq)
+
+
+def build_valid_sequences() -> tuple[ValidNode, list[str]]:
+    """Builds the tree of sequences considered to be tags (includes
+    sequences that are mapped to something that becomes one or more valid
+    tags) and returns it with the sequences that contain slashes."""
+    tag_set = set(base_valid_tags)
+    topic_set = set(base_valid_topics)
+    tree = ValidNode()
+    sequences_with_slashes: set[str] = set()
+    for tag in base_valid_tags:
+        # The basic tags used in our tag system; some are a bit weird, but
+        # easier to implement this with 'false' positives than filter out
+        # stuff no one else uses.
+        if "/" in tag:
+            sequences_with_slashes.add(tag)
+        add_to_valid_tree(tree, tag, tag, tag_set, topic_set)
+    for tag in uppercase_tags:
+        hyphenated = re.sub(r"\s+", "-", tag)
+        tag_set.add(hyphenated)
+        add_to_valid_tree(tree, hyphenated, hyphenated, tag_set, topic_set)
+    for tag in uppercase_tags:
+        hyphenated = re.sub(r"\s+", "-", tag)
+        if "/" in tag:
+            sequences_with_slashes.add(tag)
+        add_to_valid_tree(tree, tag, hyphenated, tag_set, topic_set)
+    # xlat_tags_map!
+    add_to_valid_tree_mapping(tree, xlat_tags_map, False, tag_set, topic_set)
+    for k in xlat_tags_map:
+        if "/" in k:
+            sequences_with_slashes.add(k)
+    # Add topics to the same table, with all generalized topics also added
+    for topic in base_valid_topics:
+        assert " " not in topic
+        if "/" in topic:
+            sequences_with_slashes.add(topic)
+        add_to_valid_tree(tree, topic, topic, tag_set, topic_set)
+    for topic in topic_generalize_map.keys():
+        hyphenated = topic.replace(" ", "-")
+        topic_set.add(hyphenated)
+        if "/" in topic:
+            sequences_with_slashes.add(topic)
+        add_to_valid_tree(tree, topic, hyphenated, tag_set, topic_set)
+    # Add canonicalized/generalized topic values
+    add_to_valid_tree_mapping(
+        tree, topic_generalize_map, True, tag_set, topic_set
+    )
+    # Longest first, so that the longest sequence is split off
+    return tree, sorted(sequences_with_slashes, key=lambda s: (-len(s), s))
+
+
+@functools.cache
+def valid_sequences_data() -> tuple[ValidNode, list[str]]:
+    key = source_hash(
+        (tags_module.__file__, topics_module.__file__, __file__)  # type:ignore[list-item]
+    )
+    return load_or_build("en_valid_sequences", key, build_valid_sequences)
+
+
+def get_valid_sequences() -> ValidNode:
+    """Returns the root of the tree of valid tag and topic sequences."""
+    return valid_sequences_data()[0]
+
+
+@functools.cache
+def get_slashes_re() -> re.Pattern:
+    """Regex used to divide a decode candidate into parts that shouldn't
+    have their slashes turned into spaces."""
+    return re.compile(
+        r"(" + "|".join(re.escape(s) for s in valid_sequences_data()[1]) + r")"
+    )
@@ -8,6 +8,7 @@ from wikitextprocessor.parser import (
 
 from ...page import clean_node
 from ...wxr_context import WiktextractContext
+from ..inflection_page_cache import extract_inflection_page
 from .models import Form, WordEntry
 from .tags import translate_raw_tags
 
@@ -25,9 +26,28 @@ def extract_conjugation(
     https://fr.wiktionary.org/wiki/Wiktionnaire:Liste_de_tous_les_modèles/Français/Conjugaison
     https://fr.wiktionary.org/wiki/Aide:Conjugaisons
     """
-    conj_page = wxr.wtp.get_page_body(
-        conj_page_title, wxr.wtp.NAMESPACE_DATA["Conjugaison"]["id"]
+    ns_id = wxr.wtp.NAMESPACE_DATA["Conjugaison"]["id"]
+    # forms of "Modes impersonnels" tables are not added if the entry
+    # already has them
+    existing_forms = frozenset(f.form for f in entry.forms)
+    extract_inflection_page(
+        wxr,
+        entry,
+        (ns_id, conj_page_title, select_tab, existing_forms),
+        lambda e: extract_conjugation_page(
+            wxr, e, ns_id, conj_page_title, select_tab
+        ),
     )
+
+
+def extract_conjugation_page(
+    wxr: WiktextractContext,
+    entry: WordEntry,
+    ns_id: int,
+    conj_page_title: str,
+    select_tab: str,
+) -> None:
+    conj_page = wxr.wtp.get_page_body(conj_page_title, ns_id)
     if conj_page is None:
         return
     conj_root = wxr.wtp.parse(conj_page)
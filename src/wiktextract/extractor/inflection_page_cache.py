@@ -0,0 +1,74 @@
+# Cache of the forms extracted from conjugation and declension pages in
+# other namespaces (French "Conjugaison:", German "Flexion:", Dutch
+# "/vervoeging" subpages).  These pages are parsed and their tables expanded
+# for every entry that links to them, and the homograph and POS sections of
+# a word often link to the same page.  The templates on them may use the
+# title of the page being extracted, so the cache only keeps the pages
+# extracted for the current page.
+
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from ..wxr_context import WiktextractContext
+
+# Maximum number of inflection pages cached for one page
+INFLECTION_PAGE_CACHE_SIZE = 64
+
+
+class InflectionPageCache:
+    """Bounded LRU cache of the forms and categories that extracting an
+    inflection page adds to a word entry.  The cache is cleared when it is
+    used for another page or another ``WiktextractContext``."""
+
+    def __init__(self, maxsize: int = INFLECTION_PAGE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.data: OrderedDict[tuple, tuple[list, list[str]]] = OrderedDict()
+        self.page: tuple[WiktextractContext, str | None] | None = None
+
+    def get(
+        self, wxr: WiktextractContext, key: tuple
+    ) -> tuple[list, list[str]] | None:
+        page = (wxr, wxr.wtp.title)
+        if page != self.page:
+            self.data.clear()
+            self.page = page
+            return None
+        value = self.data.get(key)
+        if value is not None:
+            self.data.move_to_end(key)
+        return value
+
+    def put(self, key: tuple, value: tuple[list, list[str]]) -> None:
+        self.data[key] = value
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+
+inflection_page_cache = InflectionPageCache()
+
+
+def extract_inflection_page(
+    wxr: WiktextractContext,
+    word_entry: Any,
+    key: tuple,
+    extract_func: Callable[[Any], None],
+) -> None:
+    """Calls ``extract_func`` with a copy of ``word_entry`` the first time
+    the inflection page identified by ``key`` is extracted for the current
+    page, and adds copies of the forms and categories it added to
+    ``word_entry``.  ``extract_func`` may only add forms and categories, and
+    ``key`` must include everything else they depend on."""
+    value = inflection_page_cache.get(wxr, key)
+    if value is None:
+        scratch = word_entry.model_copy(
+            update={"forms": list(word_entry.forms), "categories": []}
+        )
+        extract_func(scratch)
+        value = (scratch.forms[len(word_entry.forms) :], scratch.categories)
+        inflection_page_cache.put(key, value)
+    forms, categories = value
+    word_entry.forms.extend(form.model_copy(deep=True) for form in forms)
+    for category in categories:
+        if category not in word_entry.categories:
+            word_entry.categories.append(category)
@@ -5,6 +5,7 @@ from wikitextprocessor import NodeKind, TemplateNode, WikiNode
 
 from ...page import clean_node
 from ...wxr_context import WiktextractContext
+from ..inflection_page_cache import extract_inflection_page
 from .models import Form, WordEntry
 from .tags import translate_raw_tags
 
@@ -83,7 +84,19 @@ def extract_nlstam_template(
 def extract_vervoeging_page(
     wxr: WiktextractContext, word_entry: WordEntry
 ) -> None:
-    page = wxr.wtp.get_page(f"{wxr.wtp.title}/vervoeging", 0)
+    page_title = f"{wxr.wtp.title}/vervoeging"
+    extract_inflection_page(
+        wxr,
+        word_entry,
+        (0, page_title),
+        lambda e: extract_vervoeging_page_forms(wxr, e, page_title),
+    )
+
+
+def extract_vervoeging_page_forms(
+    wxr: WiktextractContext, word_entry: WordEntry, page_title: str
+) -> None:
+    page = wxr.wtp.get_page(page_title, 0)
     if page is None:
         return
     root = wxr.wtp.parse(page.body)
@@ -1,13 +1,10 @@
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import ConfigDict, Field
 
+from ..base_model import ExtractorBaseModel
 
-class DutchBaseModel(BaseModel):
-    model_config = ConfigDict(
-        extra="forbid",
-        strict=True,
-        validate_assignment=True,
-        validate_default=True,
-    )
+
+class DutchBaseModel(ExtractorBaseModel):
+    pass
 
 
 class Example(DutchBaseModel):
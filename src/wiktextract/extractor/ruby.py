@@ -118,10 +118,7 @@ def extract_ruby(
         # Process only args
         if kind == NodeKind.TEMPLATE:
             new_node = TemplateNode(
-                new_node.loc,
-                wxr.wtp.namespace_prefixes(
-                    wxr.wtp.NAMESPACE_DATA["Template"]["id"]
-                ),
+                new_node.loc, wxr.ns_patterns.template_prefixes
             )
         new_args = []
         for arg in contents.largs:
@@ -1,20 +1,14 @@
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import ConfigDict, Field
+
+from ..base_model import ExtractorBaseModel
 
 # Pydantic models are basically classes that take the place of the dicts
 # used in the main English extractor. They use more resources, but also do
 # a lot of validation work and are easier for the type-checker.
 
 # Pydantic config stuff.
-class SimpleEnglishBaseModel(BaseModel):
-    model_config = ConfigDict(
-        extra="forbid",
-        strict=True,
-        validate_assignment=True,
-        # We use pydantic mainly for the automatic validation; this
-        # setting ensures the validation is done even when assigning something
-        # after initialization, otherwise it doesn't check anything.
-        validate_default=True,
-    )
+class SimpleEnglishBaseModel(ExtractorBaseModel):
+    pass
 
 # Not an example, this is for example entries next to glosses.
 class Example(SimpleEnglishBaseModel):
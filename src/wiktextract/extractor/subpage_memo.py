@@ -0,0 +1,36 @@
+# Memo of the subpages of the page being extracted, e.g. the translation
+# subpages "word/translations" and "word/翻譯".  Each POS section that links
+# to such a subpage would otherwise load, parse and pre-expand it again.
+# The parsed trees and the sections found in them are kept until another
+# page is extracted; the trees must not be modified.
+
+from collections.abc import Callable, Hashable
+from typing import Any, TypeVar
+
+from ..wxr_context import WiktextractContext
+
+T = TypeVar("T")
+
+
+class SubpageMemo:
+    def __init__(self) -> None:
+        self.page: tuple[WiktextractContext, str | None] | None = None
+        self.values: dict[Hashable, Any] = {}
+
+    def get(
+        self, wxr: WiktextractContext, key: Hashable, compute: Callable[[], T]
+    ) -> T:
+        """Returns the value of ``key`` for the current page, calling
+        ``compute`` to compute it the first time."""
+        page = (wxr, wxr.wtp.title)
+        if page != self.page:
+            self.values.clear()
+            self.page = page
+        elif key in self.values:
+            return self.values[key]
+        value = compute()
+        self.values[key] = value
+        return value
+
+
+subpage_memo = SubpageMemo()
@@ -1,4 +1,6 @@
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import ConfigDict, Field
+
+from ..base_model import ExtractorBaseModel
 
 # Pydantic models are basically classes that take the place of the dicts
 # used in the main English extractor. They use more resources, but also do
@@ -7,16 +9,8 @@ from pydantic import BaseModel, ConfigDict, Field
 
 # Search and replace __EXAMPLE_TEMPLATE__ with `Language Name`
 # Pydantic config stuff.
-class __EXAMPLE_TEMPLATE__BaseModel(BaseModel):
-    model_config = ConfigDict(
-        extra="forbid",
-        strict=True,
-        # We use pydantic mainly for the automatic validation; this
-        # setting ensures the validation is done even when assigning something
-        # after initialization, otherwise it doesn't check anything.
-        validate_assignment=True,
-        validate_default=True,
-    )
+class __EXAMPLE_TEMPLATE__BaseModel(ExtractorBaseModel):
+    pass
 
 
 # Examples and quotations in glosses
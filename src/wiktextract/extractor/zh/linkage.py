@@ -310,7 +310,7 @@ def process_linkage_templates_in_gloss(
         )
         if len(word) == 0:
             continue
-        if word.startswith(wxr.wtp.NAMESPACE_DATA["Thesaurus"]["name"] + ":"):
+        if word.startswith(wxr.ns_patterns.thesaurus_name + ":"):
             continue
         linkage = Linkage(word=word, sense=sense)
         pre_data = getattr(page_data[-1], linkage_type)
@@ -10,6 +10,7 @@ from wikitextprocessor.parser import (
 
 from ...page import clean_node
 from ...wxr_context import WiktextractContext
+from ..subpage_memo import subpage_memo
 from .models import Translation, WordEntry
 from .section_titles import TRANSLATIONS_TITLES
 from .tags import TEMPLATE_TAG_ARGS, translate_raw_tags
@@ -163,11 +164,19 @@ def translation_subpage(
     translation_subpage_title = page_title
     if page_title == wxr.wtp.title:
         translation_subpage_title = f"{page_title}/翻譯"
-    subpage = wxr.wtp.get_page(translation_subpage_title)
-    if subpage is None:
-        return
 
-    root = wxr.wtp.parse(subpage.body, pre_expand=True)
+    def parse_subpage() -> Optional[WikiNode]:
+        subpage = wxr.wtp.get_page(translation_subpage_title)
+        if subpage is None:
+            return None
+        return wxr.wtp.parse(subpage.body, pre_expand=True)
+
+    # the subpage is parsed once per page, see subpage_memo.py
+    root = subpage_memo.get(
+        wxr, ("tree", translation_subpage_title), parse_subpage
+    )
+    if root is None:
+        return
     target_section_node = (
         root
         if target_section is None
@@ -0,0 +1,253 @@
+# Incremental extraction: reuse the output of a previous run for the pages
+# that have not changed since the previous dump.
+#
+# A page is processed again if its text has changed, if it calls a template
+# or module that has changed (directly or through other templates and
+# modules), or if a related page that extractors read while processing it
+# (e.g. a thesaurus page or a "word/translations" subpage) has changed.
+# The data of all other pages is copied from the previous output file.
+#
+# Limitations: template and module names generated by other expansions,
+# changes to the extractor code and changes in the existence of pages that
+# extractors check with `page_exists()` are not detected; run a full
+# extraction after changing the code.
+
+import json
+import re
+import sqlite3
+from collections import defaultdict
+from pathlib import Path
+from typing import TextIO
+
+from .output import open_jsonl
+from .shards import page_shard
+from .thesaurus import ThesaurusIndex, thesaurus_entry_key
+from .wxr_context import WiktextractContext
+from .wxr_logging import logger
+
+TEMPLATE_CALL_RE = re.compile(r"\{\{\s*([^{}|<>\[\]\n]+?)\s*(?:\||\}\})")
+LUA_MODULE_NAME_RE_TEMPLATE = r"""["']{}:([^"'\n]+)["']"""
+
+
+def canonical_page_name(name: str, ns_prefixes: tuple[str, ...]) -> str:
+    """Normalizes a template or module name as used in wikitext or Lua code
+    to the title used in the database, without the namespace prefix."""
+    name = re.sub(r"[\s_]+", " ", name).strip()
+    for prefix in ns_prefixes:
+        if name.lower().startswith(prefix.lower() + ":"):
+            name = name[len(prefix) + 1 :].strip()
+            break
+    return name[:1].upper() + name[1:]
+
+
+def changed_pages(
+    db_conn: sqlite3.Connection,
+) -> list[tuple[str, int]]:
+    """Returns the title and namespace id of pages that are new, deleted or
+    changed in the current database compared to the database attached as
+    "previous"."""
+    return db_conn.execute(
+        """
+        SELECT cur.title, cur.namespace_id FROM pages AS cur
+        LEFT JOIN previous.pages AS old
+        ON old.title = cur.title AND old.namespace_id = cur.namespace_id
+        WHERE old.title IS NULL OR old.body IS NOT cur.body
+        OR old.redirect_to IS NOT cur.redirect_to
+        UNION
+        SELECT old.title, old.namespace_id FROM previous.pages AS old
+        WHERE NOT EXISTS (
+            SELECT 1 FROM main.pages AS cur
+            WHERE cur.title = old.title
+            AND cur.namespace_id = old.namespace_id
+        )
+        """
+    ).fetchall()
+
+
+def find_reparse_titles(
+    wxr: WiktextractContext,
+    previous_db_path: str | Path,
+    process_ns_ids: list[int],
+) -> set[str]:
+    """Returns the titles of the pages in the namespaces ``process_ns_ids``
+    that need to be processed again because they or their inputs have
+    changed since the dump saved in ``previous_db_path``."""
+    ns_data = wxr.wtp.NAMESPACE_DATA
+    template_ns = ns_data.get("Template", {})
+    module_ns = ns_data.get("Module", {})
+    template_ns_id = template_ns.get("id", 10)
+    module_ns_id = module_ns.get("id", 828)
+    template_prefixes = (template_ns.get("name", "Template"), "Template")
+    module_prefixes = (module_ns.get("name", "Module"), "Module")
+    lua_module_re = re.compile(
+        LUA_MODULE_NAME_RE_TEMPLATE.format(
+            "|".join(re.escape(p) for p in module_prefixes)
+        )
+    )
+
+    db_conn = wxr.wtp.db_conn
+    db_conn.execute("ATTACH DATABASE ? AS previous", (str(previous_db_path),))
+    try:
+        changed = changed_pages(db_conn)
+    finally:
+        db_conn.execute("DETACH DATABASE previous")
+
+    reparse_titles: set[str] = set()
+    dirty_templates: set[str] = set()
+    dirty_modules: set[str] = set()
+    for title, ns_id in changed:
+        if ns_id == template_ns_id:
+            dirty_templates.add(canonical_page_name(title, template_prefixes))
+        elif ns_id == module_ns_id:
+            dirty_modules.add(canonical_page_name(title, module_prefixes))
+        elif ns_id in process_ns_ids:
+            reparse_titles.add(title)
+            if "/" in title:
+                # "word/translations" subpages
+                reparse_titles.add(title[: title.index("/")])
+        else:
+            # Pages in other saved namespaces, like "Thesaurus:word" or
+            # "Conjugaison:français/word", are read when processing "word"
+            name = title[title.find(":") + 1 :]
+            reparse_titles.add(name.split("/")[0])
+            reparse_titles.add(name.split("/")[-1])
+    logger.info(
+        f"{len(changed)} pages changed, including {len(dirty_templates)} "
+        f"templates and {len(dirty_modules)} modules"
+    )
+
+    if len(dirty_templates) > 0 or len(dirty_modules) > 0:
+        # Propagate the changes to the templates and modules that use the
+        # changed ones
+        callers: dict[tuple[int, str], set[tuple[int, str]]] = defaultdict(set)
+        for page in wxr.wtp.get_all_pages([template_ns_id, module_ns_id]):
+            prefixes = (
+                template_prefixes
+                if page.namespace_id == template_ns_id
+                else module_prefixes
+            )
+            caller = (
+                page.namespace_id,
+                canonical_page_name(page.title, prefixes),
+            )
+            if page.redirect_to is not None:
+                callee = (
+                    page.namespace_id,
+                    canonical_page_name(page.redirect_to, prefixes),
+                )
+                callers[callee].add(caller)
+            elif page.namespace_id == template_ns_id:
+                for callee in template_calls(
+                    page.body or "",
+                    template_prefixes,
+                    module_prefixes,
+                    template_ns_id,
+                    module_ns_id,
+                ):
+                    callers[callee].add(caller)
+            else:
+                for m in lua_module_re.finditer(page.body or ""):
+                    callee = (
+                        module_ns_id,
+                        canonical_page_name(m.group(1), module_prefixes),
+                    )
+                    callers[callee].add(caller)
+        dirty = {(template_ns_id, name) for name in dirty_templates} | {
+            (module_ns_id, name) for name in dirty_modules
+        }
+        queue = list(dirty)
+        while len(queue) > 0:
+            for caller in callers.get(queue.pop(), ()):
+                if caller not in dirty:
+                    dirty.add(caller)
+                    queue.append(caller)
+        logger.info(
+            f"{len(dirty)} templates and modules are affected by the changes"
+        )
+
+        for page in wxr.wtp.get_all_pages(process_ns_ids):
+            if page.title in reparse_titles or page.body is None:
+                continue
+            if not dirty.isdisjoint(
+                template_calls(
+                    page.body,
+                    template_prefixes,
+                    module_prefixes,
+                    template_ns_id,
+                    module_ns_id,
+                )
+            ):
+                reparse_titles.add(page.title)
+
+    return reparse_titles
+
+
+def template_calls(
+    text: str,
+    template_prefixes: tuple[str, ...],
+    module_prefixes: tuple[str, ...],
+    template_ns_id: int,
+    module_ns_id: int,
+) -> set[tuple[int, str]]:
+    """Returns the (namespace id, name) pairs of the templates and modules
+    called in wikitext, including parser functions, which are harmless."""
+    calls = set()
+    for m in TEMPLATE_CALL_RE.finditer(text):
+        name = re.sub(r"(?i)^(safe)?subst:", "", m.group(1))
+        if name.lower().startswith("#invoke:"):
+            calls.add(
+                (
+                    module_ns_id,
+                    canonical_page_name(name[8:], module_prefixes),
+                )
+            )
+        else:
+            calls.add(
+                (template_ns_id, canonical_page_name(name, template_prefixes))
+            )
+    return calls
+
+
+def record_page_title(data: dict) -> str | None:
+    """Returns the title of the page that the extracted data came from.  The
+    English extractor saves the title in "original_title" if it differs from
+    the word."""
+    return data.get("original_title") or data.get("title") or data.get("word")
+
+
+def copy_unchanged_data(
+    previous_output_path: str | Path,
+    reparse_titles: set[str],
+    out_f: TextIO,
+    shard_index: int = 0,
+    shard_count: int = 1,
+    thesaurus_index: ThesaurusIndex | None = None,
+) -> set[tuple[str, str, str]]:
+    """Copies the JSON Lines data of the pages that are not processed again
+    from the previous output file to ``out_f``.  Thesaurus-only entries are
+    dropped because they are emitted again at the end, and deleted pages
+    are in ``reparse_titles``.  Only data of the pages in the shard
+    ``shard_index`` is copied.  Returns the (word, lang_code, pos) tuples of
+    the copied data, see ``thesaurus_entry_key()``."""
+    emitted = set()
+    num_copied = 0
+    with open_jsonl(previous_output_path) as f:
+        for line in f:
+            dt = json.loads(line)
+            if dt.get("source") == "thesaurus":
+                continue
+            title = record_page_title(dt)
+            if title in reparse_titles:
+                continue
+            if (
+                shard_count > 1
+                and page_shard(title or "", shard_count) != shard_index
+            ):
+                continue
+            out_f.write(line)
+            num_copied += 1
+            key = thesaurus_entry_key(dt, thesaurus_index)
+            if key is not None:
+                emitted.add(key)
+    logger.info(f"Copied {num_copied} entries from {previous_output_path}")
+    return emitted
@@ -0,0 +1,80 @@
+# Namespace names and the patterns that depend on them, computed once per
+# edition when the WiktextractContext is created.
+
+import re
+
+from wikitextprocessor import Wtp
+
+
+class NamespacePatterns:
+    """Local namespace names, title prefixes and compiled regular
+    expressions of an edition for ``clean_value()``, ``clean_node()`` and
+    the extractors."""
+
+    def __init__(self, wtp: Wtp):
+        # Namespace name -> prefixes of page titles in the namespace
+        self.title_prefix_map: dict[str, tuple[str, ...]] = {
+            ns_name: tuple(
+                name + ":" for name in [ns_data["name"]] + ns_data["aliases"]
+            )
+            for ns_name, ns_data in wtp.NAMESPACE_DATA.items()
+        }
+        self.lower_title_prefix_map: dict[str, tuple[str, ...]] = {
+            ns_name: tuple(prefix.lower() for prefix in prefixes)
+            for ns_name, prefixes in self.title_prefix_map.items()
+        }
+
+        file_ns_data = wtp.NAMESPACE_DATA.get("File")
+        image_link_prefixes = (
+            wtp.namespace_prefixes(file_ns_data["id"], suffix="")
+            if file_ns_data is not None
+            else ["File"]
+        )
+        self.image_link_re = re.compile(
+            rf"(?:{'|'.join(image_link_prefixes)})\s*:", re.IGNORECASE
+        )
+
+        # XXX "Category" -> config variable for portability
+        category_ns_data = wtp.NAMESPACE_DATA.get("Category", {})
+        self.category_names = frozenset(
+            {"Category", "category", category_ns_data.get("name", "Category")}
+            | set(category_ns_data.get("aliases", []))
+        )
+        category_names_pattern = (
+            f"(?:{'|'.join(map(re.escape, sorted(self.category_names)))})"
+        )
+        # Category links removed by clean_value()
+        self.category_link_re = re.compile(
+            rf"(?si)\s*\[\[\s*{category_names_pattern}\s*:\s*([^]]+?)\s*\]\]"
+        )
+        # Category links captured by clean_node()
+        self.category_capture_re = re.compile(
+            rf"(?is)\[\[:?\s*{category_names_pattern}\s*:([^]|]+)"
+        )
+        # Some templates create <sup>(Category: ...)</sup>
+        self.category_sup_re = re.compile(
+            rf"(?si)\s*(?:<sup>)?\({category_names_pattern}:[^)]+\)"
+            r"(?:</sup>)?"
+        )
+
+        self.thesaurus_name: str | None = wtp.NAMESPACE_DATA.get(
+            "Thesaurus", {}
+        ).get("name")
+        self.rhymes_prefix = (
+            wtp.NAMESPACE_DATA.get("Rhymes", {}).get("name", "") + ":"
+        )
+        template_ns_data = wtp.NAMESPACE_DATA.get("Template")
+        self.template_prefixes = (
+            wtp.namespace_prefixes(template_ns_data["id"])
+            if template_ns_data is not None
+            else ["Template:"]
+        )
+
+    def title_prefixes(
+        self, namespace: str, lower: bool = False
+    ) -> tuple[str, ...]:
+        """Returns the local name and aliases of ``namespace`` followed by a
+        colon, in lowercase if ``lower`` is True."""
+        if lower:
+            return self.lower_title_prefix_map.get(namespace, ())
+        return self.title_prefix_map.get(namespace, ())
@@ -0,0 +1,171 @@
+# JSON serialization and output files for the extracted data.
+#
+# The faster orjson library is used for serialization if it is installed.
+# Output can be compressed with gzip or zstd (with the zstandard package or
+# the compression.zstd module of Python 3.14) and split into files of a
+# given size.
+
+import gzip
+import io
+import json
+import os
+import re
+from pathlib import Path
+from typing import IO, Any, TextIO
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+try:
+    from compression import zstd  # type: ignore[import-not-found]
+except ImportError:
+    zstd = None
+
+try:
+    import zstandard  # type: ignore[import-not-found]
+except ImportError:
+    zstandard = None
+
+OUTPUT_FORMATS = ("jsonl", "jsonl.gz", "jsonl.zst")
+
+
+def json_dumps(data: Any, human_readable: bool = False) -> str:
+    """Serializes extracted data as one line of JSON, or as indented JSON
+    with sorted keys if ``human_readable`` is True."""
+    if orjson is not None:
+        try:
+            if human_readable:
+                return orjson.dumps(
+                    data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+                ).decode("utf-8")
+            return orjson.dumps(data).decode("utf-8")
+        except TypeError:
+            pass  # e.g. integers larger than 64 bits
+    if human_readable:
+        return json.dumps(data, indent=2, sort_keys=True, ensure_ascii=False)
+    return json.dumps(data, ensure_ascii=False)
+
+
+def parse_size(size: str) -> int:
+    """Parses a size like "1GB", "500M" or "4096" into a number of bytes."""
+    m = re.fullmatch(r"(?i)\s*(\d+)\s*([kmgt]?)i?b?\s*", size)
+    if m is None:
+        raise ValueError(f"invalid size: {size!r}")
+    unit = m.group(2).lower()
+    return int(m.group(1)) * 1024 ** ("kmgt".index(unit) + 1 if unit else 0)
+
+
+def open_compressed(path: str | Path, mode: str) -> IO:
+    """Opens a file for reading or writing in binary mode, compressing or
+    decompressing it based on the file name extension."""
+    path = str(path)
+    if path.endswith(".gz"):
+        return gzip.open(path, mode)
+    if path.endswith(".zst"):
+        if zstd is not None:
+            return zstd.open(path, mode)
+        if zstandard is not None:
+            return zstandard.open(path, mode)
+        raise RuntimeError(
+            "zstd compression needs Python 3.14 or the zstandard package"
+        )
+    return open(path, mode)
+
+
+def open_jsonl(path: str | Path) -> TextIO:
+    """Opens a possibly compressed JSON Lines file for reading."""
+    return io.TextIOWrapper(open_compressed(path, "rb"), encoding="utf-8")
+
+
+class OutputFile:
+    """Writes JSON Lines output, optionally compressed, to ``path``.  If
+    ``shard_size`` is greater than zero, a new numbered file is started
+    after a file has grown to that many (compressed) bytes.  Each file is
+    written with a ".tmp" suffix, which is removed when the file is
+    complete.  ``abort()`` closes the output without removing the suffix
+    of the current file."""
+
+    def __init__(
+        self, path: str | Path, out_format: str = "jsonl", shard_size: int = 0
+    ):
+        assert out_format in OUTPUT_FORMATS
+        self.path = str(path)
+        self.out_format = out_format
+        self.shard_size = shard_size
+        self.shard_index = 0
+        self.paths: list[str] = []
+        self.raw_f: IO | None = None
+        self.text_f: TextIO | None = None
+
+    def next_path(self) -> str:
+        if self.shard_size <= 0:
+            return self.path
+        base = self.path
+        if base.endswith("." + self.out_format):
+            base = base[: -len(self.out_format) - 1]
+        return f"{base}-{self.shard_index:05d}.{self.out_format}"
+
+    def open_next(self) -> None:
+        path = self.next_path()
+        self.shard_index += 1
+        self.paths.append(path)
+        self.raw_f = open(path + ".tmp", "wb", buffering=1024 * 1024)
+        if self.out_format == "jsonl.gz":
+            stream: IO = gzip.GzipFile(fileobj=self.raw_f, mode="wb")
+        elif self.out_format == "jsonl.zst":
+            if zstd is not None:
+                stream = zstd.ZstdFile(self.raw_f, mode="wb")
+            elif zstandard is not None:
+                stream = zstandard.ZstdCompressor().stream_writer(
+                    self.raw_f, closefd=False
+                )
+            else:
+                raise RuntimeError(
+                    "zstd compression needs Python 3.14 or the zstandard "
+                    "package"
+                )
+        else:
+            stream = self.raw_f
+        self.text_f = io.TextIOWrapper(stream, encoding="utf-8")
+
+    def close_current(self) -> None:
+        if self.text_f is None:
+            return
+        self.abort()
+        path = self.paths[-1]
+        os.replace(path + ".tmp", path)
+
+    def write(self, text: str) -> int:
+        if self.text_f is None:
+            self.open_next()
+        n = self.text_f.write(text)  # type: ignore[union-attr]
+        if (
+            self.shard_size > 0
+            and text.endswith("\n")
+            and self.raw_f.tell() >= self.shard_size  # type: ignore[union-attr]
+        ):
+            self.close_current()
+        return n
+
+    def flush(self) -> None:
+        if self.text_f is not None:
+            self.text_f.flush()
+
+    def abort(self) -> None:
+        """Closes the current file without removing its ".tmp" suffix, e.g.
+        when the extraction fails.  The completed files keep their names."""
+        if self.text_f is None:
+            return
+        self.text_f.close()
+        if not self.raw_f.closed:  # type: ignore[union-attr]
+            self.raw_f.close()  # type: ignore[union-attr]
+        self.text_f = None
+        self.raw_f = None
+
+    def close(self) -> None:
+        if self.text_f is None and len(self.paths) == 0:
+            # Create an empty output file
+            self.open_next()
+        self.close_current()
@@ -3,18 +3,18 @@
 # Copyright (c) 2018-2022 Tatu Ylonen.  See file LICENSE and https://ylonen.org
 
 import re
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterable
 from copy import copy
 from typing import Any, Callable, Optional, Union
 
 from mediawiki_langcodes import name_to_code
 from wikitextprocessor.core import (
-    NamespaceDataEntry,
     PostTemplateFnCallable,
     TemplateArgs,
     TemplateFnCallable,
 )
-from wikitextprocessor.node_expand import NodeHandlerFnCallable
+from wikitextprocessor.node_expand import NodeHandlerFnCallable, to_wikitext
 from wikitextprocessor.parser import GeneralNode, NodeKind, WikiNode
 
 from .clean import clean_value
@@ -31,6 +31,50 @@ LEVEL_KINDS = {
     NodeKind.LEVEL6,
 }
 
+# Maximum number of clean_node() results cached in each process
+CLEAN_NODE_CACHE_SIZE = 100000
+# Longer wikitext is not cached
+CLEAN_NODE_CACHE_MAX_LENGTH = 1000
+
+
+class CountedLRUCache:
+    """Bounded LRU cache that counts its hits and misses.  The counts of the
+    caches in ``counted_caches`` are reported at the end of the extraction,
+    see ``reprocess_wiktionary()``."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.data: OrderedDict[tuple, Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> Any:
+        value = self.data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.data.move_to_end(key)
+        return value
+
+    def put(self, key: tuple, value: Any) -> None:
+        self.data[key] = value
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+
+# ``clean_node()`` results for wikitext without templates, which don't depend
+# on the page.  Language and POS headers, labels and other short strings are
+# cleaned again and again.  The values are the cleaned text and the
+# categories, links and tags added to ``sense_data``, which are added again
+# on a hit.  Results whose computation emitted errors, warnings or debug
+# messages are not cached, so the messages are reported for every page
+# whatever pages the process extracted before.
+clean_node_cache = CountedLRUCache(CLEAN_NODE_CACHE_SIZE)
+
+# Caches whose hits and misses are reported, by name
+counted_caches: dict[str, CountedLRUCache] = {"clean_node": clean_node_cache}
+
 
 def parse_page(
     wxr: WiktextractContext, page_title: str, page_text: str
@@ -163,13 +207,18 @@ def inject_linkages(wxr: WiktextractContext, page_data: list[dict]) -> None:
     # Inject linkages from thesaurus entries
     from .thesaurus import search_thesaurus
 
-    local_thesaurus_ns = wxr.wtp.NAMESPACE_DATA.get("Thesaurus", {}).get("name")  # type: ignore[call-overload]
+    local_thesaurus_ns = wxr.ns_patterns.thesaurus_name
     for data in page_data:
         if "pos" not in data:
             continue
         word = data["word"]
         lang_code = data["lang_code"]
         pos = data["pos"]
+        if (
+            wxr.thesaurus_index is not None
+            and (word, lang_code, pos) not in wxr.thesaurus_index
+        ):
+            continue
         for term in search_thesaurus(
             wxr.thesaurus_db_conn,  # type:ignore[arg-type]
             word,
@@ -262,9 +311,7 @@ def process_categories(
 
     # Remove category links that start with a language name from entries for
     # different languages
-    rhymes_ns_prefix = (
-        wxr.wtp.NAMESPACE_DATA.get("Rhymes", {}).get("name", "") + ":"  # type: ignore[call-overload]
-    )
+    rhymes_ns_prefix = wxr.ns_patterns.rhymes_prefix
     for data in page_data:
         lang_code = data.get("lang_code")
         cats = data.get("categories", [])
@@ -367,6 +414,31 @@ def clean_node(
     else:
         clean_node_handler_fn = clean_node_handler_fn_default
 
+    # Results for wikitext without templates don't depend on the page and
+    # are cached, see clean_node_cache
+    cache_key = None
+    if (
+        template_fn is None
+        and post_template_fn is None
+        and node_handler_fn is None
+    ):
+        text = to_wikitext(wikinode, node_handler_fn=clean_node_handler_fn)
+        if "{{" not in text and len(text) <= CLEAN_NODE_CACHE_MAX_LENGTH:
+            cache_key = (
+                wxr.wtp.lang_code,
+                text,
+                sense_data is not None,
+                collect_links,
+                no_strip,
+                no_html_strip,
+            )
+            cached = clean_node_cache.get(cache_key)
+            if cached is not None:
+                v, effects = cached
+                add_clean_node_effects(sense_data, effects)
+                return v
+
+    num_messages = wtp_message_count(wxr)
     # print("clean_node: value={!r}".format(value))
     v = wxr.wtp.node_to_html(
         wikinode,
@@ -379,34 +451,24 @@ def clean_node(
     # Capture categories if sense_data has been given.  We also track
     # Lua execution errors here.
     # If collect_links=True (for glosses), capture links
-    category_ns_data: NamespaceDataEntry = wxr.wtp.NAMESPACE_DATA.get(
-        "Category",
-        {},  # type: ignore[typeddict-item]
-    )
-    category_ns_names: set[str] = {category_ns_data.get("name")} | set(
-        category_ns_data.get("aliases")  # type:ignore[assignment,arg-type]
-    )
-    category_ns_names |= {"Category", "category"}
-    category_names_pattern = rf"(?:{'|'.join(category_ns_names)})"
+    ns_patterns = wxr.ns_patterns
+    # (key, value, only add if not already there) for `sense_data`
+    effects: list[tuple[str, Any, bool]] = []
     if sense_data is not None:
         # Check for Lua execution error
         if '<strong class="error">Lua execution error' in v:
-            data_append(sense_data, "tags", "error-lua-exec")
+            effects.append(("tags", "error-lua-exec", False))
         if '<strong class="error">Lua timeout error' in v:
-            data_append(sense_data, "tags", "error-lua-timeout")
+            effects.append(("tags", "error-lua-timeout", False))
         # Capture Category tags
         if not collect_links:
-            for m in re.finditer(
-                rf"(?is)\[\[:?\s*{category_names_pattern}\s*:([^]|]+)",
-                v,
-            ):
+            for m in ns_patterns.category_capture_re.finditer(v):
                 cat = clean_value(wxr, m.group(1))
                 cat = re.sub(r"\s+", " ", cat)
                 cat = cat.strip()
                 if not cat:
                     continue
-                if not sense_data_has_value(sense_data, "categories", cat):
-                    data_append(sense_data, "categories", cat)
+                effects.append(("categories", cat, True))
         else:
             for m in re.finditer(
                 r"(?is)\[\[:?(\s*([^][|:]+):)?\s*([^]|]+)(\|([^]|]+))?\]\]",
@@ -415,14 +477,16 @@ def clean_node(
             ):
                 # Add here other stuff different "Something:restofthelink"
                 # things;
-                if m.group(2) and m.group(2).strip() in category_ns_names:
+                if (
+                    m.group(2)
+                    and m.group(2).strip() in ns_patterns.category_names
+                ):
                     cat = clean_value(wxr, m.group(3))
                     cat = re.sub(r"\s+", " ", cat)
                     cat = cat.strip()
                     if not cat:
                         continue
-                    if not sense_data_has_value(sense_data, "categories", cat):
-                        data_append(sense_data, "categories", cat)
+                    effects.append(("categories", cat, True))
                 elif not m.group(1):
                     if m.group(5):
                         ltext = clean_value(wxr, m.group(5))
@@ -441,9 +505,8 @@ def clean_node(
                         continue
                     if not ltext and ltarget:
                         ltext = ltarget
-                    ltuple = (ltext, ltarget)
-                    if not sense_data_has_value(sense_data, "links", ltuple):
-                        data_append(sense_data, "links", ltuple)
+                    effects.append(("links", (ltext, ltarget), True))
+        add_clean_node_effects(sense_data, effects)
 
     v = clean_value(wxr, v, no_strip=no_strip, no_html_strip=no_html_strip)
     # print("After clean_value:", repr(v))
@@ -452,17 +515,31 @@ def clean_node(
     # to clean up erroneous codings in the original text.
     # v = re.sub(r"(?s)\{\{.*", "", v)
     # Some templates create <sup>(Category: ...)</sup>; remove
-    v = re.sub(
-        rf"(?si)\s*(?:<sup>)?\({category_names_pattern}:[^)]+\)(?:</sup>)?",
-        "",
-        v,
-    )
+    v = ns_patterns.category_sup_re.sub("", v)
     # Some templates create question mark in <sup>, e.g.,
     # some Korean Hanja form
     v = re.sub(r"\^\?", "", v)
+    if cache_key is not None and wtp_message_count(wxr) == num_messages:
+        clean_node_cache.put(cache_key, (v, tuple(effects)))
     return v
 
 
+def wtp_message_count(wxr: WiktextractContext) -> int:
+    """Returns the number of errors, warnings and debug messages of the
+    current page."""
+    wtp = wxr.wtp
+    return len(wtp.errors) + len(wtp.warnings) + len(wtp.debugs)
+
+
+def add_clean_node_effects(
+    sense_data: Optional[Any], effects: Iterable[tuple[str, Any, bool]]
+) -> None:
+    for key, value, unique in effects:
+        if unique and sense_data_has_value(sense_data, key, value):
+            continue
+        data_append(sense_data, key, value)
+
+
 def sense_data_has_value(
     sense_data: dict[str, Any], name: str, value: Any
 ) -> bool:
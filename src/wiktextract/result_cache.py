@@ -0,0 +1,473 @@
+# Cache of the results of functions that are called with the same arguments
+# on many pages, e.g. decode_tags() and classify_desc() of the English
+# extractor.  Each process keeps the recent results in an LRU cache
+# (functools.lru_cache).  With `wiktwords --result-cache FILE`, the results
+# computed in a run are also saved in FILE, and the next run looks up the
+# results that are not in the LRU cache there before computing them.  The
+# worker processes map the file read-only, so they share it through the
+# page cache; the results they compute are sent to the parent process
+# with the page data and written to the file at the end of the run.
+#
+# The saved results of a function are only used if the hash of the source
+# files given to ``persistent_cache()``, e.g. the tag tables, is the one
+# saved with them.  The arguments and results must be values that marshal
+# can serialize: str, numbers, bool, None and tuples, lists, dicts and
+# frozensets of them.  Callers must not modify the results, which the LRU
+# cache shares between calls.
+#
+# File format: RESULT_CACHE_MAGIC, the length of the header and the header,
+# a marshal-serialized dict of function name -> source hash, padded to a
+# multiple of 8 bytes; the number of results N; the N sorted 64-bit hashes
+# of the (function name, arguments) keys, see ``result_key_hash()``; N + 1
+# offsets of the results in the data that follows; and the data, a
+# marshal-serialized (function name, arguments, result) tuple for each
+# result.
+
+import functools
+import hashlib
+import importlib.util
+import inspect
+import marshal
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, TypeVar
+
+from .disk_cache import source_hash
+from .wxr_logging import logger
+
+RESULT_CACHE_MAGIC = b"WXRCACH1"
+RESULT_CACHE_LRU_SIZE = 65536
+
+T = TypeVar("T", bound=Callable[..., Any])
+
+# Returned by ResultCacheFile.get() for arguments that are not in the file
+MISSING = object()
+
+
+def result_key(args: tuple) -> str:
+    """Returns the key of the arguments of a call.  Sets are sorted so that
+    the key does not depend on the hash seed of the process."""
+    return repr(
+        tuple(
+            tuple(sorted(arg)) if isinstance(arg, (set, frozenset)) else arg
+            for arg in args
+        )
+    )
+
+
+def result_key_hash(name: str, key: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(
+            f"{name}\0{key}".encode("utf-8"), digest_size=8
+        ).digest(),
+        "little",
+    )
+
+
+class ResultCacheFile:
+    """Memory-mapped results saved by a previous run."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        with path.open("rb") as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self.mmap)
+        try:
+            if self.mmap[:8] != RESULT_CACHE_MAGIC:
+                raise ValueError("not a result cache file")
+            (header_len,) = struct.unpack_from("=Q", self.mmap, 8)
+            self.source_hashes: dict[str, str] = marshal.loads(
+                view[16 : 16 + header_len]
+            )
+            pos = 16 + header_len
+            (count,) = struct.unpack_from("=Q", self.mmap, pos)
+            pos += 8
+            self.hashes = view[pos : pos + 8 * count].cast("Q")
+            pos += 8 * count
+            self.offsets = view[pos : pos + 8 * (count + 1)].cast("Q")
+            self.data = view[pos + 8 * (count + 1) :]
+            if len(self.offsets) != count + 1 or self.offsets[-1] != len(
+                self.data
+            ):
+                raise ValueError("truncated result cache file")
+        except Exception:
+            view.release()
+            self.close()
+            raise
+        view.release()
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def entry_data(self, i: int) -> memoryview:
+        return self.data[self.offsets[i] : self.offsets[i + 1]]
+
+    def get(self, name: str, key: str) -> Any:
+        """Returns the saved result of function ``name`` for the arguments
+        ``key`` (see ``result_key()``), or MISSING."""
+        h = result_key_hash(name, key)
+        i = bisect_left(self.hashes, h)
+        while i < len(self.hashes) and self.hashes[i] == h:
+            entry_name, entry_key, result = marshal.loads(self.entry_data(i))
+            if entry_name == name and entry_key == key:
+                return result
+            i += 1
+        return MISSING
+
+    def close(self) -> None:
+        for attr in ("hashes", "offsets", "data"):
+            view = self.__dict__.pop(attr, None)
+            if view is not None:
+                view.release()
+        self.mmap.close()
+
+
+def open_result_cache_file(path: Path) -> ResultCacheFile | None:
+    if not path.exists():
+        return None
+    try:
+        return ResultCacheFile(path)
+    except (OSError, ValueError, EOFError, TypeError, struct.error) as e:
+        logger.warning(f"Ignoring unreadable result cache file {path}: {e}")
+        return None
+
+
+def source_path(source: str | Path) -> Path | None:
+    """Returns the file of a source given as a module name or a path, or
+    None if it does not exist."""
+    if isinstance(source, str):
+        spec = importlib.util.find_spec(source)
+        if spec is None or spec.origin is None:
+            return None
+        source = Path(spec.origin)
+    return source if source.is_file() else None
+
+
+@dataclass
+class CachedFunction:
+    name: str
+    func: Callable[..., Any]
+    sources: tuple[str | Path, ...]
+    # Names and default values (inspect.Parameter.empty if none) of the
+    # parameters, which must all be positional-or-keyword parameters
+    params: tuple[tuple[str, Any], ...]
+    lru_func: Any = None
+    # Whether the saved results in the open file can be used, None if not
+    # checked yet
+    file_valid: bool | None = None
+    _source_hash: str | None = None
+    # Counts of calls answered by the LRU cache (counted by lru_cache
+    # itself) and the file, and of computed results since the last
+    # take_result_cache_updates()
+    reported_lru_hits: int = 0
+    file_hits: int = 0
+    misses: int = 0
+
+    def source_hash(self) -> str:
+        if self._source_hash is None:
+            self._source_hash = source_hash(
+                path
+                for path in map(source_path, self.sources)
+                if path is not None
+            )
+        return self._source_hash
+
+    def all_args(self, args: tuple, kwargs: dict[str, Any]) -> tuple:
+        """Returns the arguments of a call as positional arguments,
+        including the default values.  This is much faster than
+        ``inspect.Signature.bind()``."""
+        if len(kwargs) == 0 and len(args) == len(self.params):
+            return args
+        if len(args) > len(self.params):
+            raise TypeError(f"{self.name}() got too many arguments")
+        all_args = list(args)
+        num_kwargs = 0
+        for name, default in self.params[len(args) :]:
+            if name in kwargs:
+                all_args.append(kwargs[name])
+                num_kwargs += 1
+            elif default is inspect.Parameter.empty:
+                raise TypeError(f"{self.name}() missing argument {name!r}")
+            else:
+                all_args.append(default)
+        if num_kwargs < len(kwargs):
+            raise TypeError(f"{self.name}() got unexpected arguments")
+        return tuple(all_args)
+
+    def call(self, args: tuple, kwargs: dict[str, Any]) -> Any:
+        cache = result_cache
+        if cache.file is None and not cache.collect:
+            self.misses += 1
+            return self.func(*args, **kwargs)
+        key = result_key(self.all_args(args, kwargs))
+        if cache.file is not None:
+            if self.file_valid is None:
+                self.file_valid = (
+                    cache.file.source_hashes.get(self.name)
+                    == self.source_hash()
+                )
+            if self.file_valid:
+                result = cache.file.get(self.name, key)
+                if result is not MISSING:
+                    self.file_hits += 1
+                    return result
+        self.misses += 1
+        result = self.func(*args, **kwargs)
+        if cache.collect:
+            cache.new_results.append(
+                (
+                    self.name,
+                    result_key_hash(self.name, key),
+                    marshal.dumps((self.name, key, result)),
+                )
+            )
+        return result
+
+
+@dataclass
+class ResultCacheUpdates:
+    """Statistics and new results of a worker process, see
+    ``take_result_cache_updates()``."""
+
+    # Function name -> [LRU cache hits, file hits, computed results]
+    stats: dict[str, list[int]] = field(default_factory=dict)
+    # Function name -> source hash, for the functions in ``new_results``
+    source_hashes: dict[str, str] = field(default_factory=dict)
+    # (function name, key hash, serialized entry) of computed results
+    new_results: list[tuple[str, int, bytes]] = field(default_factory=list)
+
+
+class ResultCache:
+    """Per-process state: the functions, the open file and the new results
+    to send to the parent process."""
+
+    def __init__(self) -> None:
+        self.functions: dict[str, CachedFunction] = {}
+        self.file: ResultCacheFile | None = None
+        self.collect = False
+        self.new_results: list[tuple[str, int, bytes]] = []
+
+    def open(self, path: Path, collect: bool = True) -> None:
+        """Uses the results saved in ``path``.  With ``collect``, the computed
+        results are kept for ``take_result_cache_updates()``."""
+        self.close()
+        self.file = open_result_cache_file(path)
+        self.collect = collect
+        for func in self.functions.values():
+            func.file_valid = None
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        self.collect = False
+        self.new_results = []
+
+
+result_cache = ResultCache()
+
+
+def persistent_cache(
+    name: str,
+    sources: Iterable[str | Path],
+    maxsize: int = RESULT_CACHE_LRU_SIZE,
+) -> Callable[[T], T]:
+    """Decorator that caches the results of a function in an LRU cache of
+    ``maxsize`` results and in the result cache file.  ``sources`` are the
+    modules (by name) and data files that determine the results; a change
+    in them invalidates the saved results."""
+
+    def decorator(func: T) -> T:
+        params = []
+        for param in inspect.signature(func).parameters.values():
+            assert param.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD
+            params.append((param.name, param.default))
+        cached = CachedFunction(name, func, tuple(sources), tuple(params))
+
+        @functools.lru_cache(maxsize=maxsize)
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return cached.call(args, kwargs)
+
+        cached.lru_func = wrapper
+        result_cache.functions[name] = cached
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def open_result_cache(path: str | Path | None, collect: bool = True) -> None:
+    """Opens the result cache file in this process; None closes it."""
+    if path is None:
+        result_cache.close()
+    else:
+        result_cache.open(Path(path), collect)
+
+
+def take_result_cache_updates() -> ResultCacheUpdates:
+    """Returns the statistics and new results since the last call."""
+    updates = ResultCacheUpdates()
+    for func in result_cache.functions.values():
+        lru_hits = func.lru_func.cache_info().hits
+        if lru_hits < func.reported_lru_hits:  # cache_clear() was called
+            func.reported_lru_hits = 0
+        stats = [
+            lru_hits - func.reported_lru_hits,
+            func.file_hits,
+            func.misses,
+        ]
+        if any(stats):
+            updates.stats[func.name] = stats
+        func.reported_lru_hits = lru_hits
+        func.file_hits = 0
+        func.misses = 0
+    updates.new_results = result_cache.new_results
+    result_cache.new_results = []
+    for name, _, _ in updates.new_results:
+        if name not in updates.source_hashes:
+            updates.source_hashes[name] = result_cache.functions[
+                name
+            ].source_hash()
+    return updates
+
+
+class ResultCacheCollector:
+    """Collects the statistics and new results of the worker processes in
+    the parent process.  The new results are spooled to a temporary file
+    next to ``path``, and ``close()`` writes them with the still valid
+    results of the old file to ``path``.  Without ``path``, only the
+    statistics are collected."""
+
+    def __init__(self, path: str | Path | None):
+        self.path = Path(path) if path is not None else None
+        self.stats: dict[str, list[int]] = {}
+        self.source_hashes: dict[str, str] = {}
+        self.hashes = array("Q")
+        self.offsets = array("Q", [0])
+        self.spool: Any = None
+
+    def add(self, updates: ResultCacheUpdates) -> None:
+        for name, stats in updates.stats.items():
+            total = self.stats.setdefault(name, [0, 0, 0])
+            for i, n in enumerate(stats):
+                total[i] += n
+        if self.path is None or len(updates.new_results) == 0:
+            return
+        self.source_hashes.update(updates.source_hashes)
+        if self.spool is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.spool = tempfile.TemporaryFile(dir=self.path.parent)
+        for _, h, data in updates.new_results:
+            self.spool.write(data)
+            self.hashes.append(h)
+            self.offsets.append(self.offsets[-1] + len(data))
+
+    def close(self) -> None:
+        if self.spool is None:
+            return
+        try:
+            self.write()
+        except OSError as e:
+            logger.warning(f"Can't save result cache file {self.path}: {e}")
+        finally:
+            self.spool.close()
+            self.spool = None
+
+    def write(self) -> None:
+        assert self.path is not None
+        self.spool.flush()
+        old_file = open_result_cache_file(self.path)
+        source_hashes = dict(self.source_hashes)
+        # Indexes of the results to write: the results of the old file come
+        # first, then those in the spool file
+        hashes = array("Q")
+        old_indexes: list[int] = []
+        if old_file is not None:
+            stale = {
+                name
+                for name, h in old_file.source_hashes.items()
+                if source_hashes.get(name, h) != h
+            }
+            for name, h in old_file.source_hashes.items():
+                if name not in stale:
+                    source_hashes.setdefault(name, h)
+            for i, h in enumerate(old_file.hashes):
+                if (
+                    len(stale) == 0
+                    or marshal.loads(old_file.entry_data(i))[0] not in stale
+                ):
+                    hashes.append(h)
+                    old_indexes.append(i)
+        num_old = len(hashes)
+        hashes.extend(self.hashes)
+        order = sorted(range(len(hashes)), key=hashes.__getitem__)
+
+        spool = mmap.mmap(self.spool.fileno(), 0, access=mmap.ACCESS_READ)
+        spool_view = memoryview(spool)
+
+        def entry_data(j: int) -> memoryview:
+            if j < num_old:
+                return old_file.entry_data(old_indexes[j])  # type: ignore[union-attr]
+            i = j - num_old
+            return spool_view[self.offsets[i] : self.offsets[i + 1]]
+
+        try:
+            # Several workers may have computed the same result
+            unique: list[int] = []
+            for n, j in enumerate(order):
+                if n > 0 and hashes[order[n - 1]] == hashes[j]:
+                    key = marshal.loads(entry_data(j))[:2]
+                    k = len(unique) - 1
+                    while k >= 0 and hashes[unique[k]] == hashes[j]:
+                        if marshal.loads(entry_data(unique[k]))[:2] == key:
+                            break
+                        k -= 1
+                    else:
+                        unique.append(j)
+                    continue
+                unique.append(j)
+
+            header = marshal.dumps(source_hashes)
+            header += b"\0" * (-len(header) % 8)
+            offsets = array("Q", [0])
+            for j in unique:
+                offsets.append(offsets[-1] + len(entry_data(j)))
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(RESULT_CACHE_MAGIC)
+                    f.write(struct.pack("=Q", len(header)))
+                    f.write(header)
+                    f.write(struct.pack("=Q", len(unique)))
+                    f.write(array("Q", (hashes[j] for j in unique)).tobytes())
+                    f.write(offsets.tobytes())
+                    for j in unique:
+                        f.write(entry_data(j))
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        finally:
+            spool_view.release()
+            spool.close()
+            if old_file is not None:
+                old_file.close()
+        logger.info(
+            f"Saved {len(unique)} results to result cache file {self.path}"
+        )
+
+    def log_stats(self) -> None:
+        for name, (lru_hits, file_hits, misses) in sorted(self.stats.items()):
+            calls = lru_hits + file_hits + misses
+            logger.info(
+                f"{name}() cache: {calls} calls, {lru_hits} LRU cache hits, "
+                f"{file_hits} result cache file hits, {misses} computed "
+                f"({(lru_hits + file_hits) / calls:.1%} hit rate)"
+            )
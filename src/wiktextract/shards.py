@@ -0,0 +1,73 @@
+# Splitting the extraction into shards that can run on several machines,
+# and merging the output of the shards.
+#
+# Each shard processes the pages whose title hashes to its shard index, so
+# every page is processed by exactly one shard regardless of the order of
+# pages in the database.  Words that only occur in the thesaurus are not
+# emitted by the shards but when merging, because that needs the words of
+# all shards.
+
+import json
+import zlib
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import TextIO
+
+from wikitextprocessor import Page
+
+from .output import open_jsonl
+from .thesaurus import emit_words_in_thesaurus, thesaurus_entry_key
+from .wxr_context import WiktextractContext
+from .wxr_logging import logger
+
+
+def page_shard(title: str, shard_count: int) -> int:
+    return zlib.crc32(title.encode("utf-8")) % shard_count
+
+
+def filter_shard_pages(
+    pages: Iterable[Page], shard_index: int, shard_count: int
+) -> Iterator[Page]:
+    for page in pages:
+        if page_shard(page.title, shard_count) == shard_index:
+            yield page
+
+
+def merge_shards(
+    wxr: WiktextractContext,
+    shard_paths: list[str] | list[Path],
+    out_f: TextIO,
+    human_readable: bool = False,
+) -> None:
+    """Concatenates the (possibly compressed) JSON Lines output files of the
+    shards and then emits the words that only occur in the thesaurus.
+    Thesaurus-only entries in the shard files are dropped, so the output
+    files of unsharded runs can be merged too."""
+    emitted = set()
+    for path in shard_paths:
+        logger.info(f"Merging {path}")
+        with open_jsonl(path) as f:
+            for line in f:
+                dt = json.loads(line)
+                if dt.get("source") == "thesaurus":
+                    continue
+                out_f.write(line)
+                key = thesaurus_entry_key(dt, wxr.thesaurus_index)
+                if key is not None:
+                    emitted.add(key)
+    if (
+        wxr.config.dump_file_lang_code == "en"
+        and wxr.config.extract_thesaurus_pages
+    ):
+        emit_words_in_thesaurus(wxr, emitted, out_f, human_readable)
+
+
+def merge_error_files(paths: list[str] | list[Path]) -> dict[str, list]:
+    """Combines the --errors files of the shards."""
+    merged: dict[str, list] = {"errors": [], "warnings": [], "debugs": []}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        for key, messages in merged.items():
+            messages.extend(data.get(key, []))
+    return merged
@@ -0,0 +1,178 @@
+# Import-time and memory profile of the start-up of wiktwords, printed by
+# `wiktwords --startup-profile ...`.  The profiler must be installed before
+# wiktextract modules are imported, so wiktwords runs itself again in a new
+# Python process through `main()` below.  This module may only import
+# standard library modules.
+#
+# The time and memory of a module are measured while its code runs and are
+# reported both with ("total") and without ("self") the modules that it
+# imports.  Modules imported lazily while processing pages are included.
+# Memory is the size of the Python objects allocated (and not freed) while
+# importing the module, as traced by tracemalloc, which also makes the
+# imports somewhat slower than without the profile.
+
+import importlib.abc
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from importlib.machinery import ModuleSpec
+from types import ModuleType
+from typing import Any, Optional, TextIO
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+# Number of modules listed in the report
+STARTUP_PROFILE_TOP = 40
+
+
+@dataclass
+class ModuleImportStats:
+    name: str
+    self_time: float
+    total_time: float
+    self_memory: int
+    total_memory: int
+
+
+class ProfilingLoader(importlib.abc.Loader):
+    """Wraps the loader of a module to measure the execution of the module
+    code.  Other attributes are those of the wrapped loader."""
+
+    def __init__(self, loader: Any, profiler: "ImportProfiler"):
+        self.loader = loader
+        self.profiler = profiler
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.loader, name)
+
+    def create_module(self, spec: ModuleSpec) -> Optional[ModuleType]:
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        self.profiler.enter(module.__name__)
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.profiler.exit()
+
+
+class ImportProfiler(importlib.abc.MetaPathFinder):
+    def __init__(self) -> None:
+        self.start_time = 0.0
+        self.modules: list[ModuleImportStats] = []
+        # [name, start time, start memory, time and memory of imports]
+        self.stack: list[list[Any]] = []
+
+    def install(self) -> None:
+        tracemalloc.start()
+        self.start_time = time.perf_counter()
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self) -> None:
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+        tracemalloc.stop()
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Any,
+        target: Optional[ModuleType] = None,
+    ) -> Optional[ModuleSpec]:
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = ProfilingLoader(spec.loader, self)
+        return spec
+
+    def enter(self, name: str) -> None:
+        self.stack.append(
+            [
+                name,
+                time.perf_counter(),
+                tracemalloc.get_traced_memory()[0],
+                0.0,
+                0,
+            ]
+        )
+
+    def exit(self) -> None:
+        name, start_time, start_memory, child_time, child_memory = (
+            self.stack.pop()
+        )
+        total_time = time.perf_counter() - start_time
+        total_memory = tracemalloc.get_traced_memory()[0] - start_memory
+        self.modules.append(
+            ModuleImportStats(
+                name,
+                total_time - child_time,
+                total_time,
+                total_memory - child_memory,
+                total_memory,
+            )
+        )
+        if len(self.stack) > 0:
+            self.stack[-1][3] += total_time
+            self.stack[-1][4] += total_memory
+
+    def report(self, out_f: TextIO, top: int = STARTUP_PROFILE_TOP) -> None:
+        elapsed = time.perf_counter() - self.start_time
+        import_time = sum(m.self_time for m in self.modules)
+        import_memory = sum(m.self_memory for m in self.modules)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        summary = (
+            f"Startup profile: {len(self.modules)} modules imported in "
+            f"{import_time:.3f} s of {elapsed:.3f} s, "
+            f"{import_memory / 2**20:.1f} MiB allocated by imports, "
+            f"traced peak {peak_memory / 2**20:.1f} MiB"
+        )
+        if resource is not None:
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            if sys.platform != "darwin":
+                max_rss *= 1024  # KiB on Linux
+            summary += f", max RSS {max_rss / 2**20:.1f} MiB"
+        print(summary, file=out_f)
+        print(
+            f"{'self ms':>9} {'total ms':>9} {'self KiB':>9} {'total KiB':>10}"
+            "  module",
+            file=out_f,
+        )
+        slowest = sorted(self.modules, key=lambda m: m.self_time, reverse=True)
+        for m in slowest[:top]:
+            print(
+                f"{m.self_time * 1000:9.1f} {m.total_time * 1000:9.1f} "
+                f"{m.self_memory / 1024:9.0f} {m.total_memory / 1024:10.0f}"
+                f"  {m.name}",
+                file=out_f,
+            )
+
+
+# Command run by `wiktwords --startup-profile` in a new Python process
+STARTUP_PROFILE_COMMAND = "from wiktextract.startup_profile import main; main()"
+
+active_profiler: Optional[ImportProfiler] = None
+
+
+def main() -> None:
+    """Runs wiktwords with the command-line arguments in ``sys.argv`` and
+    prints the profile to stderr."""
+    global active_profiler
+    active_profiler = ImportProfiler()
+    active_profiler.install()
+    try:
+        from .wiktwords import main as wiktwords_main
+
+        wiktwords_main()
+    finally:
+        active_profiler.report(sys.stderr)
+        active_profiler.uninstall()
@@ -2,14 +2,21 @@
 # merged into word linkages in later stages.
 #
 # Copyright (c) 2021 Tatu Ylonen.  See file LICENSE and https://ylonen.org
+import hashlib
+import mmap
 import os
 import sqlite3
 import tempfile
 import time
 import traceback
+from array import array
+from bisect import bisect_left
 from collections.abc import Iterable
+from contextlib import nullcontext
 from dataclasses import dataclass, field
+from itertools import groupby
 from multiprocessing import Pool, current_process
+from operator import itemgetter
 from pathlib import Path
 from typing import Optional, TextIO
 
@@ -18,9 +25,20 @@ from wikitextprocessor import Page
 from wikitextprocessor.core import CollatedErrorReturnData, NamespaceDataEntry
 
 from .import_utils import import_extractor_module
+from .watchdog import PageWatchdog
 from .wxr_context import WiktextractContext
 from .wxr_logging import logger
 
+# Number of terms inserted into the database in one transaction
+THESAURUS_INSERT_BATCH = 50000
+# Cache size (in KiB, as the negative value of the PRAGMA) used while
+# inserting terms
+THESAURUS_INGEST_CACHE_KIB = 256 * 1024
+
+# (entry, language_code, pos, sense, term, linkage, tags, topics, roman,
+# raw_tags) with the lists joined with "|" like in the database
+ThesaurusTermRow = tuple[str, str, str, str, str, str, str, str, str, str]
+
 
 @dataclass
 class ThesaurusTerm:
@@ -41,13 +59,11 @@ def worker_func(
     page: Page,
 ) -> tuple[bool, list[ThesaurusTerm], CollatedErrorReturnData, Optional[str]]:
     wxr: WiktextractContext = worker_func.wxr  # type:ignore[attr-defined]
-    with tempfile.TemporaryDirectory(prefix="wiktextract") as tmpdirname:
-        debug_path = "{}/wiktextract-{}".format(tmpdirname, os.getpid())
-        with open(debug_path, "w", encoding="utf-8") as f:
-            f.write(page.title + "\n")
-
-        wxr.wtp.start_page(page.title)
+    watchdog: PageWatchdog | None = worker_func.watchdog  # type:ignore[attr-defined]
+    with watchdog.page(page.title) if watchdog is not None else nullcontext():
         try:
+            # Inside the try: a page timeout may also abort start_page()
+            wxr.wtp.start_page(page.title)
             terms = extract_thesaurus_page(wxr, page)
             return True, terms, wxr.wtp.to_return(), None
         except Exception as e:
@@ -65,6 +81,45 @@ def worker_func(
             return False, [], {}, msg  # type:ignore[typeddict-item]
 
 
+def term_row(term: ThesaurusTerm) -> ThesaurusTermRow:
+    return (
+        term.entry,
+        term.language_code,
+        term.pos,
+        term.sense,
+        term.term,
+        term.linkage,
+        "|".join(term.tags),
+        "|".join(term.topics),
+        term.roman,
+        "|".join(term.raw_tags),
+    )
+
+
+def batch_worker_func(
+    pages: list[Page],
+) -> tuple[list[ThesaurusTermRow], CollatedErrorReturnData, list[str]]:
+    """Extracts a batch of thesaurus pages in a worker process.  Returns the
+    terms as database rows, the errors, warnings and debug messages and the
+    exception messages of the pages that failed."""
+    rows = []
+    batch_stats: CollatedErrorReturnData = {
+        "errors": [],
+        "warnings": [],
+        "debugs": [],
+    }
+    exceptions = []
+    for page in pages:
+        success, terms, stats, err = worker_func(page)
+        if not success:
+            exceptions.append(err)  # type:ignore[arg-type]
+            continue
+        rows.extend(term_row(term) for term in terms)
+        for key in ("errors", "warnings", "debugs"):
+            batch_stats[key].extend(stats.get(key, []))  # type: ignore[literal-required]
+    return rows, batch_stats, exceptions
+
+
 def extract_thesaurus_page(
     wxr: WiktextractContext, page: Page
 ) -> list[ThesaurusTerm]:
@@ -75,9 +130,11 @@ def extract_thesaurus_page(
 
 
 def extract_thesaurus_data(
-    wxr: WiktextractContext, num_processes: Optional[int] = None
+    wxr: WiktextractContext,
+    num_processes: Optional[int] = None,
+    page_timeout: float = 0,
 ) -> None:
-    from .wiktionary import init_worker_process
+    from .wiktionary import batch_pages, init_worker_process
 
     start_t = time.time()
     logger.info("Extracting thesaurus data")
@@ -87,22 +144,33 @@ def extract_thesaurus_data(
     )
     thesaurus_ns_id = thesaurus_ns_data.get("id", 0)
 
+    num_workers = num_processes or os.cpu_count() or 1
+    num_pages = wxr.wtp.saved_page_nums([thesaurus_ns_id], False)
+    watchdog = PageWatchdog(num_workers, page_timeout)
     wxr.remove_unpicklable_objects()
-    with Pool(num_processes, init_worker_process, (worker_func, wxr)) as pool:
+    with Pool(
+        num_processes, init_worker_process, (worker_func, wxr, watchdog)
+    ) as pool:
         wxr.reconnect_databases(False)
-        for success, terms, stats, err in pool.imap_unordered(
-            worker_func, wxr.wtp.get_all_pages([thesaurus_ns_id], False)
+        watchdog.start()
+        inserter = ThesaurusInserter(wxr.thesaurus_db_conn)  # type:ignore[arg-type]
+        for rows, stats, exceptions in pool.imap_unordered(
+            batch_worker_func,
+            batch_pages(
+                wxr.wtp.get_all_pages([thesaurus_ns_id], False),
+                num_pages,
+                num_workers,
+            ),
         ):
-            if not success:
+            for err in exceptions:
                 # Print error in parent process - do not remove
                 logger.error(err)
-                continue
-            for term in terms:
-                insert_thesaurus_term(wxr.thesaurus_db_conn, term)  # type:ignore[arg-type]
+            inserter.add_rows(rows)
             wxr.config.merge_return(stats)
+        inserter.close()
+        watchdog.stop()
 
-    wxr.thesaurus_db_conn.commit()  # type:ignore[union-attr]
-    num_pages = wxr.wtp.saved_page_nums([thesaurus_ns_id], False)
+    build_thesaurus_index(wxr)
     total = thesaurus_linkage_number(wxr.thesaurus_db_conn)  # type:ignore[arg-type]
     logger.info(
         "Extracted {} linkages from {} thesaurus pages (took {:.1f}s)".format(
@@ -136,6 +204,7 @@ def init_thesaurus_db(db_path: Path) -> sqlite3.Connection:
         PRIMARY KEY(term, entry_id),
         FOREIGN KEY(entry_id) REFERENCES entries(id)
         );
+        CREATE INDEX IF NOT EXISTS terms_entry_id_index ON terms(entry_id);
 
         PRAGMA journal_mode = WAL;
         PRAGMA foreign_keys = ON;
@@ -183,45 +252,213 @@ def search_thesaurus(
         )
 
 
-def insert_thesaurus_term(
-    db_conn: sqlite3.Connection, term: ThesaurusTerm
-) -> None:
-    entry_id = None
-    for (new_entry_id,) in db_conn.execute(
-        "INSERT OR IGNORE INTO entries (entry, language_code, pos, sense) "
-        "VALUES(?, ?, ?, ?) RETURNING id",
-        (term.entry, term.language_code, term.pos, term.sense),
+class ThesaurusInserter:
+    """Inserts extracted thesaurus terms into the database in bulk.  Entry ids
+    are assigned from an in-memory cache instead of being looked up in the
+    database for every term, and the indexes are dropped while inserting and
+    created again in ``close()``.  The terms are inserted in batches, but
+    only committed in ``close()``.  As before, the sense of the first term of
+    an entry is saved in the entry and duplicate terms are ignored."""
+
+    def __init__(
+        self,
+        db_conn: sqlite3.Connection,
+        batch_size: int = THESAURUS_INSERT_BATCH,
     ):
-        entry_id = new_entry_id
-    if entry_id is None:
-        for (old_entry_id,) in db_conn.execute(
-            "SELECT id FROM entries WHERE entry = ? AND language_code = ? "
-            "AND pos = ?",
-            (term.entry, term.language_code, term.pos),
+        self.db_conn = db_conn
+        self.batch_size = batch_size
+        self.entry_ids: dict[tuple[str, str, str], int] = {}
+        for entry_id, entry, language_code, pos in db_conn.execute(
+            "SELECT id, entry, language_code, pos FROM entries"
         ):
-            entry_id = old_entry_id
-    db_conn.execute(
-        """
-        INSERT OR IGNORE INTO terms
-        (term, entry_id, linkage, tags, topics, roman, raw_tags)
-        VALUES(?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            term.term,
-            entry_id,
-            term.linkage,
-            "|".join(term.tags),
-            "|".join(term.topics),
-            term.roman,
-            "|".join(term.raw_tags),
+            self.entry_ids[(entry, language_code, pos)] = entry_id
+        self.next_entry_id = max(self.entry_ids.values(), default=0) + 1
+        self.new_entries: list[tuple[int, str, str, str, str]] = []
+        self.new_terms: list[tuple[str, int, str, str, str, str, str]] = []
+        self.saved_pragmas = {
+            pragma: db_conn.execute(f"PRAGMA {pragma}").fetchone()[0]
+            for pragma in ("synchronous", "cache_size", "foreign_keys")
+        }
+        db_conn.executescript(
+            f"""
+            PRAGMA synchronous = OFF;
+            PRAGMA cache_size = -{THESAURUS_INGEST_CACHE_KIB};
+            PRAGMA foreign_keys = OFF;
+            """
+        )
+        # All changes are made in one transaction, committed in close(): if
+        # the extraction is interrupted, the database is left as it was
+        # before instead of with a part of the terms and no indexes, which
+        # the next run would use as if the extraction had finished.
+        db_conn.execute("BEGIN")
+        db_conn.execute("DROP INDEX IF EXISTS entries_index")
+        db_conn.execute("DROP INDEX IF EXISTS terms_entry_id_index")
+
+    def add_rows(self, rows: Iterable[ThesaurusTermRow]) -> None:
+        for (
+            entry,
+            language_code,
+            pos,
+            sense,
+            term,
+            linkage,
+            tags,
+            topics,
+            roman,
+            raw_tags,
+        ) in rows:
+            key = (entry, language_code, pos)
+            entry_id = self.entry_ids.get(key)
+            if entry_id is None:
+                entry_id = self.next_entry_id
+                self.next_entry_id += 1
+                self.entry_ids[key] = entry_id
+                self.new_entries.append(
+                    (entry_id, entry, language_code, pos, sense)
+                )
+            self.new_terms.append(
+                (term, entry_id, linkage, tags, topics, roman, raw_tags)
+            )
+        if len(self.new_terms) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        self.db_conn.executemany(
+            "INSERT INTO entries (id, entry, language_code, pos, sense) "
+            "VALUES(?, ?, ?, ?, ?)",
+            self.new_entries,
+        )
+        self.db_conn.executemany(
+            """
+            INSERT OR IGNORE INTO terms
+            (term, entry_id, linkage, tags, topics, roman, raw_tags)
+            VALUES(?, ?, ?, ?, ?, ?, ?)
+            """,
+            self.new_terms,
+        )
+        self.new_entries = []
+        self.new_terms = []
+
+    def close(self) -> None:
+        """Inserts the remaining terms, creates the indexes, commits the
+        transaction and restores the database settings."""
+        self.flush()
+        self.db_conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS entries_index "
+            "ON entries(entry, pos, language_code)"
+        )
+        self.db_conn.execute(
+            "CREATE INDEX IF NOT EXISTS terms_entry_id_index ON terms(entry_id)"
+        )
+        self.db_conn.commit()
+        for pragma, value in self.saved_pragmas.items():
+            self.db_conn.execute(f"PRAGMA {pragma} = {value}")
+
+
+def thesaurus_key_hash(entry: str, language_code: str, pos: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(
+            f"{entry}\0{language_code}\0{pos}".encode("utf-8"), digest_size=8
+        ).digest(),
+        "little",
+    )
+
+
+def thesaurus_index_path(db_path: Path) -> Path:
+    return db_path.with_name(db_path.stem + "_index.bin")
+
+
+class ThesaurusIndex:
+    """Memory-mapped sorted array of 64-bit hashes of the (entry,
+    language_code, pos) keys of the thesaurus entries that have terms.  Most
+    words are not in the thesaurus; ``in`` answers that without querying
+    the database.  Hash collisions only cause an unnecessary query.  The
+    worker processes map the same file, so the index is shared through the
+    page cache."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.mmap: mmap.mmap | None = None
+        with path.open("rb") as f:
+            if os.fstat(f.fileno()).st_size > 0:
+                self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.keys = (
+            memoryview(self.mmap).cast("Q")
+            if self.mmap is not None
+            else memoryview(b"").cast("Q")
+        )
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: tuple[str, str, str]) -> bool:
+        h = thesaurus_key_hash(*key)
+        i = bisect_left(self.keys, h)
+        return i < len(self.keys) and self.keys[i] == h
+
+    def close(self) -> None:
+        self.keys.release()
+        if self.mmap is not None:
+            self.mmap.close()
+            self.mmap = None
+
+
+def thesaurus_entry_key(
+    data: dict, index: ThesaurusIndex | None = None
+) -> tuple[str, str, str] | None:
+    """Returns the (word, lang_code, pos) key of extracted data that
+    ``emit_words_in_thesaurus()`` needs, or None if the data has no such key
+    or the key is not a thesaurus entry in ``index``.  Only keeping the keys
+    of thesaurus entries makes the set of emitted keys small."""
+    word = data.get("word")
+    lang_code = data.get("lang_code")
+    pos = data.get("pos")
+    if not (word and lang_code and pos):
+        return None
+    key = (word, lang_code, pos)
+    if index is not None and key not in index:
+        return None
+    return key
+
+
+def open_thesaurus_index(db_path: Path) -> ThesaurusIndex | None:
+    path = thesaurus_index_path(db_path)
+    return ThesaurusIndex(path) if path.exists() else None
+
+
+def build_thesaurus_index(wxr: WiktextractContext) -> None:
+    """Writes the index file of the thesaurus database and opens it in
+    ``wxr``.  The file is replaced atomically, so processes that have the
+    old file mapped are not affected."""
+    keys = array(
+        "Q",
+        sorted(
+            {
+                thesaurus_key_hash(entry, language_code, pos)
+                for entry, language_code, pos in wxr.thesaurus_db_conn.execute(  # type:ignore[union-attr]
+                    "SELECT entry, language_code, pos FROM entries "
+                    "WHERE EXISTS "
+                    "(SELECT 1 FROM terms WHERE terms.entry_id = entries.id)"
+                )
+            }
         ),
     )
+    path = thesaurus_index_path(wxr.thesaurus_db_path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("wb") as f:
+        keys.tofile(f)
+    os.replace(tmp_path, path)
+    if wxr.thesaurus_index is not None:
+        wxr.thesaurus_index.close()
+    wxr.thesaurus_index = ThesaurusIndex(path)
+    logger.info(f"Indexed {len(keys)} thesaurus entries")
 
 
 def close_thesaurus_db(db_path: Path, db_conn: sqlite3.Connection) -> None:
     db_conn.close()
     if db_path.parent.samefile(Path(tempfile.gettempdir())):
         db_path.unlink(True)
+        thesaurus_index_path(db_path).unlink(True)
 
 
 def emit_words_in_thesaurus(
@@ -236,9 +473,18 @@ def emit_words_in_thesaurus(
     from .wiktionary import write_json_data
 
     logger.info("Emitting words that only occur in thesaurus")
-    for entry_id, entry, pos, lang_code, sense in wxr.thesaurus_db_conn.execute(  # type:ignore[union-attr]
-        "SELECT id, entry, pos, language_code, sense FROM entries "
-        "WHERE pos IS NOT NULL AND language_code IS NOT NULL"
+    # One query for all entries and their terms, grouped by entry
+    rows = wxr.thesaurus_db_conn.execute(  # type:ignore[union-attr]
+        """
+        SELECT entries.id, entry, pos, language_code, sense,
+        term, linkage, tags, topics, roman, raw_tags
+        FROM entries LEFT JOIN terms ON terms.entry_id = entries.id
+        WHERE pos IS NOT NULL AND language_code IS NOT NULL
+        ORDER BY entries.id, terms.rowid
+        """
+    )
+    for (entry_id, entry, pos, lang_code, sense), entry_rows in groupby(
+        rows, key=itemgetter(0, 1, 2, 3, 4)
     ):
         if (entry, lang_code, pos) in emitted:
             continue
@@ -261,19 +507,16 @@ def emit_words_in_thesaurus(
             sense_dict["glosses"] = [sense]
 
         for (
+            *_,
             term,
             linkage,
             tags,
             topics,
             roman,
             raw_tags,
-        ) in wxr.thesaurus_db_conn.execute(  # type:ignore[union-attr]
-            """
-            SELECT term, linkage, tags, topics, roman, raw_tags
-            FROM terms WHERE entry_id = ?
-            """,
-            (entry_id,),
-        ):
+        ) in entry_rows:
+            if term is None:
+                continue  # entry without terms
             relation_dict = {"word": term, "source": f"Thesaurus:{entry}"}
             if len(tags) > 0:
                 relation_dict["tags"] = tags.split("|")
@@ -0,0 +1,173 @@
+# Index of the titles of the pages in the database.  The extractors call
+# `page_exists()` in heuristics that try many candidate titles, and most of
+# the candidates are not titles; each call is a query of the database.
+# The index is a memory-mapped sorted array of 63-bit hashes of all titles,
+# written next to the database after the first phase, so a title that is
+# not in the index is rejected without querying the database.  A title that
+# is in the index (or a hash collision) is checked with
+# `Wtp.page_exists()`, so the result is always the same as without the
+# index.  The worker processes map the same file.
+#
+# The index is built at the end of the first phase and when the second
+# phase finds no up-to-date index, unless the pages are processed in
+# shards: the shards share the database file and may not be allowed to
+# write next to it, so they run without the index if it has not been
+# built before, e.g. with the `--page` and `--use-thesaurus` step that
+# extracts the thesaurus before starting the shards.
+
+import mmap
+import os
+import tempfile
+import zlib
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+
+from wikitextprocessor import Wtp
+
+from .wxr_logging import logger
+
+# Number of hashes written to the index file at a time
+TITLE_INDEX_WRITE_BATCH = 65536
+
+
+def title_hash(title: str) -> int:
+    """Returns a 63-bit hash of the title, small enough for SQLite to sort
+    the hashes as integers.  The CRC is much faster to compute than a
+    cryptographic hash; collisions only cause a query of the database."""
+    b = title.encode("utf-8")
+    return zlib.crc32(b) << 31 ^ zlib.adler32(b)
+
+
+def title_index_path(db_path: Path) -> Path:
+    return db_path.with_name(db_path.stem + "_titles.bin")
+
+
+class TitleIndex:
+    """Memory-mapped sorted array of the hashes of the page titles.
+    ``in`` is False if there is no page with the title and True if there
+    probably is.
+
+    The file contains the sorted hashes, then the index of the first hash
+    of each of the 2**bits buckets of hashes with the same top bits (and the
+    number of hashes), then the number of bits.  A lookup only searches
+    the few hashes in one bucket."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.mmap: mmap.mmap | None = None
+        with path.open("rb") as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        data = memoryview(self.mmap).cast("Q")
+        bits = data[-1]
+        self.shift = 63 - bits
+        self.starts = data[-(1 << bits) - 2 : -1]
+        self.keys = data[: -(1 << bits) - 2]
+        data.release()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, title: str) -> bool:
+        h = title_hash(title)
+        b = h >> self.shift
+        end = self.starts[b + 1]
+        i = bisect_left(self.keys, h, self.starts[b], end)
+        return i < end and self.keys[i] == h
+
+    def close(self) -> None:
+        self.keys.release()
+        self.starts.release()
+        if self.mmap is not None:
+            self.mmap.close()
+            self.mmap = None
+
+
+def open_title_index(db_path: Path | None) -> TitleIndex | None:
+    """Opens the title index of the database, or returns None if the index
+    has not been built or the database has been modified after it was
+    built."""
+    if db_path is None:
+        return None
+    path = title_index_path(db_path)
+    try:
+        if path.stat().st_mtime < db_path.stat().st_mtime:
+            return None
+    except FileNotFoundError:
+        return None
+    return TitleIndex(path)
+
+
+def build_title_index(wtp: Wtp) -> TitleIndex:
+    """Writes the title index file of the database of ``wtp`` and returns
+    it opened.  The hashes are sorted by SQLite, which uses temporary files
+    instead of memory for large sorts.  The file is replaced atomically, so
+    processes that have the old file mapped are not affected."""
+    db_conn = wtp.db_conn
+    db_conn.create_function("title_hash", 1, title_hash, deterministic=True)
+    (num_pages,) = db_conn.execute("SELECT count(*) FROM pages").fetchone()
+    # Two to four titles per bucket
+    bits = max(num_pages.bit_length() - 2, 0)
+    shift = 63 - bits
+    path = title_index_path(wtp.db_path)  # type: ignore[arg-type]
+    keys = array("Q")
+    starts = array("Q")
+    num_keys = 0
+    # A unique temporary file, in case several processes build the index
+    with tempfile.NamedTemporaryFile(
+        "wb", dir=path.parent, prefix=path.name + ".", delete=False
+    ) as f:
+        tmp_path = Path(f.name)
+        try:
+            for (h,) in db_conn.execute(
+                "SELECT DISTINCT title_hash(title) FROM pages ORDER BY 1"
+            ):
+                b = h >> shift
+                while len(starts) <= b:
+                    starts.append(num_keys)
+                keys.append(h)
+                num_keys += 1
+                if len(keys) >= TITLE_INDEX_WRITE_BATCH:
+                    keys.tofile(f)
+                    del keys[:]
+            keys.tofile(f)
+            while len(starts) <= 1 << bits:
+                starts.append(num_keys)
+            starts.append(bits)
+            starts.tofile(f)
+            # Readable by the same users as the database
+            os.chmod(f.fileno(), wtp.db_path.stat().st_mode & 0o666)  # type: ignore[union-attr]
+        except BaseException:
+            f.close()
+            tmp_path.unlink()
+            raise
+    os.replace(tmp_path, path)
+    logger.info(f"Indexed {num_keys} page titles")
+    return TitleIndex(path)
+
+
+def open_or_build_title_index(
+    wtp: Wtp, build: bool = True
+) -> TitleIndex | None:
+    """Opens the title index of the database of ``wtp``.  If there is no
+    up-to-date index, it is built if ``build`` is True and the directory of
+    the database is writable; otherwise None is returned."""
+    index = open_title_index(wtp.db_path)
+    if index is not None or not build or wtp.db_path is None:
+        return index
+    if not os.access(wtp.db_path.parent, os.W_OK):
+        logger.info(f"{wtp.db_path.parent} is not writable, no title index")
+        return None
+    try:
+        return build_title_index(wtp)
+    except OSError as e:
+        logger.warning(f"Can't write the title index: {e}")
+        return None
+
+
+def remove_temp_title_index(db_path: Path | None) -> None:
+    """Removes the title index of a temporary database."""
+    if db_path is not None and db_path.parent.samefile(
+        Path(tempfile.gettempdir())
+    ):
+        title_index_path(db_path).unlink(True)
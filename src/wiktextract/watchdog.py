@@ -0,0 +1,164 @@
+# Watchdog for pages that take too long to process in the worker processes.
+#
+# Each worker process publishes the title of the page it is processing and
+# the processing start time in its own slot of a shared memory array.  A
+# thread in the parent process periodically scans the slots and reports
+# pages that have been processed for too long.  Optionally, the worker
+# aborts a page after a timeout so that the extraction can continue with
+# the next page.
+
+import ctypes
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from .wxr_logging import logger
+
+# Report pages that have been processed for this many seconds
+WATCHDOG_WARN_SECONDS = 100.0
+# How often the parent process checks the slots, in seconds
+WATCHDOG_CHECK_INTERVAL = 10.0
+# Maximum length of the saved page title in bytes
+WATCHDOG_TITLE_SIZE = 256
+
+
+class PageTimeoutError(Exception):
+    pass
+
+
+class WatchdogSlot(ctypes.Structure):
+    _fields_ = [
+        ("pid", ctypes.c_int),
+        ("start_time", ctypes.c_double),
+        ("title", ctypes.c_char * WATCHDOG_TITLE_SIZE),
+    ]
+
+
+def pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def raise_page_timeout(signum, frame) -> None:
+    raise PageTimeoutError("page processing timed out")
+
+
+class PageWatchdog:
+    """Tracks the page processed by each worker process in shared memory.
+    Create the object in the parent process with one slot per worker
+    process, pass it to the workers in the pool initializer and call
+    ``attach()`` there.  ``page_timeout`` seconds greater than zero makes
+    the workers raise ``PageTimeoutError`` in pages that take longer than
+    that."""
+
+    def __init__(
+        self,
+        num_slots: int,
+        page_timeout: float = 0,
+        warn_seconds: float = WATCHDOG_WARN_SECONDS,
+        check_interval: float = WATCHDOG_CHECK_INTERVAL,
+    ):
+        self.slots = multiprocessing.Array(WatchdogSlot, num_slots)
+        self.page_timeout = page_timeout
+        self.warn_seconds = warn_seconds
+        self.check_interval = check_interval
+        self.slot_index: int | None = None
+        self.stop_event: threading.Event | None = None
+        self.monitor_thread: threading.Thread | None = None
+
+    def __getstate__(self) -> dict:
+        # The monitor thread only exists in the parent process
+        state = self.__dict__.copy()
+        state["stop_event"] = None
+        state["monitor_thread"] = None
+        return state
+
+    def attach(self) -> None:
+        """Claims a free slot for the current worker process.  Slots of dead
+        processes are reused when the pool replaces a worker."""
+        pid = os.getpid()
+        with self.slots.get_lock():
+            for index, slot in enumerate(self.slots.get_obj()):
+                if slot.pid == 0 or not pid_alive(slot.pid):
+                    slot.pid = pid
+                    slot.start_time = 0
+                    slot.title = b""
+                    self.slot_index = index
+                    break
+        if self.page_timeout > 0:
+            signal.signal(signal.SIGALRM, raise_page_timeout)
+
+    @contextmanager
+    def page(self, title: str) -> Iterator[None]:
+        """Marks ``title`` as being processed by this worker process."""
+        slot = (
+            self.slots.get_obj()[self.slot_index]
+            if self.slot_index is not None
+            else None
+        )
+        if slot is not None:
+            slot.title = title.encode("utf-8")[: WATCHDOG_TITLE_SIZE - 1]
+            slot.start_time = time.time()
+        if self.page_timeout > 0:
+            signal.setitimer(signal.ITIMER_REAL, self.page_timeout)
+        try:
+            yield
+        finally:
+            if self.page_timeout > 0:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+            if slot is not None:
+                slot.start_time = 0
+
+    def slow_pages(self) -> list[tuple[int, str, float]]:
+        """Returns the process id, page title and elapsed seconds of the
+        pages that have been processed for more than ``warn_seconds``."""
+        now = time.time()
+        pages = []
+        with self.slots.get_lock():
+            for slot in self.slots.get_obj():
+                if (
+                    slot.start_time > 0
+                    and now - slot.start_time > self.warn_seconds
+                ):
+                    pages.append(
+                        (
+                            slot.pid,
+                            slot.title.decode("utf-8", errors="replace"),
+                            now - slot.start_time,
+                        )
+                    )
+        return pages
+
+    def monitor(self) -> None:
+        reported = set()
+        while not self.stop_event.wait(self.check_interval):  # type: ignore[union-attr]
+            for pid, title, seconds in self.slow_pages():
+                if (pid, title) in reported:
+                    continue
+                reported.add((pid, title))
+                logger.warning(
+                    f"Page {title!r} has been processed for {seconds:.0f}s "
+                    f"in process {pid}"
+                )
+
+    def start(self) -> None:
+        """Starts the monitor thread in the parent process."""
+        self.stop_event = threading.Event()
+        self.monitor_thread = threading.Thread(target=self.monitor, daemon=True)
+        self.monitor_thread.start()
+
+    def stop(self) -> None:
+        if self.stop_event is not None:
+            self.stop_event.set()
+            self.monitor_thread.join()  # type: ignore[union-attr]
+            self.stop_event = None
+            self.monitor_thread = None
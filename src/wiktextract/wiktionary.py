@@ -9,9 +9,13 @@ import json
 import os
 import re
 import tarfile
-import tempfile
 import time
 import traceback
+import zlib
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from contextlib import nullcontext
+from functools import cache, partial
 from multiprocessing import Pool, current_process
 from pathlib import Path
 from typing import TextIO
@@ -20,16 +24,40 @@ from wikitextprocessor import Page
 from wikitextprocessor.core import CollatedErrorReturnData, ErrorMessageData
 from wikitextprocessor.dumpparser import process_dump
 
+from .checkpoint import Checkpoint, read_emitted_words
 from .import_utils import import_extractor_module
-from .page import parse_page
+from .incremental import copy_unchanged_data, find_reparse_titles
+from .output import json_dumps
+from .page import counted_caches, parse_page
+from .result_cache import (
+    ResultCacheCollector,
+    ResultCacheUpdates,
+    open_result_cache,
+    take_result_cache_updates,
+)
+from .shards import filter_shard_pages
 from .thesaurus import (
+    build_thesaurus_index,
     emit_words_in_thesaurus,
     extract_thesaurus_data,
+    thesaurus_entry_key,
     thesaurus_linkage_number,
 )
+from .title_index import open_or_build_title_index
+from .watchdog import PageWatchdog
 from .wxr_context import WiktextractContext
 from .wxr_logging import logger
 
+# Pages are sent to the worker processes in batches to reduce the per-task
+# pickling and IPC overhead in the parent process.  A batch is closed when
+# the page bodies in it add up to this many characters ...
+PAGE_BATCH_SIZE = 1024 * 1024
+# ... or when it contains this many pages.
+PAGE_BATCH_MAX_PAGES = 256
+# Seed for selecting the pages whose data is checked with --validate=sample:N,
+# different from the page shard hash in shards.py
+VALIDATE_SAMPLE_SEED = 0x5EED
+
 
 def page_handler(
     page: Page,
@@ -40,17 +68,14 @@ def page_handler(
     # We've given the page_handler function an extra wxr attribute previously.
     # This should never cause an exception, and if it does, we want it to.
     wxr: WiktextractContext = page_handler.wxr  #  type:ignore[attr-defined]
-    # Helps debug extraction hangs. This writes the path of each file being
-    # processed into /tmp/wiktextract*/wiktextract-*.  Once a hang
-    # has been observed, these files contain page(s) that hang.  They should
-    # be checked before aborting the process, as an interrupt might delete them.
-    with tempfile.TemporaryDirectory(prefix="wiktextract") as tmpdirname:
-        debug_path = "{}/wiktextract-{}".format(tmpdirname, os.getpid())
-        with open(debug_path, "w", encoding="utf-8") as f:
-            f.write(page.title + "\n")
-
-        wxr.wtp.start_page(page.title)
+    # Helps debug extraction hangs: the title of the page being processed
+    # is published to the parent process, which reports pages that take too
+    # long.  See watchdog.py.
+    watchdog: PageWatchdog | None = page_handler.watchdog  # type:ignore[attr-defined]
+    with watchdog.page(page.title) if watchdog is not None else nullcontext():
         try:
+            # Inside the try: a page timeout may also abort start_page()
+            wxr.wtp.start_page(page.title)
             title = re.sub(r"[\s\000-\037]+", " ", page.title)
             title = title.strip()
             if page.redirect_to is not None:
@@ -84,6 +109,133 @@ def page_handler(
             return [], wxr.wtp.to_return()
 
 
+def parse_validate(value: str) -> int:
+    """Parses the --validate option value "off", "full" or "sample:N" into
+    the ``validate_sample`` argument of ``reprocess_wiktionary()``: 0 checks
+    no data, 1 all data and N the data of one page in N."""
+    if value == "off":
+        return 0
+    if value == "full":
+        return 1
+    if value.startswith("sample:") and value[7:].isdigit():
+        n = int(value[7:])
+        if n > 0:
+            return n
+    raise ValueError(f"invalid validation mode: {value!r}")
+
+
+def validate_page(title: str, validate_sample: int) -> bool:
+    """Returns True if the data of the page should be checked with
+    ``check_json_data()`` and ``check_model_data()``.  Sampled pages are
+    selected by a hash of the title so that the same pages are checked in
+    every run."""
+    if validate_sample <= 1:
+        return validate_sample == 1
+    return (
+        zlib.crc32(title.encode("utf-8"), VALIDATE_SAMPLE_SEED)
+        % validate_sample
+        == 0
+    )
+
+
+def page_batch_handler(
+    pages: list[Page], human_readable: bool = False, validate_sample: int = 1
+) -> tuple[
+    list[tuple[str, str, list[tuple[str, str, str]]]],
+    CollatedErrorReturnData,
+    dict[str, tuple[int, int]],
+    ResultCacheUpdates,
+]:
+    """Processes a batch of pages in a worker process.  The extracted data is
+    checked and serialized here to keep this work out of the parent process.
+    Returns the title, JSON Lines text and thesaurus entry keys (see
+    ``thesaurus_entry_key()``) of each page, the errors, warnings and debug
+    messages of the whole batch, the hits and misses of the caches in
+    ``counted_caches`` (see page.py) and the statistics and new results of
+    the result cache (see result_cache.py).  See ``validate_page()`` for
+    ``validate_sample``."""
+    wxr: WiktextractContext = page_handler.wxr  # type:ignore[attr-defined]
+    model = extractor_data_model(wxr.wtp.lang_code)
+    cache_counts = {
+        name: (cache.hits, cache.misses)
+        for name, cache in counted_caches.items()
+    }
+    batch_data = []
+    batch_stats: CollatedErrorReturnData = {
+        "errors": [],
+        "warnings": [],
+        "debugs": [],
+    }
+    # Only the data of English thesaurus entries is needed for
+    # emit_words_in_thesaurus()
+    collect_words = (
+        wxr.config.extract_thesaurus_pages
+        and wxr.config.dump_file_lang_code == "en"
+    )
+    for page in pages:
+        page_data, page_stats = page_handler(page)
+        lines = []
+        words = []
+        validate = validate_page(page.title, validate_sample)
+        for dt in page_data:
+            if validate:
+                check_json_data(wxr, dt)
+                if model is not None:
+                    check_model_data(wxr, dt, model)
+            lines.append(json_dumps(dt, human_readable) + "\n")
+            if collect_words:
+                key = thesaurus_entry_key(dt, wxr.thesaurus_index)
+                if key is not None:
+                    words.append(key)
+        batch_data.append((page.title, "".join(lines), words))
+        for key in ("errors", "warnings", "debugs"):
+            batch_stats[key].extend(page_stats.get(key, []))  # type: ignore[literal-required]
+    # check_json_data() saves its messages in the worker's config
+    batch_stats["debugs"].extend(wxr.config.debugs)
+    wxr.config.debugs.clear()
+    return (
+        batch_data,
+        batch_stats,
+        {
+            name: (
+                cache.hits - cache_counts.get(name, (0, 0))[0],
+                cache.misses - cache_counts.get(name, (0, 0))[1],
+            )
+            for name, cache in counted_caches.items()
+        },
+        take_result_cache_updates(),
+    )
+
+
+def batch_pages(
+    pages: Iterable[Page],
+    num_pages: int,
+    num_workers: int,
+    batch_size: int = PAGE_BATCH_SIZE,
+    max_pages: int = PAGE_BATCH_MAX_PAGES,
+) -> Iterator[list[Page]]:
+    """Groups pages into batches for the worker processes.  A batch ends when
+    the length of its page bodies reaches ``batch_size`` characters, so
+    large pages are sent in small batches.  The page count limit shrinks
+    towards the end of the run (``num_pages`` is the expected total) so that
+    the last batches are spread over all ``num_workers`` workers.  A
+    ``batch_size`` of zero sends every page in its own batch."""
+    batch: list[Page] = []
+    batch_len = 0
+    remaining = num_pages
+    for page in pages:
+        batch.append(page)
+        batch_len += len(page.body or "")
+        remaining -= 1
+        limit = max(1, min(max_pages, remaining // (num_workers * 4)))
+        if batch_len >= batch_size or len(batch) >= limit:
+            yield batch
+            batch = []
+            batch_len = 0
+    if len(batch) > 0:
+        yield batch
+
+
 def parse_wiktionary(
     wxr: WiktextractContext,
     dump_path: str,
@@ -95,6 +247,16 @@ def parse_wiktionary(
     override_folders: list[str] | list[Path] | None = None,
     skip_extract_dump: bool = False,
     save_pages_path: str | Path | None = None,
+    batch_size: int = PAGE_BATCH_SIZE,
+    page_timeout: float = 0,
+    checkpoint_path: str | Path | None = None,
+    resume: bool = False,
+    previous_db_path: str | Path | None = None,
+    previous_output_path: str | Path | None = None,
+    shard_index: int = 0,
+    shard_count: int = 1,
+    validate_sample: int = 1,
+    result_cache_path: str | Path | None = None,
 ) -> None:
     """Parses Wiktionary from the dump file ``path`` (which should point
     to a "enwiktionary-<date>-pages-articles.xml.bz2" file.  This
@@ -125,20 +287,33 @@ def parse_wiktionary(
         if analyze_template_mod is not None
         else None,
     )
+    if shard_count == 1:
+        if wxr.title_index is not None:
+            wxr.title_index.close()
+        wxr.title_index = open_or_build_title_index(wxr.wtp)
 
     if not phase1_only:
-        reprocess_wiktionary(wxr, num_processes, out_f, human_readable)
+        reprocess_wiktionary(
+            wxr,
+            num_processes,
+            out_f,
+            human_readable,
+            batch_size=batch_size,
+            page_timeout=page_timeout,
+            checkpoint_path=checkpoint_path,
+            resume=resume,
+            previous_db_path=previous_db_path,
+            previous_output_path=previous_output_path,
+            shard_index=shard_index,
+            shard_count=shard_count,
+            validate_sample=validate_sample,
+            result_cache_path=result_cache_path,
+        )
 
 
 def write_json_data(data: dict, out_f: TextIO, human_readable: bool) -> None:
     if out_f is not None:
-        if human_readable:
-            out_f.write(
-                json.dumps(data, indent=2, sort_keys=True, ensure_ascii=False)
-            )
-        else:
-            out_f.write(json.dumps(data, ensure_ascii=False))
-        out_f.write("\n")
+        out_f.write(json_dumps(data, human_readable) + "\n")
 
 
 def estimate_progress(
@@ -166,9 +341,18 @@ def estimate_progress(
     return last_time
 
 
-def init_worker_process(worker_func, wxr: WiktextractContext) -> None:
+def init_worker_process(
+    worker_func,
+    wxr: WiktextractContext,
+    watchdog: PageWatchdog | None = None,
+    result_cache_path: str | Path | None = None,
+) -> None:
     wxr.reconnect_databases()
+    open_result_cache(result_cache_path)
     worker_func.wxr = wxr
+    if watchdog is not None:
+        watchdog.attach()
+    worker_func.watchdog = watchdog
 
 
 def check_error(
@@ -193,7 +377,7 @@ def check_error(
         prefix += "/" + pos
     if prefix:
         msg = prefix + ": " + msg
-    print(msg)
+    logger.debug(msg)
     config = wxr.config
     if len(config.debugs) > 100000:  # Avoid excessive size
         return
@@ -209,6 +393,14 @@ def check_error(
     config.debugs.append(error_data)
 
 
+@cache
+def valid_tag_set() -> frozenset[str]:
+    """Returns the tags accepted by ``check_tags()``."""
+    from .tags import uppercase_tags, valid_tags
+
+    return frozenset(valid_tags) | frozenset(uppercase_tags)
+
+
 def check_tags(
     wxr: WiktextractContext,
     dt: dict,
@@ -233,6 +425,11 @@ def check_tags(
             ),
         )
         return
+    # XXX enable the check for other editions later (currently too many
+    # bogus tags in non-English editions).  Tag values should be
+    # standardized across editions, except for uppercase tags (e.g.,
+    # regional variants).
+    tag_set = valid_tag_set() if wxr.wtp.lang_code in ("en",) else None
     for tag in tags:
         if not isinstance(tag, str):
             check_error(
@@ -246,33 +443,59 @@ def check_tags(
                 ),
             )
             continue
-        # XXX enable the following later (currently too many bogus tags in
-        # non-English editions).  Tag values should be standardized across
-        # editions, except for uppercase tags (e.g., regional variants).
-        if wxr.wtp.lang_code in ("en",):  # Check edition
-            from .tags import uppercase_tags, valid_tags
-
-            if tag not in valid_tags and tag not in uppercase_tags:
-                if len(tag) > 0 and tag[0].isupper():
-                    check_error(
-                        wxr,
-                        dt,
-                        word,
-                        lang,
-                        pos,
-                        f"invalid uppercase tag {tag} not in or uppercase_tags",
-                        called_from="uppercase_tags",
-                    )
-                else:
-                    check_error(
-                        wxr,
-                        dt,
-                        word,
-                        lang,
-                        pos,
-                        f"invalid tag {tag} not in valid_tags "
-                        "or uppercase_tags",
-                    )
+        if tag_set is not None and tag not in tag_set:
+            if len(tag) > 0 and tag[0].isupper():
+                check_error(
+                    wxr,
+                    dt,
+                    word,
+                    lang,
+                    pos,
+                    f"invalid uppercase tag {tag} not in or uppercase_tags",
+                    called_from="uppercase_tags",
+                )
+            else:
+                check_error(
+                    wxr,
+                    dt,
+                    word,
+                    lang,
+                    pos,
+                    f"invalid tag {tag} not in valid_tags or uppercase_tags",
+                )
+
+
+@cache
+def extractor_data_model(lang_code: str) -> type | None:
+    """Returns the pydantic model of the data extracted by the extractor of
+    ``lang_code``, or None if the extractor does not use models."""
+    models = import_extractor_module(lang_code, "models")
+    return getattr(models, "WordEntry", None) if models is not None else None
+
+
+def check_model_data(wxr: WiktextractContext, dt: dict, model: type) -> None:
+    """Validates the data extracted with pydantic models against the
+    WordEntry ``model``.  The values assigned to the fields of the models
+    are not validated while parsing, see extractor/base_model.py."""
+    from pydantic import ValidationError
+
+    if "redirect" in dt:
+        return  # hard redirects are created by page_handler()
+    try:
+        model.model_validate(dt)  # type: ignore[attr-defined]
+    except ValidationError as e:
+        check_error(
+            wxr,
+            dt,
+            dt.get("word"),
+            dt.get("lang"),
+            dt.get("pos"),
+            "invalid data: "
+            + "; ".join(
+                f"{'.'.join(map(str, err['loc']))}: {err['msg']}"
+                for err in e.errors()
+            ),
+        )
 
 
 def check_str_fields(
@@ -747,8 +970,44 @@ def reprocess_wiktionary(
     out_f: TextIO,
     human_readable: bool = False,
     search_pattern: str | None = None,
+    batch_size: int = PAGE_BATCH_SIZE,
+    page_timeout: float = 0,
+    checkpoint_path: str | Path | None = None,
+    resume: bool = False,
+    previous_db_path: str | Path | None = None,
+    previous_output_path: str | Path | None = None,
+    shard_index: int = 0,
+    shard_count: int = 1,
+    validate_sample: int = 1,
+    result_cache_path: str | Path | None = None,
 ) -> None:
-    """Reprocesses the Wiktionary from the sqlite db."""
+    """Reprocesses the Wiktionary from the sqlite db.  Pages are sent to the
+    worker processes in batches of about ``batch_size`` characters of page
+    text, see ``batch_pages()``.  Pages that take longer than
+    ``page_timeout`` seconds (if greater than zero) are aborted.
+
+    If ``checkpoint_path`` is given, the titles of the pages written to
+    ``out_f`` are recorded in that journal file.  With ``resume``, the pages
+    in the journal are skipped and ``out_f``, which must be opened in "r+"
+    mode, is truncated to the last checkpoint and appended to.
+
+    If ``previous_db_path`` and ``previous_output_path`` are given, only the
+    pages that have changed since that database was created are processed
+    and the data of the other pages is copied from the previous JSON Lines
+    output file, see incremental.py.  This can't be combined with
+    ``resume``.
+
+    If ``shard_count`` is greater than one, only the pages of shard
+    ``shard_index`` are processed and the words that only occur in the
+    thesaurus are left for ``merge_shards()``, see shards.py.
+
+    The extracted data is checked with ``check_json_data()`` in the worker
+    processes; ``validate_sample`` is 1 to check the data of all pages, N to
+    check one page in N or 0 to skip the checks.
+
+    With ``result_cache_path``, the worker processes look up the results of
+    functions like ``decode_tags()`` in that file, and the results they
+    compute are added to it at the end, see result_cache.py."""
     logger.info("Second phase - processing pages")
 
     # Extract thesaurus data. This iterates over thesaurus pages,
@@ -757,9 +1016,37 @@ def reprocess_wiktionary(
         wxr.config.extract_thesaurus_pages
         and thesaurus_linkage_number(wxr.thesaurus_db_conn) == 0  # type: ignore[arg-type]
     ):
-        extract_thesaurus_data(wxr, num_processes)
+        if shard_count > 1:
+            # The shards would all write the shared thesaurus database
+            raise RuntimeError(
+                "The thesaurus data must be extracted before processing "
+                "the pages in shards, see README.md"
+            )
+        extract_thesaurus_data(wxr, num_processes, page_timeout)
+    elif (
+        wxr.config.extract_thesaurus_pages
+        and wxr.thesaurus_index is None
+        and shard_count == 1
+    ):
+        # Thesaurus database created by an older version
+        build_thesaurus_index(wxr)
+    if wxr.title_index is None:
+        # Shards don't write next to the shared database
+        wxr.title_index = open_or_build_title_index(
+            wxr.wtp, build=shard_count == 1
+        )
 
     emitted = set()
+    checkpoint = None
+    done_titles: set[str] = set()
+    if checkpoint_path is not None:
+        checkpoint = Checkpoint(checkpoint_path)
+        if resume:
+            done_titles = checkpoint.resume(out_f)
+            emitted = read_emitted_words(out_f, wxr.thesaurus_index)
+            logger.info(f"Resuming: skipping {len(done_titles)} done pages")
+        else:
+            checkpoint.remove()
     process_ns_ids: list[int] = list(
         {
             wxr.wtp.NAMESPACE_DATA.get(ns, {}).get("id", 0)  # type: ignore[call-overload]
@@ -770,32 +1057,89 @@ def reprocess_wiktionary(
     last_time = start_time
     all_page_nums = wxr.wtp.saved_page_nums(
         process_ns_ids, True, "wikitext", search_pattern
+    ) - len(done_titles)
+    pages = wxr.wtp.get_all_pages(
+        process_ns_ids, True, "wikitext", search_pattern
     )
+    if len(done_titles) > 0:
+        pages = (page for page in pages if page.title not in done_titles)
+    if shard_count > 1:
+        pages = filter_shard_pages(pages, shard_index, shard_count)
+        all_page_nums //= shard_count
+    if previous_db_path is not None and previous_output_path is not None:
+        assert not resume
+        reparse_titles = find_reparse_titles(
+            wxr, previous_db_path, process_ns_ids
+        )
+        emitted = copy_unchanged_data(
+            previous_output_path,
+            reparse_titles,
+            out_f,
+            shard_index,
+            shard_count,
+            wxr.thesaurus_index,
+        )
+        all_page_nums = min(all_page_nums, len(reparse_titles))
+        logger.info(f"Processing {len(reparse_titles)} changed pages")
+        pages = (page for page in pages if page.title in reparse_titles)
+    processed_pages = 0
+    cache_stats: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+    result_cache_collector = ResultCacheCollector(result_cache_path)
+    num_workers = num_processes or os.cpu_count() or 1
+    watchdog = PageWatchdog(num_workers, page_timeout)
+    if validate_sample > 0:
+        # Load the tag sets before forking the worker processes
+        valid_tag_set()
     wxr.remove_unpicklable_objects()
-    with Pool(num_processes, init_worker_process, (page_handler, wxr)) as pool:
+    with Pool(
+        num_processes,
+        init_worker_process,
+        (page_handler, wxr, watchdog, result_cache_path),
+    ) as pool:
         wxr.reconnect_databases(False)
-        for processed_pages, (page_data, wtp_stats) in enumerate(
-            pool.imap_unordered(
-                page_handler,
-                wxr.wtp.get_all_pages(
-                    process_ns_ids, True, "wikitext", search_pattern
-                ),
-            )
+        watchdog.start()
+        for (
+            batch_data,
+            wtp_stats,
+            batch_cache_stats,
+            result_cache_updates,
+        ) in pool.imap_unordered(
+            partial(
+                page_batch_handler,
+                human_readable=human_readable,
+                validate_sample=validate_sample,
+            ),
+            batch_pages(pages, all_page_nums, num_workers, batch_size),
         ):
             wxr.config.merge_return(wtp_stats)
-            for dt in page_data:
-                check_json_data(wxr, dt)
-                write_json_data(dt, out_f, human_readable)
-                word = dt.get("word")
-                lang_code = dt.get("lang_code")
-                pos = dt.get("pos")
-                if word and lang_code and pos:
-                    emitted.add((word, lang_code, pos))
-            last_time = estimate_progress(
-                processed_pages, all_page_nums, start_time, last_time
-            )
-    if wxr.config.dump_file_lang_code == "en":
+            for name, (hits, misses) in batch_cache_stats.items():
+                cache_stats[name][0] += hits
+                cache_stats[name][1] += misses
+            result_cache_collector.add(result_cache_updates)
+            for page_title, page_text, page_words in batch_data:
+                out_f.write(page_text)
+                emitted.update(page_words)
+                last_time = estimate_progress(
+                    processed_pages, all_page_nums, start_time, last_time
+                )
+                processed_pages += 1
+                if checkpoint is not None:
+                    checkpoint.add(page_title)
+            if checkpoint is not None:
+                checkpoint.save(out_f)
+        watchdog.stop()
+    if checkpoint is not None:
+        checkpoint.save(out_f, force=True)
+    if wxr.config.dump_file_lang_code == "en" and shard_count == 1:
         emit_words_in_thesaurus(wxr, emitted, out_f, human_readable)
+    for name, (hits, misses) in sorted(cache_stats.items()):
+        if hits + misses > 0:
+            logger.info(
+                f"{name}() cache: {hits} hits, {misses} misses "
+                f"({hits / (hits + misses):.1%} hit rate)"
+            )
+    result_cache_collector.log_stats()
+    result_cache_collector.close()
     logger.info("Reprocessing wiktionary complete")
 
 
@@ -14,6 +14,7 @@ import json
 import logging
 import os
 import pstats
+import subprocess
 import sys
 from importlib.resources import files
 from pathlib import Path
@@ -25,16 +26,25 @@ from wikitextprocessor.dumpparser import analyze_and_overwrite_pages
 
 from .categories import extract_categories
 from .config import WiktionaryConfig
+from .output import OUTPUT_FORMATS, OutputFile, parse_size
+from .result_cache import open_result_cache
+from .shards import merge_error_files, merge_shards
 from .template_override import template_override_fns
 from .thesaurus import (
     close_thesaurus_db,
     extract_thesaurus_data,
     thesaurus_linkage_number,
 )
+from .title_index import (
+    open_or_build_title_index,
+    remove_temp_title_index,
+)
 from .wiktionary import (
+    PAGE_BATCH_SIZE,
     check_json_data,
     extract_namespace,
     parse_page,
+    parse_validate,
     parse_wiktionary,
     reprocess_wiktionary,
     write_json_data,
@@ -77,10 +87,14 @@ def process_single_page(
         and thesaurus_linkage_number(wxr.thesaurus_db_conn) == 0  # type: ignore[arg-type]
     ):
         extract_thesaurus_data(wxr)
+    if args.use_thesaurus and args.db_path and wxr.title_index is None:
+        # Also prepares the database for shards, see README.md
+        wxr.title_index = open_or_build_title_index(wxr.wtp)
     # Parse the page
     ret = parse_page(wxr, title, text)
     for data in ret:
-        check_json_data(wxr, data)
+        if args.validate > 0:
+            check_json_data(wxr, data)
         write_json_data(data, out_f, human_readable)
 
 
@@ -226,6 +240,103 @@ def main():
         default=None,
         help="Number of parallel processes (default: #cpus)",
     )
+    parser.add_argument(
+        "--page-batch-size",
+        type=int,
+        default=PAGE_BATCH_SIZE,
+        help="Send pages to the worker processes in batches of about this "
+        "many characters of page text (0 sends one page at a time, default: "
+        "%(default)s)",
+    )
+    parser.add_argument(
+        "--page-timeout",
+        type=float,
+        default=0,
+        help="Abort processing a page after this many seconds and continue "
+        "with the next page (default: no timeout)",
+    )
+    parser.add_argument(
+        "--validate",
+        type=parse_validate,
+        default="full",
+        metavar="off|sample:N|full",
+        help="Check the extracted data of no pages, one page in N or all "
+        "pages and report problems as debug messages (default: full)",
+    )
+    parser.add_argument(
+        "--result-cache",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Look up the results of decode_tags() and classify_desc() in "
+        "this file and add the results computed in this run to it",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        default=False,
+        help="Continue an interrupted extraction: skip the pages recorded "
+        "in the checkpoint file next to the --out file and append to the "
+        "partial output",
+    )
+    parser.add_argument(
+        "--previous-db-path",
+        type=str,
+        default=None,
+        help="Database file of a previous extraction; with --previous-out, "
+        "only the pages that have changed since then are processed",
+    )
+    parser.add_argument(
+        "--previous-out",
+        type=str,
+        default=None,
+        help="JSON Lines output file of the previous extraction made with "
+        "--previous-db-path; data of unchanged pages is copied from it",
+    )
+    parser.add_argument(
+        "--shard-count",
+        type=int,
+        default=1,
+        help="Split the pages into this many shards by title hash and only "
+        "process the shard given with --shard-index; merge the shard output "
+        "files with --merge-shards",
+    )
+    parser.add_argument(
+        "--shard-index",
+        type=int,
+        default=0,
+        help="Index of the shard to process, from 0 to --shard-count - 1",
+    )
+    parser.add_argument(
+        "--merge-shards",
+        type=str,
+        nargs="+",
+        default=None,
+        help="Merge these JSON Lines shard output files into the --out file "
+        "and add the words that only occur in the thesaurus of the "
+        "--db-path database",
+    )
+    parser.add_argument(
+        "--merge-errors",
+        type=str,
+        nargs="+",
+        default=None,
+        help="Merge these --errors files of the shards into the --errors file",
+    )
+    parser.add_argument(
+        "--out-format",
+        choices=OUTPUT_FORMATS,
+        default="jsonl",
+        help="Format of the --out file: JSON Lines, optionally compressed "
+        "with gzip or zstd (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=parse_size,
+        default=0,
+        help="Split the --out file into numbered files of about this size, "
+        "e.g. 1GB (default: no splitting)",
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -256,6 +367,13 @@ def main():
         default=False,
         help="Enable CPU time profiling",
     )
+    parser.add_argument(
+        "--startup-profile",
+        action="store_true",
+        default=False,
+        help="Print the import time and memory of the modules to stderr, "
+        "e.g. with --page to find the start-up cost of single page runs",
+    )
     parser.add_argument(
         "--categories-file",
         type=str,
@@ -301,6 +419,22 @@ def main():
     )
     args = parser.parse_args()
 
+    if args.startup_profile:
+        from . import startup_profile
+
+        if startup_profile.active_profiler is None:
+            # The modules have already been imported in this process
+            sys.exit(
+                subprocess.run(
+                    [
+                        sys.executable,
+                        "-c",
+                        startup_profile.STARTUP_PROFILE_COMMAND,
+                        *sys.argv[1:],
+                    ]
+                ).returncode
+            )
+
     if not args.quiet:
         logger.setLevel(logging.DEBUG)
 
@@ -355,14 +489,62 @@ def main():
 
     # Open output file.
     out_path = args.out
+    checkpoint_path = None
+    if args.resume and (
+        not out_path
+        or out_path == "-"
+        or out_path.startswith("/dev/")
+        or args.human_readable
+        or args.page
+    ):
+        print(
+            "--resume needs a JSON Lines --out file and can't be used with "
+            "--human-readable or --page."
+        )
+        sys.exit(1)
+    if not 0 <= args.shard_index < args.shard_count:
+        print("--shard-index must be between 0 and --shard-count - 1.")
+        sys.exit(1)
+    if (args.previous_db_path is None) != (args.previous_out is None) or (
+        args.previous_db_path is not None
+        and (args.resume or args.human_readable)
+    ):
+        print(
+            "--previous-db-path and --previous-out must be used together "
+            "and can't be used with --resume or --human-readable."
+        )
+        sys.exit(1)
+    use_output_file = args.out_format != "jsonl" or args.shard_size > 0
+    if use_output_file and (
+        not out_path
+        or out_path == "-"
+        or out_path.startswith("/dev/")
+        or args.resume
+    ):
+        print(
+            "--out-format and --shard-size need an --out file and can't be "
+            "used with --resume."
+        )
+        sys.exit(1)
     if not out_path and args.pages_dir:
         out_f = None
+    elif use_output_file:
+        # OutputFile renames its temporary files itself
+        out_tmp_path = out_path
+        out_f = OutputFile(out_path, args.out_format, args.shard_size)
     elif out_path and out_path != "-":
         if out_path.startswith("/dev/"):
             out_tmp_path = out_path
         else:
             out_tmp_path = out_path + ".tmp"
-        out_f = open(out_tmp_path, "w", buffering=1024 * 1024, encoding="utf-8")
+            checkpoint_path = out_path + ".checkpoint"
+        if args.resume and Path(out_tmp_path).exists():
+            out_mode = "r+"
+        else:
+            out_mode = "w"
+        out_f = open(
+            out_tmp_path, out_mode, buffering=1024 * 1024, encoding="utf-8"
+        )
     else:
         out_tmp_path = out_path
         out_f = sys.stdout
@@ -445,6 +627,16 @@ def main():
                 args.override,
                 skip_extract_dump,
                 args.pages_dir,
+                batch_size=args.page_batch_size,
+                page_timeout=args.page_timeout,
+                checkpoint_path=checkpoint_path,
+                resume=args.resume,
+                previous_db_path=args.previous_db_path,
+                previous_output_path=args.previous_out,
+                shard_index=args.shard_index,
+                shard_count=args.shard_count,
+                validate_sample=args.validate,
+                result_cache_path=args.result_cache,
             )
 
         if args.override is not None and args.path is None:
@@ -463,6 +655,8 @@ def main():
                     "otherwise processing will be very slow."
                 )
 
+            # Use the saved results, but don't add to them
+            open_result_cache(args.result_cache, collect=False)
             for title_or_path in args.page:
                 process_single_page(
                     title_or_path, args, wxr, out_f, args.human_readable
@@ -472,7 +666,9 @@ def main():
             # --errors with single page extraction
             wxr.config.merge_return(wxr.wtp.to_return())
 
-        if not args.path and not args.page and not args.skip_extraction:
+        if args.merge_shards:
+            merge_shards(wxr, args.merge_shards, out_f, args.human_readable)
+        elif not args.path and not args.page and not args.skip_extraction:
             # Parse again from the db file
             reprocess_wiktionary(
                 wxr,
@@ -480,11 +676,27 @@ def main():
                 out_f,
                 args.human_readable,
                 search_pattern=args.search_pattern,
+                batch_size=args.page_batch_size,
+                page_timeout=args.page_timeout,
+                checkpoint_path=checkpoint_path,
+                resume=args.resume,
+                previous_db_path=args.previous_db_path,
+                previous_output_path=args.previous_out,
+                shard_index=args.shard_index,
+                shard_count=args.shard_count,
+                validate_sample=args.validate,
+                result_cache_path=args.result_cache,
             )
 
-    finally:
-        if out_path and out_path != "-" and out_f is not None:
+    except BaseException:
+        if isinstance(out_f, OutputFile):
+            # Don't rename the incomplete output file
+            out_f.abort()
+        elif out_path and out_path != "-" and out_f is not None:
             out_f.close()
+        raise
+    if out_path and out_path != "-" and out_f is not None:
+        out_f.close()
 
     if args.modules_file:
         extract_namespace(wxr, "Module", args.modules_file)
@@ -497,6 +709,7 @@ def main():
             json.dump(tree, f, indent=2, sort_keys=True)
 
     wxr.wtp.close_db_conn()
+    remove_temp_title_index(wxr.wtp.db_path)
     if wxr.config.extract_thesaurus_pages:
         close_thesaurus_db(wxr.thesaurus_db_path, wxr.thesaurus_db_conn)
 
@@ -511,8 +724,15 @@ def main():
         except FileNotFoundError:
             pass
         os.rename(out_tmp_path, out_path)
+        if checkpoint_path is not None:
+            Path(checkpoint_path).unlink(missing_ok=True)
 
     if args.errors:
+        if args.merge_errors:
+            merged = merge_error_files(args.merge_errors)
+            wxr.config.errors.extend(merged["errors"])
+            wxr.config.warnings.extend(merged["warnings"])
+            wxr.config.debugs.extend(merged["debugs"])
         with open(args.errors, "w", encoding="utf-8") as f:
             json.dump(
                 {
@@ -4,6 +4,7 @@ import sqlite3
 from wikitextprocessor import Wtp
 
 from .config import WiktionaryConfig
+from .title_index import open_title_index
 
 
 class WiktextractContext:
@@ -15,10 +16,14 @@ class WiktextractContext:
         "pos",
         "thesaurus_db_path",
         "thesaurus_db_conn",
+        "thesaurus_index",
+        "title_index",
+        "ns_patterns",
     )
 
     def __init__(self, wtp: Wtp, config: WiktionaryConfig):
-        from .thesaurus import init_thesaurus_db
+        from .namespaces import NamespacePatterns
+        from .thesaurus import init_thesaurus_db, open_thesaurus_index
 
         self.config = config
         self.wtp = wtp
@@ -33,18 +38,33 @@ class WiktextractContext:
             if config.extract_thesaurus_pages
             else None
         )
+        # Keys of the thesaurus entries, see thesaurus.py
+        self.thesaurus_index = (
+            open_thesaurus_index(self.thesaurus_db_path)
+            if config.extract_thesaurus_pages
+            else None
+        )
+        # Hashes of the page titles, built by reprocess_wiktionary(), see
+        # title_index.py
+        self.title_index = None
+        # Namespace names and patterns of the edition, see namespaces.py
+        self.ns_patterns = NamespacePatterns(wtp)
 
     def reconnect_databases(self, check_same_thread: bool = True) -> None:
         # `multiprocessing.pool.Pool.imap()` runs in another thread, if the db
         # connection is used to create iterable data for `imap`,
         # `check_same_thread` must be `False`.
         if self.config.extract_thesaurus_pages:
+            from .thesaurus import open_thesaurus_index
+
             self.thesaurus_db_conn = sqlite3.connect(
                 self.thesaurus_db_path, check_same_thread=check_same_thread
             )
+            self.thesaurus_index = open_thesaurus_index(self.thesaurus_db_path)
         self.wtp.db_conn = sqlite3.connect(
             self.wtp.db_path, check_same_thread=check_same_thread  # type: ignore[arg-type]
         )
+        self.title_index = open_title_index(self.wtp.db_path)
 
     def remove_unpicklable_objects(self) -> None:
         # remove these variables before passing the `WiktextractContext` object
@@ -52,9 +72,22 @@ class WiktextractContext:
         if self.config.extract_thesaurus_pages:
             self.thesaurus_db_conn.close()  # type: ignore[union-attr]
         self.thesaurus_db_conn = None
+        if self.thesaurus_index is not None:
+            self.thesaurus_index.close()
+        self.thesaurus_index = None
+        if self.title_index is not None:
+            self.title_index.close()
+        self.title_index = None
         self.wtp.db_conn.close()
         self.wtp.db_conn = None  # type: ignore[assignment]
         self.wtp.lua = None
         self.wtp.lua_invoke = None
         self.wtp.lua_reset_env = None
         self.wtp.lua_clear_loaddata_cache = None
+
+    def page_exists(self, title: str) -> bool:
+        """Same as ``self.wtp.page_exists(title)``, but titles that are not in
+        the title index are rejected without querying the database."""
+        if self.title_index is not None and title not in self.title_index:
+            return False
+        return self.wtp.page_exists(title)
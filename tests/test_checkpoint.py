@@ -0,0 +1,70 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from wiktextract.checkpoint import Checkpoint, read_emitted_words
+
+
+class TestCheckpoint(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.out_path = Path(self.tmp_dir.name) / "out.jsonl"
+        self.checkpoint = Checkpoint(Path(self.tmp_dir.name) / "checkpoint")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def write_record(self, out_f, word: str) -> None:
+        out_f.write(
+            json.dumps({"word": word, "lang_code": "en", "pos": "noun"}) + "\n"
+        )
+
+    def test_resume(self):
+        with self.out_path.open("w", encoding="utf-8") as out_f:
+            self.write_record(out_f, "foo")
+            self.checkpoint.add("foo")
+            self.write_record(out_f, "bar")
+            self.checkpoint.add("bar")
+            self.checkpoint.save(out_f, force=True)
+            # data written after the last checkpoint is discarded
+            self.write_record(out_f, "baz")
+            self.checkpoint.add("baz")
+        with self.out_path.open("r+", encoding="utf-8") as out_f:
+            self.assertEqual(self.checkpoint.resume(out_f), {"foo", "bar"})
+            self.assertEqual(
+                read_emitted_words(out_f),
+                {("foo", "en", "noun"), ("bar", "en", "noun")},
+            )
+            self.write_record(out_f, "baz")
+        with self.out_path.open(encoding="utf-8") as f:
+            self.assertEqual(
+                [json.loads(line)["word"] for line in f],
+                ["foo", "bar", "baz"],
+            )
+
+    def test_missing_output_file(self):
+        with self.out_path.open("w", encoding="utf-8") as out_f:
+            self.write_record(out_f, "foo")
+            self.checkpoint.add("foo")
+            self.checkpoint.save(out_f, force=True)
+        self.out_path.unlink()
+        # wiktwords creates the output file again if it doesn't exist
+        with self.out_path.open("w", encoding="utf-8") as out_f:
+            with self.assertLogs("wiktextract", "WARNING"):
+                self.assertEqual(self.checkpoint.resume(out_f), set())
+            self.assertEqual(out_f.tell(), 0)
+            self.write_record(out_f, "foo")
+        self.assertEqual(self.checkpoint.load(), (set(), 0))
+        with self.out_path.open(encoding="utf-8") as f:
+            self.assertEqual([json.loads(line)["word"] for line in f], ["foo"])
+
+    def test_incomplete_journal(self):
+        self.checkpoint.path.write_text("foo\n\t10\nbar\n\t2", encoding="utf-8")
+        self.assertEqual(self.checkpoint.load(), ({"foo"}, 10))
+
+    def test_save_interval(self):
+        with self.out_path.open("w", encoding="utf-8") as out_f:
+            self.checkpoint.add("foo")
+            self.checkpoint.save(out_f)
+        self.assertFalse(self.checkpoint.path.exists())
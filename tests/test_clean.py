@@ -396,3 +396,75 @@ class CleanTests(unittest.TestCase):
             clean_value(self.wxr, '<span class="a<nowiki/> b">text</span>'),
             "text",
         )
+
+    def test_edition_namespace_links(self):
+        wxr = WiktextractContext(
+            Wtp(lang_code="fr"), WiktionaryConfig(dump_file_lang_code="fr")
+        )
+        try:
+            self.assertEqual(
+                clean_value(
+                    wxr,
+                    "chien[[Catégorie:Noms communs en français]]"
+                    "[[Fichier:Chien.jpg|vignette|Un chien]]",
+                ),
+                "chien",
+            )
+        finally:
+            wxr.wtp.close_db_conn()
+            close_thesaurus_db(
+                wxr.thesaurus_db_path,
+                wxr.thesaurus_db_conn,  # type:ignore[arg-type]
+            )
+
+    def test_clean_node_cache(self):
+        from wiktextract.page import clean_node, clean_node_cache
+
+        self.wxr.wtp.start_page("")
+        tree = self.wxr.wtp.parse(
+            "[[clean node cache|cache]] [[Category:Clean node cache]]"
+        )
+        hits = clean_node_cache.hits
+        for _ in range(2):
+            data = {}
+            self.assertEqual(
+                clean_node(self.wxr, data, tree.children, collect_links=True),
+                "cache",
+            )
+            self.assertEqual(
+                data,
+                {
+                    "links": [("cache", "clean node cache")],
+                    "categories": ["Clean node cache"],
+                },
+            )
+        self.assertEqual(clean_node_cache.hits, hits + 1)
+
+    def test_clean_node_cache_messages(self):
+        from unittest.mock import patch
+
+        from wiktextract.page import clean_node
+
+        def node_to_html(node, **kwargs):
+            self.wxr.wtp.warning("clean node warning", sortid="test")
+            return "warning"
+
+        # Results that emitted messages are not cached: the messages are
+        # reported on every page
+        for title in ("foo", "bar"):
+            self.wxr.wtp.start_page(title)
+            tree = self.wxr.wtp.parse("clean node cache messages")
+            with patch.object(self.wxr.wtp, "node_to_html", node_to_html):
+                self.assertEqual(
+                    clean_node(self.wxr, None, tree.children), "warning"
+                )
+            self.assertEqual(len(self.wxr.wtp.warnings), 1)
+
+    def test_clean_node_cache_templates(self):
+        from wiktextract.page import clean_node
+
+        # Results depend on the page and are not cached
+        for title in ("foo", "bar"):
+            self.wxr.wtp.start_page(title)
+            tree = self.wxr.wtp.parse("{{PAGENAME}}")
+            self.assertEqual(clean_node(self.wxr, None, tree.children), title)
@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from wiktextract.disk_cache import load_or_build, source_hash
+
+
+class DiskCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        patcher = patch.dict(
+            os.environ, {"WIKTEXTRACT_CACHE_DIR": self.temp_dir.name}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.temp_dir.cleanup)
+        self.num_builds = 0
+
+    def build(self) -> dict[str, list[int]]:
+        self.num_builds += 1
+        return {"data": [1, 2, 3]}
+
+    def test_load_or_build(self):
+        for _ in range(2):
+            self.assertEqual(
+                load_or_build("test", "key1", self.build), {"data": [1, 2, 3]}
+            )
+        self.assertEqual(self.num_builds, 1)
+        self.assertEqual(os.listdir(self.temp_dir.name), ["test-key1.pickle"])
+        # Data of a changed source is built again and replaces the old file
+        load_or_build("test", "key2", self.build)
+        self.assertEqual(self.num_builds, 2)
+        self.assertEqual(os.listdir(self.temp_dir.name), ["test-key2.pickle"])
+
+    def test_unreadable_file(self):
+        with open(
+            os.path.join(self.temp_dir.name, "test-key.pickle"), "w"
+        ) as f:
+            f.write("not a pickle")
+        self.assertEqual(
+            load_or_build("test", "key", self.build), {"data": [1, 2, 3]}
+        )
+        self.assertEqual(load_or_build("test", "key", self.build)["data"][0], 1)
+        self.assertEqual(self.num_builds, 1)
+
+    def test_source_hash(self):
+        path = os.path.join(self.temp_dir.name, "source.py")
+        with open(path, "w") as f:
+            f.write("a = 1\n")
+        first_hash = source_hash([path])
+        self.assertEqual(source_hash([path]), first_hash)
+        with open(path, "w") as f:
+            f.write("a = 2\n")
+        self.assertNotEqual(source_hash([path]), first_hash)
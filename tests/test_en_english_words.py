@@ -0,0 +1,27 @@
+import subprocess
+import sys
+import unittest
+
+from wiktextract.extractor.en.english_words import BROWN_WORDS_PATH
+
+
+class EnglishWordsTests(unittest.TestCase):
+    def test_brown_words_file(self):
+        self.assertTrue(BROWN_WORDS_PATH.is_file())
+
+    def test_no_nltk_import(self):
+        # Run in a new process: other tests may have imported nltk
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys\n"
+                "from wiktextract.extractor.en.english_words import "
+                "english_words\n"
+                "assert 'run' in english_words\n"
+                "assert 'nltk' not in sys.modules, 'nltk imported'\n",
+            ],
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
@@ -8,7 +8,10 @@ import unittest
 from wikitextprocessor import Wtp
 
 from wiktextract.config import WiktionaryConfig
-from wiktextract.extractor.en.inflection import parse_inflection_section
+from wiktextract.extractor.en.inflection import (
+    expand_header_cache,
+    parse_inflection_section,
+)
 from wiktextract.thesaurus import close_thesaurus_db
 from wiktextract.wxr_context import WiktextractContext
 
@@ -3445,3 +3448,41 @@ class InflTests(unittest.TestCase):
           ],
         }
         self.assertEqual(expected, ret)
+
+    def test_expand_header_cache(self):
+        # The same table parsed with and without cached header tagsets
+        table = """
+{| class="inflection-table"
+|-
+! colspan="2" | infinitive
+| colspan="4" | [[fahren]]
+|-
+! rowspan="2" |
+! colspan="2" | present
+! colspan="2" | preterite
+|-
+! singular
+! plural
+! singular
+! plural
+|-
+! indicative
+| [[fahre]]
+| [[fahren]]
+| [[fuhr]]
+| [[fuhren]]
+|-
+! subjunctive
+| [[fahre]]
+| [[fahren]]
+| [[führe]]
+| [[führen]]
+|}
+"""
+        expand_header_cache.data.clear()
+        ret1 = self.xinfl("fahren", "German", "verb", "Conjugation", table)
+        hits = expand_header_cache.hits
+        ret2 = self.xinfl("fahren", "German", "verb", "Conjugation", table)
+        self.assertGreater(expand_header_cache.hits, hits)
+        self.assertTrue(ret1.get("forms"))
+        self.assertEqual(ret1, ret2)
@@ -0,0 +1,59 @@
+import unittest
+
+from wiktextract.extractor.en.lang_specific_configs import (
+    compiled_form_transformations,
+    get_lang_conf,
+    lang_specific_tags,
+)
+
+
+class LangSpecificConfigsTests(unittest.TestCase):
+    def test_get_lang_conf(self):
+        self.assertIs(
+            get_lang_conf("Alemannic German", "form_transformations"),
+            get_lang_conf("German", "form_transformations"),
+        )
+        self.assertIs(
+            get_lang_conf("Finnish", "form_transformations"),
+            get_lang_conf("default", "form_transformations"),
+        )
+        with self.assertRaises(RuntimeError):
+            get_lang_conf("German", "no_such_field")
+
+    def test_lang_specific_tags(self):
+        self.assertEqual(
+            lang_specific_tags("German", "verb", "ich habe"),
+            ("habe", ["first-person", "singular"]),
+        )
+        self.assertEqual(
+            lang_specific_tags("German", "verb", "hab (du)"),
+            ("hab", ["second-person", "singular"]),
+        )
+        self.assertEqual(
+            lang_specific_tags("German", "noun", "ich habe"),
+            ("ich habe", []),
+        )
+        self.assertEqual(
+            lang_specific_tags("Finnish", "verb", "ich habe"),
+            ("ich habe", []),
+        )
+        # The first rule that matches anywhere wins, not the leftmost match
+        self.assertEqual(
+            lang_specific_tags("English", "verb", "give us (thou)"),
+            ("give us", ["second-person", "singular"]),
+        )
+
+    def test_compiled_form_transformations(self):
+        regex, rules = compiled_form_transformations("German", "verb")
+        self.assertEqual(
+            len(rules),
+            sum(
+                rule[0] == "verb"
+                for rule in get_lang_conf("German", "form_transformations")
+            ),
+        )
+        m = regex.match("wir haben")
+        self.assertEqual(rules[m.lastindex], ("", ("first-person", "plural")))
+        self.assertEqual(
+            compiled_form_transformations("Finnish", "verb"), (None, {})
+        )
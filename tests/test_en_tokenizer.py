@@ -0,0 +1,65 @@
+# Differential tests of the classify_desc() tokenizer against nltk's
+# TweetTokenizer
+
+import random
+import unittest
+
+from wiktextract.extractor.en.tokenizer import (
+    FAST_TOKENIZE_UNSAFE_RE,
+    get_tweet_tokenizer,
+    tokenize,
+)
+
+DESCRIPTIONS = [
+    "to eat",
+    "masculine plural",
+    "(archaic) a male dog, as opposed to a bitch",
+    "someone's best friend",
+    "'tis the season, the dogs' bowls",
+    "well-known, long-established",
+    "literally, “to hang one's head”",
+    "e.g. in compounds",
+    "Mrs. Smith's dog...",
+    "see also . . . and more",
+    "used in the 19th century",
+    "between 1,000 and 2.5 million, 3-4 years",
+    "wow!!!! really????",
+    "AM or PM",
+    "abbreviation of ante meridiem",
+    "cf. example.com",
+    "call 555-123-4567",
+    "like this :) or 8)",
+    "8O)",
+    "ʹ‘quoted’ — more … €5",
+]
+
+
+class TokenizerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tweet_tokenizer = get_tweet_tokenizer()
+
+    def assert_same_tokens(self, text: str) -> None:
+        self.assertEqual(
+            tokenize(text), self.tweet_tokenizer.tokenize(text), repr(text)
+        )
+
+    def test_descriptions(self):
+        for text in DESCRIPTIONS:
+            self.assert_same_tokens(text)
+        self.assertIsNone(FAST_TOKENIZE_UNSAFE_RE.search(DESCRIPTIONS[0]))
+        self.assertIsNotNone(FAST_TOKENIZE_UNSAFE_RE.search("cf. example.com"))
+
+    def test_random_text(self):
+        rnd = random.Random(0)
+        words = ["dog", "don't", "well-known", "e.g.", "a.m.", "...", "'tis"]
+        chars = list("aAdDpPoOx8019 ,.'\"!?()-+―—“”…‘’ʹ€:;@#/&<>_")
+        for _ in range(20000):
+            if rnd.random() < 0.5:
+                text = " ".join(
+                    rnd.choice(words) for _ in range(rnd.randint(1, 6))
+                )
+            else:
+                text = "".join(
+                    rnd.choice(chars) for _ in range(rnd.randint(1, 16))
+                )
+            self.assert_same_tokens(text)
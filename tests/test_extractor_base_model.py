@@ -0,0 +1,57 @@
+import unittest
+from unittest.mock import Mock
+
+from wiktextract.extractor.fr.models import Example, Sense, WordEntry
+from wiktextract.wiktionary import check_model_data, extractor_data_model
+
+
+class ExtractorBaseModelTests(unittest.TestCase):
+    def test_assignment_copies_lists(self):
+        tags = ["a"]
+        sense = Sense()
+        sense.tags = tags
+        tags.append("b")
+        self.assertEqual(sense.tags, ["a"])
+        example = Example(text="x")
+        sense.examples = [example]
+        self.assertIs(sense.examples[0], example)
+
+    def test_deep_copy(self):
+        data = WordEntry(word="chat", lang_code="fr", lang="Français")
+        data.categories.append("Noms communs en français")
+        data.senses.append(
+            Sense(glosses=["Animal"], examples=[Example(text="Le chat.")])
+        )
+        copy = data.model_copy(deep=True)
+        self.assertEqual(copy, data)
+        self.assertEqual(
+            copy.model_dump(exclude_defaults=True),
+            data.model_dump(exclude_defaults=True),
+        )
+        copy.senses[0].examples[0].text = "Un chat."
+        copy.senses[0].tags.append("familier")
+        copy.categories.clear()
+        self.assertEqual(data.senses[0].examples[0].text, "Le chat.")
+        self.assertEqual(data.senses[0].tags, [])
+        self.assertEqual(data.categories, ["Noms communs en français"])
+
+    def test_check_model_data(self):
+        model = extractor_data_model("fr")
+        self.assertIs(model, WordEntry)
+        self.assertIsNone(extractor_data_model("en"))
+        wxr = Mock()
+        wxr.config.debugs = []
+        data = WordEntry(word="chat", lang_code="fr", lang="Français")
+        check_model_data(wxr, data.model_dump(exclude_defaults=True), model)
+        self.assertEqual(wxr.config.debugs, [])
+        # Not validated when assigned
+        data.senses = [Sense(glosses=["Animal"])]
+        data.senses[0].glosses = "Animal"
+        with self.assertWarns(UserWarning):  # serializer warning
+            dt = data.model_dump(exclude_defaults=True)
+        check_model_data(wxr, dt, model)
+        self.assertEqual(len(wxr.config.debugs), 1)
+        self.assertIn(
+            "invalid data: senses.0.glosses: Input should be a valid list",
+            wxr.config.debugs[0]["msg"],
+        )
@@ -0,0 +1,111 @@
+import io
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from wikitextprocessor import Wtp
+
+from wiktextract.config import WiktionaryConfig
+from wiktextract.incremental import (
+    canonical_page_name,
+    copy_unchanged_data,
+    find_reparse_titles,
+)
+from wiktextract.thesaurus import close_thesaurus_db
+from wiktextract.wxr_context import WiktextractContext
+
+
+class TestIncremental(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.wxr = WiktextractContext(Wtp(), WiktionaryConfig())
+
+    def tearDown(self) -> None:
+        self.wxr.wtp.close_db_conn()
+        close_thesaurus_db(
+            self.wxr.thesaurus_db_path, self.wxr.thesaurus_db_conn
+        )
+        self.tmp_dir.cleanup()
+
+    def add_pages(self, wtp: Wtp, pages: list[tuple[str, int, str]]) -> None:
+        for title, ns_id, body in pages:
+            wtp.add_page(title, ns_id, body)
+        wtp.db_conn.commit()
+
+    def test_canonical_page_name(self):
+        self.assertEqual(
+            canonical_page_name(" template:en_noun ", ("Template",)),
+            "En noun",
+        )
+        self.assertEqual(
+            canonical_page_name("Module:foo/data", ("Module",)), "Foo/data"
+        )
+
+    def test_find_reparse_titles(self):
+        previous_pages = [
+            ("Template:a", 10, "{{b}}"),
+            ("Template:b", 10, "{{#invoke:c|f}}"),
+            ("Template:d", 10, "d"),
+            ("Module:c", 828, "return {}"),
+            ("uses a", 0, "{{a}}"),
+            ("uses d", 0, "{{d|x}}"),
+            ("changed", 0, "old text"),
+            ("deleted", 0, "text"),
+            ("with subpage", 0, "text"),
+            ("with subpage/translations", 0, "text"),
+        ]
+        previous_db_path = Path(self.tmp_dir.name) / "previous.db"
+        previous_wtp = Wtp(db_path=previous_db_path)
+        self.add_pages(previous_wtp, previous_pages)
+        previous_wtp.close_db_conn()
+
+        current_pages = [
+            page
+            for page in previous_pages
+            if page[0] not in ("Module:c", "changed", "deleted")
+            and not page[0].endswith("/translations")
+        ]
+        current_pages.extend(
+            [
+                ("Module:c", 828, "return {1}"),
+                ("changed", 0, "new text"),
+                ("with subpage/translations", 0, "new text"),
+            ]
+        )
+        self.add_pages(self.wxr.wtp, current_pages)
+        self.assertEqual(
+            find_reparse_titles(self.wxr, previous_db_path, [0]),
+            {
+                "uses a",
+                "changed",
+                "deleted",
+                "with subpage",
+                "with subpage/translations",
+            },
+        )
+
+    def test_copy_unchanged_data(self):
+        previous_output_path = Path(self.tmp_dir.name) / "previous.jsonl"
+        records = [
+            {"word": "foo", "lang_code": "en", "pos": "noun"},
+            {"word": "bar", "lang_code": "en", "pos": "verb"},
+            {"word": "baz", "original_title": "Unsupported titles/baz"},
+            {"title": "qux", "redirect": "foo", "pos": "hard-redirect"},
+            {"word": "foo", "lang_code": "en", "pos": "verb"},
+            {"word": "th", "pos": "noun", "source": "thesaurus"},
+        ]
+        with previous_output_path.open("w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+        out_f = io.StringIO()
+        emitted = copy_unchanged_data(
+            previous_output_path, {"bar", "Unsupported titles/baz"}, out_f
+        )
+        self.assertEqual(
+            [json.loads(line) for line in out_f.getvalue().splitlines()],
+            [records[0], records[3], records[4]],
+        )
+        self.assertEqual(
+            emitted, {("foo", "en", "noun"), ("foo", "en", "verb")}
+        )
@@ -0,0 +1,57 @@
+import unittest
+from unittest.mock import Mock
+
+from wiktextract.extractor.fr.models import Form, WordEntry
+from wiktextract.extractor.inflection_page_cache import extract_inflection_page
+
+
+class InflectionPageCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.wxr = Mock()
+        self.wxr.wtp.title = "lancer"
+        self.calls = 0
+
+    def extract(self, entry: WordEntry) -> None:
+        self.calls += 1
+        entry.forms.append(Form(form="lançant", tags=["present"]))
+        entry.categories.append("Verbes du premier groupe en français")
+
+    def new_entry(self) -> WordEntry:
+        return WordEntry(word="lancer", lang_code="fr", lang="Français")
+
+    def test_cache(self):
+        entries = [self.new_entry(), self.new_entry()]
+        entries[1].forms.append(Form(form="lance"))
+        for entry in entries:
+            extract_inflection_page(
+                self.wxr,
+                entry,
+                (116, "Conjugaison:français/lancer"),
+                self.extract,
+            )
+        self.assertEqual(self.calls, 1)
+        self.assertEqual([f.form for f in entries[0].forms], ["lançant"])
+        self.assertEqual(
+            [f.form for f in entries[1].forms], ["lance", "lançant"]
+        )
+        self.assertEqual(
+            entries[1].categories, ["Verbes du premier groupe en français"]
+        )
+        entries[0].forms[0].tags.append("participle")
+        self.assertEqual(entries[1].forms[1].tags, ["present"])
+
+    def test_other_page(self):
+        extract_inflection_page(
+            self.wxr,
+            self.new_entry(),
+            (116, "Conjugaison:français/lancer"),
+            self.extract,
+        )
+        self.wxr.wtp.title = "relancer"
+        extract_inflection_page(
+            self.wxr,
+            self.new_entry(),
+            (116, "Conjugaison:français/lancer"),
+            self.extract,
+        )
+        self.assertEqual(self.calls, 2)
@@ -0,0 +1,67 @@
+import pickle
+import unittest
+
+from wikitextprocessor import Wtp
+
+from wiktextract.config import WiktionaryConfig
+from wiktextract.datautils import ns_title_prefix_tuple
+from wiktextract.thesaurus import close_thesaurus_db
+from wiktextract.wxr_context import WiktextractContext
+
+
+class NamespacePatternsTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.wxr = WiktextractContext(Wtp(), WiktionaryConfig())
+
+    def tearDown(self) -> None:
+        self.wxr.wtp.close_db_conn()
+        close_thesaurus_db(
+            self.wxr.thesaurus_db_path,
+            self.wxr.thesaurus_db_conn,  # type:ignore[arg-type]
+        )
+
+    def test_title_prefixes(self):
+        prefixes = ns_title_prefix_tuple(self.wxr, "Thesaurus")
+        self.assertIn("Thesaurus:", prefixes)
+        self.assertIn(
+            "thesaurus:", ns_title_prefix_tuple(self.wxr, "Thesaurus", True)
+        )
+        self.assertIs(ns_title_prefix_tuple(self.wxr, "Thesaurus"), prefixes)
+        self.assertEqual(ns_title_prefix_tuple(self.wxr, "No such ns"), ())
+
+    def test_names(self):
+        ns_patterns = self.wxr.ns_patterns
+        self.assertEqual(ns_patterns.thesaurus_name, "Thesaurus")
+        self.assertEqual(ns_patterns.rhymes_prefix, "Rhymes:")
+        self.assertIn("Template:", ns_patterns.template_prefixes)
+        self.assertIn("category", ns_patterns.category_names)
+
+    def test_category_patterns(self):
+        ns_patterns = self.wxr.ns_patterns
+        self.assertEqual(
+            [
+                m.group(1)
+                for m in ns_patterns.category_capture_re.finditer(
+                    "[[Category:English nouns]] [[:category:Dogs|dogs]]"
+                )
+            ],
+            ["English nouns", "Dogs"],
+        )
+        self.assertEqual(
+            ns_patterns.category_sup_re.sub(
+                "", "dog<sup>(Category: Dogs)</sup>"
+            ),
+            "dog",
+        )
+        self.assertIsNotNone(ns_patterns.image_link_re.match("image:"))
+
+    def test_pickle(self):
+        ns_patterns = pickle.loads(pickle.dumps(self.wxr.ns_patterns))
+        self.assertEqual(
+            ns_patterns.title_prefixes("Thesaurus"),
+            self.wxr.ns_patterns.title_prefixes("Thesaurus"),
+        )
+        self.assertEqual(
+            ns_patterns.category_link_re.pattern,
+            self.wxr.ns_patterns.category_link_re.pattern,
+        )
@@ -0,0 +1,64 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from wiktextract.output import OutputFile, json_dumps, open_jsonl, parse_size
+
+
+class TestOutput(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_json_dumps(self):
+        data = {"word": "ä", "senses": [{"glosses": ["a", "b"]}]}
+        self.assertEqual(json.loads(json_dumps(data)), data)
+        self.assertNotIn("\n", json_dumps(data))
+        self.assertIn("ä", json_dumps(data))
+        self.assertEqual(json.loads(json_dumps(data, True)), data)
+        self.assertIn("\n", json_dumps(data, True))
+
+    def test_parse_size(self):
+        self.assertEqual(parse_size("4096"), 4096)
+        self.assertEqual(parse_size("500M"), 500 * 1024 * 1024)
+        self.assertEqual(parse_size("1GB"), 1024**3)
+        with self.assertRaises(ValueError):
+            parse_size("1 parsec")
+
+    def test_gzip_shards(self):
+        path = Path(self.tmp_dir.name) / "out.jsonl.gz"
+        out_f = OutputFile(path, "jsonl.gz", shard_size=1)
+        for i in range(3):
+            out_f.write(json_dumps({"word": str(i)}) + "\n")
+        out_f.close()
+        self.assertEqual(
+            sorted(p.name for p in Path(self.tmp_dir.name).iterdir()),
+            [f"out-0000{i}.jsonl.gz" for i in range(3)],
+        )
+        words = []
+        for file_path in out_f.paths:
+            with open_jsonl(file_path) as f:
+                words.extend(json.loads(line)["word"] for line in f)
+        self.assertEqual(words, ["0", "1", "2"])
+
+    def test_plain_file(self):
+        path = Path(self.tmp_dir.name) / "out.jsonl"
+        out_f = OutputFile(path)
+        out_f.write('{"word": "a"}\n')
+        self.assertFalse(path.exists())
+        out_f.close()
+        self.assertEqual(path.read_text(encoding="utf-8"), '{"word": "a"}\n')
+
+    def test_abort(self):
+        path = Path(self.tmp_dir.name) / "out.jsonl"
+        out_f = OutputFile(path)
+        out_f.write('{"word": "a"}\n')
+        out_f.abort()
+        self.assertFalse(path.exists())
+        self.assertEqual(
+            Path(str(path) + ".tmp").read_text(encoding="utf-8"),
+            '{"word": "a"}\n',
+        )
@@ -0,0 +1,99 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from wiktextract.result_cache import (
+    ResultCacheCollector,
+    open_result_cache,
+    persistent_cache,
+    result_cache,
+    take_result_cache_updates,
+)
+
+
+class ResultCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.addCleanup(open_result_cache, None)
+        self.cache_path = Path(self.temp_dir.name) / "results.bin"
+        self.source_path = Path(self.temp_dir.name) / "source.py"
+        self.source_path.write_text("a = 1\n")
+        self.calls: list[str] = []
+
+        @persistent_cache("test_split", [self.source_path], maxsize=2)
+        def split_words(
+            text: str, accepted: frozenset[str] = frozenset()
+        ) -> tuple[list[str], bool]:
+            self.calls.append(text)
+            words = text.split()
+            return words, all(word in accepted for word in words)
+
+        self.split_words = split_words
+        self.addCleanup(result_cache.functions.pop, "test_split")
+        take_result_cache_updates()
+
+    def run_worker(self, texts: list[str]) -> None:
+        """Calls the function like a worker process and saves the results
+        like the parent process."""
+        self.split_words.cache_clear()
+        collector = ResultCacheCollector(self.cache_path)
+        open_result_cache(self.cache_path)
+        for text in texts:
+            self.split_words(text, accepted=frozenset(["a", "b"]))
+        collector.add(take_result_cache_updates())
+        open_result_cache(None)
+        collector.close()
+        self.stats = collector.stats["test_split"]
+
+    def test_cross_run(self):
+        self.run_worker(["a b", "a b", "c d"])
+        self.assertEqual(self.calls, ["a b", "c d"])
+        self.assertEqual(self.stats, [1, 0, 2])
+        self.calls.clear()
+        # The results of the previous run are read from the file and the
+        # new results are added to it
+        self.run_worker(["a b", "c d", "e"])
+        self.assertEqual(self.calls, ["e"])
+        self.assertEqual(self.stats, [0, 2, 1])
+        self.calls.clear()
+        self.run_worker(["e", "a b"])
+        self.assertEqual(self.calls, [])
+        open_result_cache(self.cache_path)
+        self.split_words.cache_clear()
+        self.assertEqual(
+            self.split_words("a b", frozenset(["b", "a"])), (["a", "b"], True)
+        )
+        self.assertEqual(
+            self.split_words("c d", accepted=frozenset(["a", "b"])),
+            (["c", "d"], False),
+        )
+        self.assertEqual(self.calls, [])
+        self.assertEqual(len(result_cache.file), 3)  # type: ignore[arg-type]
+
+    def test_changed_source(self):
+        self.run_worker(["a b"])
+        self.source_path.write_text("a = 2\n")
+        result_cache.functions["test_split"]._source_hash = None
+        self.calls.clear()
+        self.run_worker(["a b", "c"])
+        self.assertEqual(self.calls, ["a b", "c"])
+        self.calls.clear()
+        self.run_worker(["a b", "c"])
+        self.assertEqual(self.calls, [])
+
+    def test_unreadable_file(self):
+        self.cache_path.write_bytes(b"not a result cache")
+        with self.assertLogs("wiktextract", "WARNING"):
+            self.run_worker(["a b"])
+        self.assertEqual(self.calls, ["a b"])
+        self.calls.clear()
+        self.run_worker(["a b"])
+        self.assertEqual(self.calls, [])
+
+    def test_no_file(self):
+        self.assertEqual(self.split_words("a"), (["a"], False))
+        self.assertEqual(self.split_words("a"), (["a"], False))
+        updates = take_result_cache_updates()
+        self.assertEqual(updates.stats, {"test_split": [1, 0, 1]})
+        self.assertEqual(updates.new_results, [])
@@ -0,0 +1,83 @@
+import io
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import Mock
+
+from wikitextprocessor import Page, Wtp
+
+from wiktextract.config import WiktionaryConfig
+from wiktextract.shards import filter_shard_pages, merge_shards
+from wiktextract.thesaurus import close_thesaurus_db, init_thesaurus_db
+from wiktextract.wiktionary import reprocess_wiktionary
+from wiktextract.wxr_context import WiktextractContext
+
+
+class TestShards(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.wxr = WiktextractContext(
+            Wtp(lang_code="fr"), WiktionaryConfig(dump_file_lang_code="fr")
+        )
+
+    def tearDown(self) -> None:
+        self.wxr.wtp.close_db_conn()
+        close_thesaurus_db(
+            self.wxr.thesaurus_db_path, self.wxr.thesaurus_db_conn
+        )
+        self.tmp_dir.cleanup()
+
+    def test_filter_shard_pages(self):
+        pages = [Page(title=f"page{i}", namespace_id=0) for i in range(100)]
+        shards = [
+            [page.title for page in filter_shard_pages(pages, index, 3)]
+            for index in range(3)
+        ]
+        self.assertEqual(
+            sorted(title for shard in shards for title in shard),
+            sorted(page.title for page in pages),
+        )
+        self.assertTrue(all(len(shard) > 0 for shard in shards))
+        # the same title always goes to the same shard
+        self.assertEqual(
+            [page.title for page in filter_shard_pages(pages, 0, 3)],
+            shards[0],
+        )
+
+    def test_merge_shards(self):
+        shard_data = [
+            [
+                {"word": "a", "lang_code": "fr", "pos": "noun"},
+                {"word": "b", "pos": "noun", "source": "thesaurus"},
+            ],
+            [{"word": "c", "lang_code": "fr", "pos": "verb"}],
+        ]
+        shard_paths = []
+        for index, records in enumerate(shard_data):
+            path = Path(self.tmp_dir.name) / f"shard{index}.jsonl"
+            with path.open("w", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record) + "\n")
+            shard_paths.append(path)
+        out_f = io.StringIO()
+        merge_shards(self.wxr, shard_paths, out_f)
+        self.assertEqual(
+            [
+                json.loads(line)["word"]
+                for line in out_f.getvalue().splitlines()
+            ],
+            ["a", "c"],
+        )
+
+    def test_shards_need_thesaurus(self):
+        wxr = Mock()
+        wxr.config.extract_thesaurus_pages = True
+        wxr.thesaurus_db_conn = init_thesaurus_db(
+            Path(self.tmp_dir.name) / "thesaurus.db"
+        )
+        self.addCleanup(wxr.thesaurus_db_conn.close)
+        with self.assertRaises(RuntimeError):
+            reprocess_wiktionary(
+                wxr, 1, io.StringIO(), shard_index=0, shard_count=2
+            )
@@ -0,0 +1,49 @@
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from wiktextract.startup_profile import ImportProfiler
+
+
+class StartupProfileTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        temp_path = Path(self.temp_dir.name)
+        (temp_path / "profiled_outer.py").write_text(
+            "import profiled_inner\ndata = list(range(100000))\n"
+        )
+        (temp_path / "profiled_inner.py").write_text("value = 1\n")
+        sys.path.insert(0, self.temp_dir.name)
+        self.addCleanup(sys.path.remove, self.temp_dir.name)
+        for name in ("profiled_outer", "profiled_inner"):
+            self.addCleanup(sys.modules.pop, name, None)
+
+    def test_profile_imports(self):
+        profiler = ImportProfiler()
+        profiler.install()
+        try:
+            import profiled_outer  # type: ignore[import-not-found]
+
+            out_f = io.StringIO()
+            profiler.report(out_f)
+        finally:
+            profiler.uninstall()
+        self.assertEqual(profiled_outer.profiled_inner.value, 1)
+        stats = {m.name: m for m in profiler.modules}
+        outer = stats["profiled_outer"]
+        inner = stats["profiled_inner"]
+        self.assertAlmostEqual(
+            outer.total_time, outer.self_time + inner.total_time
+        )
+        self.assertEqual(
+            outer.total_memory, outer.self_memory + inner.total_memory
+        )
+        # The list of 100000 integers
+        self.assertGreater(outer.self_memory, 100000 * 8)
+        self.assertNotIn(profiler, sys.meta_path)
+        report = out_f.getvalue()
+        self.assertTrue(report.startswith("Startup profile: 2 modules"))
+        self.assertIn("  profiled_outer\n", report)
@@ -0,0 +1,29 @@
+import unittest
+from unittest.mock import Mock
+
+from wiktextract.extractor.subpage_memo import SubpageMemo
+
+
+class SubpageMemoTests(unittest.TestCase):
+    def test_memo(self):
+        memo = SubpageMemo()
+        wxr = Mock()
+        wxr.wtp.title = "dog"
+        compute = Mock(side_effect=["tree", "other tree", None])
+        self.assertEqual(memo.get(wxr, "dog/translations", compute), "tree")
+        self.assertEqual(memo.get(wxr, "dog/translations", compute), "tree")
+        self.assertEqual(compute.call_count, 1)
+        # Values are only kept for the current page
+        wxr.wtp.title = "cat"
+        self.assertEqual(
+            memo.get(wxr, "dog/translations", compute), "other tree"
+        )
+        self.assertIsNone(memo.get(wxr, "cat/translations", compute))
+        self.assertIsNone(memo.get(wxr, "cat/translations", compute))
+        self.assertEqual(compute.call_count, 3)
+        # or another context
+        compute = Mock(return_value="new tree")
+        self.assertEqual(
+            memo.get(Mock(), "cat/translations", compute), "new tree"
+        )
+        compute.assert_called_once()
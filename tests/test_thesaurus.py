@@ -0,0 +1,194 @@
+import io
+import json
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import TestCase
+
+from wiktextract.thesaurus import (
+    ThesaurusIndex,
+    ThesaurusInserter,
+    ThesaurusTerm,
+    build_thesaurus_index,
+    emit_words_in_thesaurus,
+    init_thesaurus_db,
+    search_thesaurus,
+    term_row,
+    thesaurus_entry_key,
+    thesaurus_linkage_number,
+)
+
+
+class TestThesaurus(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_conn = init_thesaurus_db(Path(self.tmp_dir.name) / "t.db")
+
+    def tearDown(self) -> None:
+        self.db_conn.close()
+        self.tmp_dir.cleanup()
+
+    def test_bulk_insert(self):
+        terms = [
+            ThesaurusTerm("dog", "en", "noun", "synonyms", "hound", ["rare"]),
+            ThesaurusTerm("dog", "en", "noun", "hyponyms", "puppy"),
+            # duplicate term
+            ThesaurusTerm("dog", "en", "noun", "synonyms", "hound"),
+            ThesaurusTerm("cat", "en", "noun", "synonyms", "feline"),
+        ]
+        inserter = ThesaurusInserter(self.db_conn, batch_size=2)
+        for term in terms:
+            inserter.add_rows([term_row(term)])
+        inserter.close()
+        self.assertEqual(thesaurus_linkage_number(self.db_conn), 3)
+        self.assertEqual(
+            [
+                (t.term, t.linkage, t.tags)
+                for t in search_thesaurus(self.db_conn, "dog", "en", "noun")
+            ],
+            [("hound", "synonyms", ["rare"]), ("puppy", "hyponyms", [])],
+        )
+        indexes = {
+            name
+            for (name,) in self.db_conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            )
+        }
+        self.assertIn("entries_index", indexes)
+        self.assertIn("terms_entry_id_index", indexes)
+        self.assertEqual(
+            self.db_conn.execute("PRAGMA foreign_keys").fetchone()[0], 1
+        )
+
+    def test_interrupted_insert(self):
+        inserter = ThesaurusInserter(self.db_conn, batch_size=1)
+        inserter.add_rows(
+            [term_row(ThesaurusTerm("dog", "en", "noun", "synonyms", "hound"))]
+        )
+        # Not committed before close(), e.g. if the extraction crashes
+        self.db_conn.rollback()
+        self.assertEqual(thesaurus_linkage_number(self.db_conn), 0)
+        self.assertEqual(
+            self.db_conn.execute(
+                "SELECT count(*) FROM sqlite_master WHERE type = 'index' "
+                "AND name IN ('entries_index', 'terms_entry_id_index')"
+            ).fetchone()[0],
+            2,
+        )
+
+    def test_existing_entries(self):
+        inserter = ThesaurusInserter(self.db_conn)
+        inserter.add_rows(
+            [term_row(ThesaurusTerm("dog", "en", "noun", "synonyms", "hound"))]
+        )
+        inserter.close()
+        inserter = ThesaurusInserter(self.db_conn)
+        inserter.add_rows(
+            [term_row(ThesaurusTerm("dog", "en", "noun", "synonyms", "cur"))]
+        )
+        inserter.close()
+        self.assertEqual(
+            self.db_conn.execute("SELECT count(*) FROM entries").fetchone()[0],
+            1,
+        )
+        self.assertEqual(thesaurus_linkage_number(self.db_conn), 2)
+
+    def test_thesaurus_index(self):
+        inserter = ThesaurusInserter(self.db_conn)
+        inserter.add_rows(
+            [
+                term_row(ThesaurusTerm(f"w{i}", "en", "noun", "synonyms", "x"))
+                for i in range(100)
+            ]
+        )
+        inserter.close()
+        # entry without terms
+        self.db_conn.execute(
+            "INSERT INTO entries (entry, language_code, pos, sense) "
+            "VALUES('empty', 'en', 'noun', '')"
+        )
+        wxr = SimpleNamespace(
+            thesaurus_db_conn=self.db_conn,
+            thesaurus_db_path=Path(self.tmp_dir.name) / "t.db",
+            thesaurus_index=None,
+        )
+        build_thesaurus_index(wxr)
+        index = wxr.thesaurus_index
+        self.assertEqual(len(index), 100)
+        self.assertIn(("w0", "en", "noun"), index)
+        self.assertIn(("w99", "en", "noun"), index)
+        self.assertNotIn(("w0", "en", "verb"), index)
+        self.assertNotIn(("w100", "en", "noun"), index)
+        self.assertNotIn(("empty", "en", "noun"), index)
+        index.close()
+
+    def test_empty_thesaurus_index(self):
+        path = Path(self.tmp_dir.name) / "t_index.bin"
+        path.write_bytes(b"")
+        index = ThesaurusIndex(path)
+        self.assertNotIn(("w0", "en", "noun"), index)
+        index.close()
+
+    def test_thesaurus_entry_key(self):
+        inserter = ThesaurusInserter(self.db_conn)
+        inserter.add_rows(
+            [term_row(ThesaurusTerm("dog", "en", "noun", "synonyms", "hound"))]
+        )
+        inserter.close()
+        wxr = SimpleNamespace(
+            thesaurus_db_conn=self.db_conn,
+            thesaurus_db_path=Path(self.tmp_dir.name) / "t.db",
+            thesaurus_index=None,
+        )
+        build_thesaurus_index(wxr)
+        dog = {"word": "dog", "lang_code": "en", "pos": "noun"}
+        cat = {"word": "cat", "lang_code": "en", "pos": "noun"}
+        self.assertEqual(
+            thesaurus_entry_key(dog, wxr.thesaurus_index), ("dog", "en", "noun")
+        )
+        self.assertIsNone(thesaurus_entry_key(cat, wxr.thesaurus_index))
+        self.assertEqual(thesaurus_entry_key(cat), ("cat", "en", "noun"))
+        self.assertIsNone(thesaurus_entry_key({"word": "dog"}))
+        wxr.thesaurus_index.close()
+
+    def test_emit_words_in_thesaurus(self):
+        inserter = ThesaurusInserter(self.db_conn)
+        inserter.add_rows(
+            term_row(term)
+            for term in [
+                ThesaurusTerm("dog", "en", "noun", "synonyms", "hound"),
+                ThesaurusTerm(
+                    "cat", "en", "noun", "synonyms", "feline", sense="animal"
+                ),
+                ThesaurusTerm("cat", "en", "noun", "hyponyms", "kitten"),
+                ThesaurusTerm("cat", "en", "noun", "synonyms", "moggy"),
+            ]
+        )
+        inserter.close()
+        wxr = SimpleNamespace(thesaurus_db_conn=self.db_conn)
+        out_f = io.StringIO()
+        emit_words_in_thesaurus(wxr, {("dog", "en", "noun")}, out_f, False)
+        self.assertEqual(
+            [json.loads(line) for line in out_f.getvalue().splitlines()],
+            [
+                {
+                    "word": "cat",
+                    "lang": "English",
+                    "lang_code": "en",
+                    "pos": "noun",
+                    "senses": [
+                        {
+                            "glosses": ["animal"],
+                            "synonyms": [
+                                {"word": "feline", "source": "Thesaurus:cat"},
+                                {"word": "moggy", "source": "Thesaurus:cat"},
+                            ],
+                            "hyponyms": [
+                                {"word": "kitten", "source": "Thesaurus:cat"}
+                            ],
+                        }
+                    ],
+                    "source": "thesaurus",
+                }
+            ],
+        )
@@ -7,9 +7,14 @@ import unittest
 from wikitextprocessor import Wtp
 
 from wiktextract.config import WiktionaryConfig
-from wiktextract.datautils import split_slashes
+from wiktextract.datautils import data_copy, split_slashes
 from wiktextract.extractor.share import create_audio_url_dict
 from wiktextract.thesaurus import close_thesaurus_db
+from wiktextract.title_index import (
+    build_title_index,
+    open_or_build_title_index,
+    title_index_path,
+)
 from wiktextract.wxr_context import WiktextractContext
 
 
@@ -62,6 +67,35 @@ class UtilsTests(unittest.TestCase):
             ret, ["bar zap a", "bar zap b", "foo zap a", "foo zap b"]
         )
 
+    def test_title_index(self):
+        self.wxr.wtp.add_page("foo", 0, "x")
+        self.wxr.wtp.add_page("foo bar", 0, "x")
+        self.wxr.title_index = build_title_index(self.wxr.wtp)
+        self.addCleanup(title_index_path(self.wxr.wtp.db_path).unlink)
+        self.addCleanup(self.wxr.title_index.close)
+        self.assertEqual(len(self.wxr.title_index), 2)
+        self.assertIn("foo bar", self.wxr.title_index)
+        self.assertNotIn("bar", self.wxr.title_index)
+        self.assertTrue(self.wxr.page_exists("foo"))
+        self.assertFalse(self.wxr.page_exists("bar"))
+        self.assertEqual(split_slashes(self.wxr, "foo bar"), ["foo bar"])
+        self.assertEqual(
+            split_slashes(self.wxr, "foo bar/zap"), ["foo bar", "foo zap"]
+        )
+
+    def test_open_or_build_title_index(self):
+        self.wxr.wtp.add_page("foo", 0, "x")
+        self.wxr.wtp.db_conn.commit()
+        path = title_index_path(self.wxr.wtp.db_path)
+        self.assertIsNone(open_or_build_title_index(self.wxr.wtp, False))
+        self.assertFalse(path.exists())
+        index = open_or_build_title_index(self.wxr.wtp)
+        self.addCleanup(path.unlink)
+        self.addCleanup(index.close)
+        self.assertIn("foo", index)
+        # No temporary files are left next to the database
+        self.assertEqual(list(path.parent.glob(path.name + ".*")), [])
+
     def test_audio_transcode_url(self):
         sound_data = create_audio_url_dict(
             "LL-Q150 (fra)-DenisdeShawi-bonjour.wav \u200e"
@@ -98,3 +132,16 @@ class UtilsTests(unittest.TestCase):
                 "mp3_url": "https://upload.wikimedia.org/wikipedia/commons/transcoded/0/0f/De-Fisch.OGG/De-Fisch.OGG.mp3",
             },
         )
+
+    def test_data_copy(self):
+        data = {
+            "word": "cat",
+            "senses": [{"glosses": ["animal"], "tags": ["countable"]}],
+            "forms": [{"form": "cats", "tags": ["plural"]}],
+        }
+        copy = data_copy(data)
+        self.assertEqual(copy, data)
+        copy["senses"][0]["tags"].append("informal")
+        copy["forms"].clear()
+        self.assertEqual(data["senses"][0]["tags"], ["countable"])
+        self.assertEqual(len(data["forms"]), 1)
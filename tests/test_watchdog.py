@@ -0,0 +1,66 @@
+import time
+from unittest import TestCase
+from unittest.mock import Mock
+
+from wikitextprocessor import Page
+
+from wiktextract.thesaurus import batch_worker_func, worker_func
+from wiktextract.watchdog import PageTimeoutError, PageWatchdog
+from wiktextract.wiktionary import page_handler
+
+
+class TestWatchdog(TestCase):
+    def test_slow_page(self):
+        watchdog = PageWatchdog(2, warn_seconds=0)
+        watchdog.attach()
+        self.assertEqual(watchdog.slot_index, 0)
+        with watchdog.page("foo"):
+            time.sleep(0.01)
+            pages = watchdog.slow_pages()
+            self.assertEqual(len(pages), 1)
+            self.assertEqual(pages[0][1], "foo")
+        self.assertEqual(watchdog.slow_pages(), [])
+
+    def test_page_timeout(self):
+        watchdog = PageWatchdog(1, page_timeout=0.01)
+        watchdog.attach()
+        with self.assertRaises(PageTimeoutError):
+            with watchdog.page("foo"):
+                time.sleep(1)
+        # the timer is disarmed after the page
+        with watchdog.page("bar"):
+            pass
+        time.sleep(0.02)
+
+    def test_timeout_in_start_page(self):
+        watchdog = PageWatchdog(1, page_timeout=0.01)
+        watchdog.attach()
+        wxr = Mock()
+        wxr.wtp.start_page.side_effect = lambda title: time.sleep(1)
+        wxr.wtp.to_return.return_value = {}
+        page_handler.wxr = wxr
+        page_handler.watchdog = watchdog
+        self.addCleanup(delattr, page_handler, "wxr")
+        self.addCleanup(delattr, page_handler, "watchdog")
+        # Only the page is lost, not the whole batch
+        self.assertEqual(
+            page_handler(Page(title="foo", namespace_id=0, body="")), ([], {})
+        )
+        wxr.wtp.error.assert_called_once()
+
+    def test_timeout_in_thesaurus_start_page(self):
+        watchdog = PageWatchdog(1, page_timeout=0.01)
+        watchdog.attach()
+        wxr = Mock()
+        wxr.wtp.start_page.side_effect = lambda title: time.sleep(1)
+        worker_func.wxr = wxr
+        worker_func.watchdog = watchdog
+        self.addCleanup(delattr, worker_func, "wxr")
+        self.addCleanup(delattr, worker_func, "watchdog")
+        # Only the page is lost, not the whole batch
+        rows, stats, exceptions = batch_worker_func(
+            [Page(title="foo", namespace_id=110, body="")]
+        )
+        self.assertEqual(rows, [])
+        self.assertEqual(len(exceptions), 1)
+        self.assertIn("PageTimeoutError", exceptions[0])
@@ -0,0 +1,62 @@
+from unittest import TestCase
+
+from wikitextprocessor import Page
+
+from wiktextract.wiktionary import (
+    batch_pages,
+    parse_validate,
+    valid_tag_set,
+    validate_page,
+)
+
+
+class TestWiktionary(TestCase):
+    def make_pages(self, body_lengths: list[int]) -> list[Page]:
+        return [
+            Page(title=f"page{i}", namespace_id=0, body="a" * length)
+            for i, length in enumerate(body_lengths)
+        ]
+
+    def test_batch_pages_by_size(self):
+        pages = self.make_pages([40, 40, 40, 100, 10, 10])
+        batches = list(batch_pages(pages, 1000, 1, batch_size=100))
+        self.assertEqual(
+            [[p.title for p in batch] for batch in batches],
+            [["page0", "page1", "page2"], ["page3"], ["page4", "page5"]],
+        )
+
+    def test_batch_pages_shrink_at_end(self):
+        pages = self.make_pages([1] * 60)
+        batches = list(batch_pages(pages, 60, 1, batch_size=1000, max_pages=8))
+        self.assertEqual(
+            [len(b) for b in batches],
+            [8, 8, 8, 7, 6, 4, 4, 3, 2, 2, 1, 1, 1, 1, 1, 1, 1, 1],
+        )
+
+    def test_batch_pages_zero_size(self):
+        pages = self.make_pages([5, 5, 5])
+        batches = list(batch_pages(pages, 3, 4, batch_size=0))
+        self.assertEqual([len(b) for b in batches], [1, 1, 1])
+
+    def test_parse_validate(self):
+        self.assertEqual(parse_validate("off"), 0)
+        self.assertEqual(parse_validate("full"), 1)
+        self.assertEqual(parse_validate("sample:100"), 100)
+        for value in ("sample:0", "sample:", "sample:-1", "all"):
+            with self.assertRaises(ValueError):
+                parse_validate(value)
+
+    def test_validate_page(self):
+        titles = [f"page{i}" for i in range(1000)]
+        self.assertFalse(any(validate_page(t, 0) for t in titles))
+        self.assertTrue(all(validate_page(t, 1) for t in titles))
+        sampled = [t for t in titles if validate_page(t, 10)]
+        self.assertTrue(50 < len(sampled) < 150)
+        self.assertEqual(sampled, [t for t in titles if validate_page(t, 10)])
+
+    def test_valid_tag_set(self):
+        tags = valid_tag_set()
+        self.assertIn("plural", tags)
+        self.assertIn("US", tags)
+        self.assertNotIn("not-a-tag", tags)
+        self.assertIs(valid_tag_set(), tags)
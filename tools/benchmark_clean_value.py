@@ -0,0 +1,125 @@
+# Micro-benchmark of clean_value().  Compares the current implementation
+# with the one in a git revision, for example:
+#
+#     python tools/benchmark_clean_value.py --compare HEAD~1
+#
+# The strings are a built-in sample of typical clean_value() inputs, or the
+# lines of the --input file.
+
+import argparse
+import subprocess
+import sys
+import time
+import types
+from pathlib import Path
+
+from wikitextprocessor import Wtp
+
+from wiktextract import clean
+from wiktextract.config import WiktionaryConfig
+from wiktextract.thesaurus import close_thesaurus_db
+from wiktextract.wxr_context import WiktextractContext
+
+SAMPLE = [
+    "English",
+    "Noun",
+    "countable",
+    "informal, chiefly US",
+    "A domesticated [[carnivorous]] [[mammal]] ([[Canis familiaris]]).",
+    "''plural'' '''dogs'''",
+    "[[w:Dog|dog]] &amp; [[cat#English|cat]]",
+    "from {{inh|en|enm|dogge}}",
+    '<span class="Latn" lang="en">[[dog#English|dog]]</span>',
+    "H<sub>2</sub>O and x<sup>2</sup>",
+    "<i>see</i> <b>[[Thesaurus:dog]]</b><br/>and more",
+    "[[Category:English nouns]][[File:Dog.jpg|thumb|A dog]]",
+    '{| class="wikitable"\n|-\n| a || b\n|}',
+    "[http://example.com example] [...] text",
+    "  multiple   spaces\n\n and newlines  ",
+]
+
+
+def load_revision(rev: str) -> types.ModuleType:
+    """Loads clean.py of the git revision ``rev`` as a module."""
+    repo_dir = Path(__file__).resolve().parent.parent
+    source = subprocess.run(
+        ["git", "show", f"{rev}:src/wiktextract/clean.py"],
+        cwd=repo_dir,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    module = types.ModuleType(f"wiktextract.clean_{rev}")
+    module.__package__ = "wiktextract"
+    exec(compile(source, f"{rev}:clean.py", "exec"), module.__dict__)
+    return module
+
+
+def benchmark(
+    wxr: WiktextractContext,
+    module: types.ModuleType,
+    texts: list[str],
+    number: int,
+) -> tuple[float, list[str]]:
+    """Returns the microseconds per clean_value() call and the results."""
+    results = [module.clean_value(wxr, text) for text in texts]
+    start = time.perf_counter()
+    for _ in range(number):
+        for text in texts:
+            module.clean_value(wxr, text)
+    elapsed = time.perf_counter() - start
+    return elapsed / (number * len(texts)) * 1e6, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark clean_value()")
+    parser.add_argument(
+        "--compare",
+        type=str,
+        default=None,
+        help="Also benchmark clean.py of this git revision",
+    )
+    parser.add_argument(
+        "--input",
+        type=str,
+        default=None,
+        help="File with one input string per line (default: built-in sample)",
+    )
+    parser.add_argument("--lang-code", type=str, default="en")
+    parser.add_argument(
+        "--number",
+        type=int,
+        default=1000,
+        help="Number of times the strings are cleaned (default: %(default)s)",
+    )
+    args = parser.parse_args()
+
+    if args.input is not None:
+        with open(args.input, encoding="utf-8") as f:
+            texts = [line.rstrip("\n").replace("\\n", "\n") for line in f]
+    else:
+        texts = SAMPLE
+    wxr = WiktextractContext(
+        Wtp(lang_code=args.lang_code),
+        WiktionaryConfig(dump_file_lang_code=args.lang_code),
+    )
+    try:
+        usec, results = benchmark(wxr, clean, texts, args.number)
+        print(f"current: {usec:.2f} µs per call")
+        if args.compare is not None:
+            old_usec, old_results = benchmark(
+                wxr, load_revision(args.compare), texts, args.number
+            )
+            print(f"{args.compare}: {old_usec:.2f} µs per call")
+            print(f"speedup: {old_usec / usec:.2f}x")
+            num_diffs = sum(a != b for a, b in zip(results, old_results))
+            if num_diffs > 0:
+                print(f"{num_diffs} strings were cleaned differently")
+                sys.exit(1)
+    finally:
+        wxr.wtp.close_db_conn()
+        close_thesaurus_db(wxr.thesaurus_db_path, wxr.thesaurus_db_conn)  # type: ignore[arg-type]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# Micro-benchmark of the tokenizer of classify_desc() in
+# extractor/en/tokenizer.py compared with nltk's TweetTokenizer, e.g.
+#
+#     python tools/benchmark_tokenizer.py --input descriptions.txt
+#
+# The strings are a built-in sample of typical classify_desc() inputs, or the
+# lines of the --input file.
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+
+from wiktextract.extractor.en.tokenizer import (
+    FAST_TOKENIZE_UNSAFE_RE,
+    get_tweet_tokenizer,
+    tokenize,
+)
+
+SAMPLE = [
+    "to eat",
+    "masculine plural",
+    "a domesticated carnivorous mammal",
+    "one who is fond of dogs",
+    "(archaic) a male dog, as opposed to a bitch",
+    "someone's best friend",
+    "well-known, long-established",
+    "literally, “to hang one's head”",
+    "e.g. in compounds",
+    "Mrs. Smith's dog",
+    "see also...",
+    "used in the 19th century",
+    "abbreviation of ante meridiem (AM)",
+    "cf. example.com",
+]
+
+
+def benchmark(
+    tokenize_fn: Callable[[str], list[str]], texts: list[str], number: int
+) -> tuple[float, list[list[str]]]:
+    """Returns the microseconds per call and the tokens."""
+    results = [tokenize_fn(text) for text in texts]
+    start = time.perf_counter()
+    for _ in range(number):
+        for text in texts:
+            tokenize_fn(text)
+    elapsed = time.perf_counter() - start
+    return elapsed / (number * len(texts)) * 1e6, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the classify_desc() tokenizer"
+    )
+    parser.add_argument(
+        "--input",
+        type=str,
+        default=None,
+        help="File with one input string per line (default: built-in sample)",
+    )
+    parser.add_argument(
+        "--number",
+        type=int,
+        default=1000,
+        help="Number of times the strings are tokenized (default: %(default)s)",
+    )
+    args = parser.parse_args()
+
+    if args.input is not None:
+        with open(args.input, encoding="utf-8") as f:
+            texts = [line.rstrip("\n") for line in f]
+    else:
+        texts = SAMPLE
+    num_fast = sum(FAST_TOKENIZE_UNSAFE_RE.search(t) is None for t in texts)
+    print(f"{num_fast} of {len(texts)} strings are tokenized without nltk")
+    usec, results = benchmark(tokenize, texts, args.number)
+    print(f"tokenize(): {usec:.2f} µs per call")
+    old_usec, old_results = benchmark(
+        get_tweet_tokenizer().tokenize, texts, args.number
+    )
+    print(f"TweetTokenizer: {old_usec:.2f} µs per call")
+    print(f"speedup: {old_usec / usec:.2f}x")
+    num_diffs = sum(a != b for a, b in zip(results, old_results))
+    if num_diffs > 0:
+        print(f"{num_diffs} strings were tokenized differently")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+# Creates src/wiktextract/data/en/brown_words.txt, the words of the Brown
+# corpus used in extractor/en/english_words.py, from the corpus in nltk.
+# Run this script at the project root folder; it downloads the corpus if it
+# has not been downloaded.
+
+from collections.abc import Iterable
+from pathlib import Path
+
+OUTPUT_PATH = Path("src/wiktextract/data/en/brown_words.txt")
+
+
+def brown_corpus_words() -> Iterable[str]:
+    """Returns the words of the Brown corpus in nltk, downloading the corpus
+    if it has not been downloaded."""
+    import nltk  # type: ignore[import-untyped]
+    from nltk.corpus import brown  # type: ignore[import-untyped]
+
+    try:
+        nltk.data.find("corpora/brown.zip")
+    except LookupError:
+        nltk.download("brown", quiet=True)
+    return brown.words()
+
+
+def main() -> None:
+    words = sorted(set(brown_corpus_words()))
+    assert not any(len(word.split()) != 1 for word in words)
+    with OUTPUT_PATH.open("w", encoding="utf-8", newline="\n") as f:
+        for word in words:
+            f.write(word + "\n")
+    print(f"Saved {len(words)} words to {OUTPUT_PATH}")
+
+
+if __name__ == "__main__":
+    main()